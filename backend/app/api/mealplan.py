@@ -1,11 +1,18 @@
 # backend/app/api/mealplan.py (디버깅 강화)
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 import asyncio
+import json
 import logging
+import time
 import traceback
+import uuid
+from queue import Empty
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from app.core.config import settings
+from app.services.presolve import InfeasibleParamsError
+from app.services.ga_pareto import attach_front
 
 # 더 상세한 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -17,6 +24,27 @@ class Params(BaseModel):
     days: int = Field(..., ge=1, le=365, description="식단 생성 일수")
     budget_won: float = Field(..., gt=0, description="1인당 예산 (원)")
     target_kcal: float = Field(..., gt=0, description="목표 칼로리")
+    engine: Optional[str] = Field(None, description="엔진: slots(기본 GA, 메뉴 단위) | day_templates(GA, 하루 조합 단위) | milp(정확해 솔버, 명시할 때만: 목적식에 조합 점수/매크로 목표 없음, summary.mip_gap으로 최적성 확인) | pareto(NSGA-II, summary.pareto에 영양/비용/선호 파레토 앞)")
+    time_limit: Optional[float] = Field(None, gt=0, description="milp 제한 시간(초, 기본 10). 초과 시 그때까지의 최선해 반환")
+    mip_gap: Optional[float] = Field(None, gt=0, lt=1, description="milp 상대 MIP gap")
+    prune: Optional[bool] = Field(None, description="후보 가지치기(기본 true): 가능한 하루에 못 들어가는 메뉴/근사 중복 제거")
+    dedupe: Optional[bool] = Field(None, description="가지치기 중 근사 중복 메뉴 제거(기본 true)")
+    seed: Optional[int] = Field(None, ge=0, description="난수 시드(같은 시드 + 같은 params면 같은 식단, 결과 캐시 키에도 포함). 없으면 기본 시드")
+    islands: Optional[int] = Field(None, ge=1, le=64, description="섬 모델 섬 개수(2 이상이면 섬마다 별도 프로세스, pop_size를 섬끼리 나눔)")
+    migrate_every: Optional[int] = Field(None, ge=1, description="섬 간 이주 주기(세대)")
+    migrants: Optional[int] = Field(None, ge=0, description="이주 시 교환하는 상위 개체 수")
+    stall_generations: Optional[int] = Field(None, ge=0, description="최고 점수가 이 세대 수만큼 안 오르면 조기 종료(0이면 끔)")
+    min_rel_improve: Optional[float] = Field(None, ge=0, description="개선으로 보는 최소 상대 상승폭")
+    restart_frac: Optional[float] = Field(None, ge=0, lt=1, description="다양성 붕괴 시 새 개체로 바꿀 하위 비율(0이면 끔)")
+    time_budget: Optional[float] = Field(None, gt=0, description="GA 시간 예산(초). 넘기면 그때까지의 최선 식단 반환(summary.stopped_reason='deadline')")
+    weighted_fitness: Optional[bool] = Field(None, description="true면 전략 가중치(nutrition/cost/preference_weight)로 정규화한 목적 성분의 가중합을 적합도로 씀(기본은 기존 단일 점수)")
+    trace: Optional[bool] = Field(None, description="세대별 진단(가능해 수/제약별 위반 개체 수)을 summary.trace에 포함")
+    cache: Optional[bool] = Field(None, description="false면 결과 캐시를 쓰지 않고 다시 계산(summary.cache_hit)")
+    warm_start: Optional[Union[bool, str, List[Dict[str, Any]]]] = Field(None, description="웜 스타트: 이전 결과 plan | 작업 ID | 결과 캐시 키 | true(가까운 파라미터로 돈 이전 실행의 엘리트만). slots/pareto 엔진, 섬 1개일 때")
+    warm_frac: Optional[float] = Field(None, ge=0, le=1, description="초기 개체군 중 웜 스타트 씨앗과 그 변이 사본 비율(기본 0.5)")
+    locked: Optional[Union[List[Dict[str, Any]], Dict[str, str]]] = Field(None, description="고정 슬롯: [{day, slot, menu}] 또는 {\"day:slot\": menu}. slot은 rice|soup|side1|side2|side3|snack, day는 1부터. slots/pareto 엔진")
+    free_days: Optional[List[int]] = Field(None, description="다시 짤 날(1부터). 나머지 날은 base_plan 그대로 고정")
+    base_plan: Optional[Union[str, List[Dict[str, Any]]]] = Field(None, description="free_days 밖의 날에 쓸 식단: 이전 결과 plan | 작업 ID | 결과 캐시 키")
 
 class Paths(BaseModel):
     price: str = Field(..., description="가격 CSV 파일 경로")
@@ -30,6 +58,10 @@ class OptimizePayload(BaseModel):
     use_preset: bool = Field(default=False, description="서버 프리셋 경로 사용 여부")
     paths: Optional[Paths] = Field(None, description="CSV 파일 경로들")
 
+def _preset_nutr_csv() -> Optional[str]:
+    """영양 CSV 설정값: MEAL_NUTR_CSV, 없으면 MEAL_NUTRITION_CSV"""
+    return getattr(settings, "meal_nutr_csv", None) or getattr(settings, "meal_nutrition_csv", None)
+
 def build_paths_from_settings() -> Dict[str, str]:
     """환경변수에서 CSV 파일 경로들을 읽어서 반환"""
     try:
@@ -37,7 +69,7 @@ def build_paths_from_settings() -> Dict[str, str]:
         
         # 소문자로 된 환경변수명 사용
         price = settings.resolve_path(getattr(settings, "meal_price_csv", None))
-        nutr = settings.resolve_path(getattr(settings, "meal_nutr_csv", None))
+        nutr = settings.resolve_path(_preset_nutr_csv())
         
         logger.info(f"Price CSV 경로: {price}")
         logger.info(f"Nutrition CSV 경로: {nutr}")
@@ -78,58 +110,102 @@ def build_paths_from_settings() -> Dict[str, str]:
         raise HTTPException(status_code=500, detail=f"설정 파일 경로 오류: {e}")
 
 async def run_optimization_async(paths: Dict[str, str], params: Dict[str, Any]) -> Dict[str, Any]:
-    """비동기로 최적화 실행"""
-    import concurrent.futures
-    
-    def run_optimize():
-        try:
-            logger.info(f"최적화 시작 - 파라미터: {params}")
-            logger.info(f"사용할 파일 경로: {paths}")
-            
-            from app.services.optimizer import optimize_menu
-            result = optimize_menu(paths=paths, params=params)
-            
-            logger.info(f"최적화 완료 - 결과 타입: {type(result)}")
-            if isinstance(result, tuple) and len(result) >= 2:
-                plan_df, summary = result
-                logger.info(f"Plan DataFrame 크기: {len(plan_df) if hasattr(plan_df, '__len__') else 'N/A'}")
-                logger.info(f"Summary: {summary}")
-                
-                # DataFrame을 dict로 변환
-                plan_records = plan_df.to_dict(orient="records") if hasattr(plan_df, 'to_dict') else []
-                
-                return {
-                    "status": "success",
-                    "plan": plan_records,
-                    "summary": summary
-                }
-            else:
-                logger.warning(f"예상치 못한 결과 형식: {result}")
-                return result
-            
-        except Exception as e:
-            logger.error(f"최적화 실행 중 오류: {e}")
-            logger.error(traceback.format_exc())
-            raise
-    
-    with concurrent.futures.ThreadPoolExecutor() as executor:
+    """프로세스 풀(상주 워커)에서 최적화 실행.
+    GA에는 optimization_timeout을 마감으로 넘겨 시간 안에 그때까지의 최선 식단을 받고,
+    408은 마감 + optimization_grace까지도 결과가 없을 때만. 요청이 끊기면 취소 토큰으로 워커를 멈춤."""
+    from app.services import optimizer_pool
+
+    logger.info(f"최적화 시작 - 파라미터: {params}")
+    logger.info(f"사용할 파일 경로: {paths}")
+    future = cancel = None
+    try:
+        timeout_sec = getattr(settings, "optimization_timeout", 180)
+        grace_sec = getattr(settings, "optimization_grace", 15)
+        logger.info(f"최적화 마감: {timeout_sec}초 (+여유 {grace_sec}초)")
+        cancel = optimizer_pool.new_cancel_event()
+        future = optimizer_pool.submit_optimization(params, seed=params.get("seed"), paths=paths,
+                                                    deadline=time.time() + timeout_sec, cancel=cancel)
+
+        result = await asyncio.wait_for(
+            asyncio.wrap_future(future),
+            timeout=timeout_sec + grace_sec
+        )
+        attach_front(paths, params, result)
+        logger.info(f"최적화 완료 - 계획 행 수: {len(result.get('plan', []))}, "
+                    f"중단 사유: {result.get('summary', {}).get('stopped_reason')}")
+        logger.info(f"Summary: {result.get('summary')}")
+        return result
+    except asyncio.TimeoutError:
+        logger.error("최적화 시간 초과")
+        _cancel_job(future, cancel)
+        raise HTTPException(status_code=408, detail="최적화 시간이 초과되었습니다.")
+    except asyncio.CancelledError:
+        logger.warning("요청 취소 - 최적화 작업 중단")
+        _cancel_job(future, cancel)
+        raise
+    except InfeasibleParamsError as e:
+        logger.warning(f"불가능한 요청(사전 점검): {e}")
+        raise HTTPException(status_code=422, detail={"message": str(e), "report": e.report})
+    except ValueError as e:   # 잘못된 요청 값(engine, locked/free_days/base_plan 등)
+        logger.warning(f"잘못된 요청: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"최적화 비동기 실행 오류: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"최적화 실행 오류: {e}")
+
+def _cancel_job(future, cancel):
+    """대기 중이면 큐에서 빼고, 실행 중이면 취소 토큰으로 다음 세대에서 멈추게 함"""
+    if future is not None:
+        future.cancel()
+    if cancel is not None:
         try:
-            future = executor.submit(run_optimize)
-            timeout_sec = getattr(settings, "optimization_timeout", 180)
-            logger.info(f"최적화 타임아웃: {timeout_sec}초")
-            
-            result = await asyncio.wait_for(
-                asyncio.wrap_future(future), 
-                timeout=timeout_sec
+            cancel.set()
+        except Exception as e:  # Manager가 이미 내려간 경우(서버 종료 중)
+            logger.warning(f"취소 토큰 설정 실패: {e}")
+
+@router.on_event("startup")
+async def start_optimizer_pool():
+    """서버 시작 시 워커 풀 생성 + 프리셋 카탈로그 미리 적재"""
+    from app.services import optimizer_pool
+    try:
+        preset = build_paths_from_settings()
+    except HTTPException:
+        preset = None
+    optimizer_pool.warm_up(preset)
+
+@router.on_event("shutdown")
+async def stop_optimizer_pool():
+    from app.services import optimizer_pool
+    optimizer_pool.shutdown_pool()
+
+async def payload_params(payload: OptimizePayload) -> Dict[str, Any]:
+    """요청 params. warm_start/base_plan이 작업 ID면 그 작업 결과의 plan으로 바꿈(SQLite 조회가 있어 스레드에서)"""
+    from app.services.warm_start import PLAN_REF_KEYS, resolve_job_ref
+    params = payload.params.dict()
+    if any(isinstance(params.get(k), str) for k in PLAN_REF_KEYS):
+        params = await asyncio.to_thread(resolve_job_ref, params)
+    return params
+
+def payload_paths(payload: OptimizePayload) -> Dict[str, str]:
+    """요청의 CSV 경로(프리셋 또는 직접 지정). price/nutr 없으면 400"""
+    if payload.use_preset:
+        paths = build_paths_from_settings()
+    else:
+        if not payload.paths:
+            raise HTTPException(
+                status_code=400, 
+                detail="use_preset=false일 때는 paths가 필요합니다."
             )
-            return result
-        except asyncio.TimeoutError:
-            logger.error("최적화 시간 초과")
-            raise HTTPException(status_code=408, detail="최적화 시간이 초과되었습니다.")
-        except Exception as e:
-            logger.error(f"최적화 비동기 실행 오류: {e}")
-            logger.error(traceback.format_exc())
-            raise HTTPException(status_code=500, detail=f"최적화 실행 오류: {e}")
+        paths = {k: v for k, v in payload.paths.dict().items() if v is not None}
+    
+    # 필수 경로 확인
+    if not paths.get("price") or not paths.get("nutr"):
+        raise HTTPException(
+            status_code=400, 
+            detail="price와 nutr 경로는 필수입니다."
+        )
+    return paths
 
 @router.post("/optimize")
 async def optimize_mealplan(payload: OptimizePayload):
@@ -145,28 +221,13 @@ async def optimize_mealplan(payload: OptimizePayload):
             logger.warning(f"큰 일수 요청: {payload.params.days}일 - 처리 시간이 오래 걸릴 수 있습니다")
         
         # 경로 설정
-        if payload.use_preset:
-            paths = build_paths_from_settings()
-        else:
-            if not payload.paths:
-                raise HTTPException(
-                    status_code=400, 
-                    detail="use_preset=false일 때는 paths가 필요합니다."
-                )
-            paths = {k: v for k, v in payload.paths.dict().items() if v is not None}
-        
-        # 필수 경로 확인
-        if not paths.get("price") or not paths.get("nutr"):
-            raise HTTPException(
-                status_code=400, 
-                detail="price와 nutr 경로는 필수입니다."
-            )
+        paths = payload_paths(payload)
         
         # 최적화 실행
         logger.info("최적화 프로세스 시작...")
         result = await run_optimization_async(
             paths=paths, 
-            params=payload.params.dict()
+            params=await payload_params(payload)
         )
         
         if not result:
@@ -200,6 +261,174 @@ async def optimize_mealplan(payload: OptimizePayload):
             detail=f"최적화 처리 중 오류가 발생했습니다: {str(e)}"
         )
 
+# ===== 진행 스트리밍(SSE) =====
+# 이벤트: start {run_id} → progress {세대별 스냅샷}* → result {status, summary, plan} | error {status, message}
+# 실행 중 POST /optimize/stream/{run_id}/accept 하면 그때까지의 최선 식단으로 확정(stopped_reason="accepted"),
+# /stop 하면 중단(stopped_reason="cancelled", 최선 식단은 그대로 전달). 연결이 끊겨도 중단.
+STREAM_POLL      = 0.5    # 진행 큐 대기(초)
+STREAM_HEARTBEAT = 15.0   # 스냅샷이 없을 때 keep-alive 주석 간격(초)
+
+_streams: Dict[str, Dict[str, Any]] = {}   # run_id → {"cancel", "accept", "future"}
+
+def _sse(event: str, data: Any) -> str:
+    body = json.dumps(data, ensure_ascii=False, default=lambda o: o.item() if hasattr(o, "item") else str(o))
+    return f"event: {event}\ndata: {body}\n\n"
+
+def _next_snapshot(queue, timeout: float):
+    """진행 큐에서 스냅샷 하나(없으면 None). 블로킹이라 스레드에서 호출"""
+    try:
+        return queue.get(timeout=timeout) if timeout > 0 else queue.get_nowait()
+    except Empty:
+        return None
+
+async def _stream_events(run_id: str, future, queue, give_up_at: float, paths: Dict[str, str], params: Dict[str, Any]):
+    loop = asyncio.get_running_loop()
+    last = time.monotonic()
+    try:
+        yield _sse("start", {"run_id": run_id})
+        while not future.done():
+            if time.time() > give_up_at:
+                _cancel_job(future, _streams[run_id]["cancel"])
+                yield _sse("error", {"status": 408, "message": "최적화 시간이 초과되었습니다."})
+                return
+            snap = await loop.run_in_executor(None, _next_snapshot, queue, STREAM_POLL)
+            if snap is not None:
+                yield _sse("progress", snap); last = time.monotonic()
+            elif time.monotonic() - last > STREAM_HEARTBEAT:
+                yield ": ping\n\n"; last = time.monotonic()
+        while (snap := _next_snapshot(queue, 0)) is not None:
+            yield _sse("progress", snap)
+        try:
+            result = future.result()
+            attach_front(paths, params, result)
+            yield _sse("result", {"status": result.get("status", "success"),
+                                  "summary": result.get("summary", {}), "plan": result.get("plan", [])})
+        except InfeasibleParamsError as e:
+            yield _sse("error", {"status": 422, "message": str(e), "report": e.report})
+        except ValueError as e:
+            yield _sse("error", {"status": 400, "message": str(e)})
+        except Exception as e:
+            logger.error(f"스트리밍 최적화 실패: {e}")
+            yield _sse("error", {"status": 500, "message": f"최적화 실행 오류: {e}"})
+    finally:
+        entry = _streams.pop(run_id, None)
+        if entry is not None and not future.done():
+            logger.warning(f"[{run_id}] 스트림 종료 - 최적화 작업 중단")
+            _cancel_job(future, entry["cancel"])
+
+@router.post("/optimize/stream")
+async def optimize_mealplan_stream(payload: OptimizePayload):
+    """식단 최적화 진행 스트리밍(SSE). 세대별 최고/평균 점수, 가능해 수, 현재 최선 식단 요약을 보냄"""
+    from app.services import optimizer_pool
+
+    paths = payload_paths(payload)
+    params = await payload_params(payload)
+    timeout_sec = getattr(settings, "optimization_timeout", 180)
+    grace_sec = getattr(settings, "optimization_grace", 15)
+    deadline = time.time() + timeout_sec
+    cancel, accept = optimizer_pool.new_cancel_event(), optimizer_pool.new_cancel_event()
+    queue = optimizer_pool.new_progress_queue()
+    future = optimizer_pool.submit_optimization(params, seed=params.get("seed"), paths=paths, deadline=deadline,
+                                                cancel=cancel, accept=accept, progress=queue)
+    run_id = uuid.uuid4().hex
+    _streams[run_id] = {"cancel": cancel, "accept": accept, "future": future}
+    logger.info(f"[{run_id}] 스트리밍 최적화 시작 - 파라미터: {params}")
+    return StreamingResponse(_stream_events(run_id, future, queue, deadline + grace_sec, paths, params),
+                             media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def _stream_entry(run_id: str) -> Dict[str, Any]:
+    entry = _streams.get(run_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="진행 중인 최적화가 없습니다.")
+    return entry
+
+@router.post("/optimize/stream/{run_id}/accept")
+async def accept_stream(run_id: str):
+    """현재 최선 식단으로 확정: GA가 다음 세대에서 멈추고 스트림으로 result 이벤트가 감"""
+    _stream_entry(run_id)["accept"].set()
+    return {"run_id": run_id, "status": "accepting"}
+
+@router.post("/optimize/stream/{run_id}/stop")
+async def stop_stream(run_id: str):
+    """중단: GA가 다음 세대에서 멈춤(stopped_reason='cancelled')"""
+    _stream_entry(run_id)["cancel"].set()
+    return {"run_id": run_id, "status": "stopping"}
+
+# ===== 비동기 작업(job) =====
+@router.post("/jobs", status_code=202)
+async def create_job(payload: OptimizePayload):
+    """최적화 작업 제출 → 바로 job_id 반환(결과는 GET /jobs/{job_id}로 조회)"""
+    from app.services.job_queue import get_job_manager, JobQueueFull
+
+    paths = payload_paths(payload)
+    try:
+        job = get_job_manager().submit(await payload_params(payload), paths)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "10"})
+    return {"job_id": job.id, "status": job.status}
+
+@router.get("/jobs")
+async def list_jobs(limit: int = 20):
+    """최근 작업 목록(결과 제외)"""
+    from app.services.job_queue import get_job_manager
+    mgr = get_job_manager()
+    return {"pending": mgr.pending(), "max_pending": mgr.max_pending,
+            "jobs": [j.to_dict(with_result=False) for j in mgr.recent(limit)]}
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """작업 상태/결과: queued | running | succeeded | failed | cancelled"""
+    from app.services.job_queue import get_job_manager
+    job = await asyncio.to_thread(get_job_manager().get, job_id)   # 메모리에 없으면 SQLite 조회
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job.to_dict()
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """작업 취소: 대기 중이면 제거, 실행 중이면 다음 세대에서 멈추고 그때까지의 최선 식단을 result에 남김"""
+    from app.services.job_queue import get_job_manager
+    job = get_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return {"job_id": job.id, "status": job.status, "cancel_requested": job.cancel_requested}
+
+# ===== 파레토 앞(engine="pareto") =====
+class ParetoPick(BaseModel):
+    index: Optional[int] = Field(None, ge=0, description="summary.pareto.points의 index")
+    weights: Optional[Dict[str, float]] = Field(None, description="index 대신 {nutrition, cost, preference} 가중치(앞 위 정규화 가중합 최대인 점)")
+
+def _front_or_404(front_id: str) -> Dict[str, Any]:
+    from app.services.ga_pareto import get_front
+    entry = get_front(front_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="파레토 앞을 찾을 수 없습니다(프로세스별 보관: 서버 재시작/다른 워커/보관 개수 초과 시 다시 최적화).")
+    return entry
+
+@router.get("/pareto/{front_id}")
+async def get_pareto_front(front_id: str):
+    """파레토 앞의 점 목록(영양/비용/선호)과 기본 선택점"""
+    from app.services.ga_pareto import PARETO_OBJECTIVES
+    entry = _front_or_404(front_id)
+    return {"front_id": front_id, "objectives": list(PARETO_OBJECTIVES),
+            "points": entry["points"], "selected": entry["selected"]}
+
+@router.post("/pareto/{front_id}/pick")
+async def pick_pareto_point(front_id: str, payload: ParetoPick):
+    """앞 위의 다른 점 식단(다시 최적화하지 않음)"""
+    from app.services.ga_pareto import pick_point, StaleFrontError
+    _front_or_404(front_id)
+    try:
+        plan_df, summary = await asyncio.to_thread(pick_point, front_id, payload.index, payload.weights)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="파레토 앞을 찾을 수 없습니다.")
+    except StaleFrontError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "success", "summary": summary, "plan": plan_df.to_dict(orient="records")}
+
 @router.get("/")
 async def mealplan_root():
     """식단 계획 API 루트"""
@@ -207,10 +436,12 @@ async def mealplan_root():
         "message": "Meal Planning API",
         "version": "1.0.0",
         "endpoints": {
-            "optimize": "POST /optimize - 식단 최적화"
+            "optimize": "POST /optimize - 식단 최적화",
+            "optimize_stream": "POST /optimize/stream - 진행 스트리밍(SSE), /optimize/stream/{run_id}/accept|stop",
+            "jobs": "POST /jobs - 비동기 작업 제출, GET/DELETE /jobs/{job_id} - 상태·결과 조회/취소",
+            "pareto": "GET /pareto/{front_id} - 파레토 앞(engine=pareto), POST /pareto/{front_id}/pick - 다른 점 식단"
         },
-        "preset_available": bool(getattr(settings, "meal_price_csv", None) and 
-                                getattr(settings, "meal_nutr_csv", None))
+        "preset_available": bool(getattr(settings, "meal_price_csv", None) and _preset_nutr_csv())
     }
 
 @router.get("/status")
@@ -2,9 +2,11 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
+import asyncio
 import logging
 import re
 from app.core.config import settings
+from app.services.presolve import InfeasibleParamsError
 
 # 실제 CSV 데이터 기반 에이전트 임포트
 from app.services.workflow_agents import (
@@ -60,6 +62,28 @@ def get_real_data_paths() -> Dict[str, str]:
         logger.error(f"CSV 경로 설정 실패: {e}")
         raise HTTPException(status_code=500, detail=f"데이터 파일 경로 오류: {e}")
 
+def get_optimize_paths() -> Dict[str, str]:
+    """최적화용 CSV 경로 (mealplan 프리셋 우선, 실패 시 워크플로우 전용 경로)"""
+    from app.api.mealplan import build_paths_from_settings
+    
+    try:
+        # 기존 CSV 경로 시스템 사용
+        return build_paths_from_settings()
+    except Exception:
+        # fallback: 워크플로우 전용 경로 사용
+        data_paths = get_real_data_paths()
+        paths = {
+            'price': data_paths['price'],
+            'nutr': data_paths['nutrition']
+        }
+        if 'category' in data_paths:
+            paths['cat'] = data_paths['category']
+        if 'student_pref' in data_paths:
+            paths['pref'] = data_paths['student_pref']
+        if 'pair_pref' in data_paths:
+            paths['cooc'] = data_paths['pair_pref']
+        return paths
+
 class UserRequest(BaseModel):
     user_request: str = Field(..., description="사용자의 자연어 요청")
 
@@ -164,6 +188,11 @@ class NaturalLanguageRequest(BaseModel):
     natural_text: str
     current_params: Dict[str, Any]
 
+class WorkflowStrategiesRequest(BaseModel):
+    use_preset: bool = True
+    strategy_types: List[str] = Field(default_factory=lambda: ['nutrition', 'economic', 'preference'])
+    params: Dict[str, Any]
+
 @router.post("/optimize")
 async def optimize_with_strategy(request: WorkflowOptimizeRequest):
     """실제 CSV 데이터와 전략을 기반으로 메뉴 최적화 수행"""
@@ -180,24 +209,7 @@ async def optimize_with_strategy(request: WorkflowOptimizeRequest):
         weights = strategy_weights.get(request.strategy_type, strategy_weights['nutrition'])
         
         # 실제 CSV 경로 사용 (기존 mealplan API와 호환)
-        from app.api.mealplan import build_paths_from_settings
-        
-        try:
-            # 기존 CSV 경로 시스템 사용
-            paths = build_paths_from_settings()
-        except Exception:
-            # fallback: 워크플로우 전용 경로 사용
-            data_paths = get_real_data_paths()
-            paths = {
-                'price': data_paths['price'],
-                'nutr': data_paths['nutrition']
-            }
-            if 'category' in data_paths:
-                paths['cat'] = data_paths['category']
-            if 'student_pref' in data_paths:
-                paths['pref'] = data_paths['student_pref']
-            if 'pair_pref' in data_paths:
-                paths['cooc'] = data_paths['pair_pref']
+        paths = get_optimize_paths()
         
         # 전략이 적용된 파라미터로 최적화
         enhanced_params = {
@@ -206,15 +218,18 @@ async def optimize_with_strategy(request: WorkflowOptimizeRequest):
             'strategy_type': request.strategy_type
         }
         
+        from app.services.warm_start import PLAN_REF_KEYS, resolve_job_ref
+        if any(isinstance(enhanced_params.get(k), str) for k in PLAN_REF_KEYS):   # 작업 ID → 그 작업 결과 plan
+            enhanced_params = await asyncio.to_thread(resolve_job_ref, enhanced_params)
+        
         logger.info(f"최적화 파라미터: {enhanced_params}")
         logger.info(f"사용할 CSV 파일들: {paths}")
         
-        # 실제 최적화 실행 (기존 GA 알고리즘 활용)
-        from app.services.optimizer import optimize_menu
-        plan_df, summary = optimize_menu(paths=paths, params=enhanced_params)
-        
-        # DataFrame을 dict로 변환
-        plan_records = plan_df.to_dict(orient="records") if hasattr(plan_df, 'to_dict') else []
+        # 실제 최적화 실행: 이벤트 루프를 막지 않도록 최적화 프로세스 풀에서(마감/취소 처리 포함)
+        from app.api.mealplan import run_optimization_async
+        result = await run_optimization_async(paths=paths, params=enhanced_params)
+        plan_records = result.get("plan", [])
+        summary = result.get("summary", {})
         
         logger.info(f"실제 CSV 기반 최적화 완료: {len(plan_records)}개 메뉴")
         
@@ -226,12 +241,46 @@ async def optimize_with_strategy(request: WorkflowOptimizeRequest):
             "data_source": f"실제 파일: {list(paths.values())}"
         }
         
+    except HTTPException:
+        raise  # run_optimization_async가 408/422/500으로 변환해 둔 것
+    except InfeasibleParamsError as e:
+        logger.warning(f"불가능한 요청(사전 점검): {e}")
+        raise HTTPException(status_code=422, detail={"message": str(e), "report": e.report})
     except Exception as e:
         logger.error(f"실제 데이터 기반 최적화 실패: {e}")
         import traceback
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"CSV 기반 최적화 중 오류: {str(e)}")
 
+@router.post("/optimize-strategies")
+async def optimize_all_strategies(request: WorkflowStrategiesRequest):
+    """전략 여러 개의 식단을 GA 한 번으로 생성 (/optimize를 전략마다 호출하는 것보다 빠름)"""
+    try:
+        logger.info(f"다중 전략 최적화: {request.strategy_types}")
+        paths = get_optimize_paths()
+        
+        from app.api.mealplan import run_optimization_async
+        result = await run_optimization_async(paths=paths, params={**request.params, 'strategies': request.strategy_types})
+        plans = result.get("strategies", {})
+        
+        logger.info(f"다중 전략 최적화 완료: {list(plans)}")
+        return {
+            "status": "success",
+            "strategies": plans,
+            "data_source": f"실제 파일: {list(paths.values())}"
+        }
+        
+    except HTTPException:
+        raise
+    except InfeasibleParamsError as e:
+        logger.warning(f"불가능한 요청(사전 점검): {e}")
+        raise HTTPException(status_code=422, detail={"message": str(e), "report": e.report})
+    except Exception as e:
+        logger.error(f"다중 전략 최적화 실패: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"CSV 기반 최적화 중 오류: {str(e)}")
+
 @router.get("/")
 async def workflow_root():
     """워크플로우 API 루트 - 실제 데이터 연결 상태 확인"""
@@ -254,7 +303,8 @@ async def workflow_root():
                 "generate-alternatives": "POST - 실제 CSV 데이터 기반 AI 전략 대안 생성",
                 "agent-analysis": "POST - 실제 데이터 기반 멀티 에이전트 분석",
                 "parse-natural-language": "POST - 자연어 파라미터 파싱",
-                "optimize": "POST - 실제 CSV 데이터 + 전략 기반 메뉴 최적화"
+                "optimize": "POST - 실제 CSV 데이터 + 전략 기반 메뉴 최적화",
+                "optimize-strategies": "POST - 여러 전략 식단을 GA 한 번으로 생성"
             },
             "data_files": file_status,
             "ready": all(status["exists"] for status in file_status.values())
@@ -63,12 +63,19 @@ class Settings(BaseSettings):
 
     # ===== 타임아웃 설정 (중요!) =====
     request_timeout: int = 300  # 5분
-    optimization_timeout: int = 180  # 3분
+    optimization_timeout: int = 180  # 3분 (GA 마감: 넘기면 그때까지의 최선 식단 반환)
+    optimization_grace: int = 15     # 마감 후 결과 생성/전달 여유(이것까지 넘기면 408)
     keep_alive_timeout: int = 65
     
     # ===== 서버 성능 설정 =====
     workers: int = 1
     worker_connections: int = 1000
+    optimizer_workers: int = 0  # 식단 최적화 프로세스 풀 크기 (0이면 CPU 코어 수)
+    job_queue_max: int = 32     # 비동기 최적화 작업 대기+실행 최대 수 (넘치면 429)
+    result_cache_size: int = 64              # 최적화 결과 메모리 캐시 항목 수 (0이면 끔)
+    result_cache_dir: Optional[str] = None   # 결과 디스크 캐시 폴더(워커 간 공유, 없으면 메모리만)
+    result_cache_disk_mb: int = 256          # 디스크 캐시 최대 용량
+    catalog_snapshot_dir: Optional[str] = None   # compile-catalog 스냅샷 폴더(있으면 CSV 파싱 대신 mmap)
     
     # ---------- 유틸 ----------
     @staticmethod
@@ -0,0 +1,190 @@
+# backend/app/services/catalog_snapshot.py
+"""
+컴파일된 카탈로그 스냅샷(열 단위 .npy + manifest.json)
+- compile-catalog: CSV 5종 → 후보 카탈로그 배열(가격/매크로/미크로/카테고리 코드/선호 가중치/정규화 키) + 메뉴쌍 CSR
+- 버전 = 원본 CSV 내용 해시. <out>/<version>/에 쓰고 <out>/CURRENT로 가리킴(원자적 교체)
+- 서비스는 스냅샷을 읽기 전용 mmap으로 열어 같은 페이지를 공유(워커 여럿이어도 DataFrame 파싱 없음)
+- 원본 CSV가 스냅샷과 다르면 쓰지 않고 평소처럼 파싱
+- 분석기(RealDataAnalyzer/CSVLLMAnalyzer/CSVRPAAnalyzer)용 원본 표는 get_table()로 파일 버전당 한 번만 파싱
+
+사용: python -m app.services.catalog_snapshot compile-catalog [--out DIR] [--price CSV --nutr CSV ...]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.services.ga_engine import (
+    MenuCatalog, CATALOG_PATH_KEYS, COOC_DENSE_MAX, file_digest, load_catalog, read_robust, sp,
+)
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+MANIFEST        = "manifest.json"
+CURRENT         = "CURRENT"
+NUMERIC_COLS    = ("feats", "price", "kcal", "carbo", "protein", "fat", "micros", "pref_w", "category")
+TEXT_COLS       = ("keys", "names")
+TABLE_CACHE_MAX = 16
+
+# ===== 컴파일 =====
+def _to_csr(W, n: int):
+    """dense/CSR 메뉴쌍 행렬 → (indptr, indices, data)"""
+    if sp is not None and sp.issparse(W):
+        W = W.tocsr()
+        return W.indptr.astype(np.int64), W.indices.astype(np.int64), W.data.astype(np.float64)
+    r, c = np.nonzero(W)
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(r, minlength=n))]).astype(np.int64)
+    return indptr, c.astype(np.int64), W[r, c].astype(np.float64)
+
+def _sources(paths: Dict[str, str]) -> Dict[str, dict]:
+    return {k: {"path": paths.get(k) or "", "sha256": file_digest(paths.get(k))} for k in CATALOG_PATH_KEYS}
+
+def _version(sources: Dict[str, dict]) -> str:
+    body = json.dumps([SNAPSHOT_FORMAT] + [sources[k]["sha256"] for k in CATALOG_PATH_KEYS])
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()[:16]
+
+def compile_snapshot(paths: Dict[str, str], out_dir: str) -> dict:
+    """CSV 5종 → <out_dir>/<version>/ 스냅샷. 같은 버전이 이미 있으면 다시 만들지 않음. 반환: manifest"""
+    sources = _sources(paths)
+    version = _version(sources)
+    dest = os.path.join(out_dir, version)
+    os.makedirs(out_dir, exist_ok=True)
+
+    if not os.path.exists(os.path.join(dest, MANIFEST)):
+        catalog, cooc = load_catalog(paths)
+        n = len(catalog)
+        tmp = os.path.join(out_dir, f".{version}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        arrays = {k: np.ascontiguousarray(getattr(catalog, k)) for k in NUMERIC_COLS}
+        arrays.update({k: np.array([str(x) for x in getattr(catalog, k)], dtype=str) for k in TEXT_COLS})
+        if cooc is not None:
+            arrays["cooc_indptr"], arrays["cooc_indices"], arrays["cooc_data"] = _to_csr(cooc, n)
+        for name, arr in arrays.items():
+            np.save(os.path.join(tmp, f"{name}.npy"), arr, allow_pickle=False)
+        manifest = {
+            "format": SNAPSHOT_FORMAT, "version": version, "created_at": time.time(),
+            "n": n, "null_snack_idx": int(catalog.null_snack_idx), "fingerprint": catalog.fingerprint,
+            "has_cooc": cooc is not None, "sources": sources,
+            "arrays": {name: {"dtype": str(a.dtype), "shape": list(a.shape)} for name, a in arrays.items()},
+        }
+        with open(os.path.join(tmp, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        try:
+            os.replace(tmp, dest)
+        except OSError:   # 다른 프로세스가 먼저 같은 버전을 만든 경우
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    tmp_cur = os.path.join(out_dir, f".{CURRENT}.{os.getpid()}.tmp")
+    with open(tmp_cur, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp_cur, os.path.join(out_dir, CURRENT))
+    return read_manifest(out_dir, version)
+
+# ===== 읽기 =====
+def read_manifest(out_dir: str, version: Optional[str] = None) -> Optional[dict]:
+    try:
+        if version is None:
+            with open(os.path.join(out_dir, CURRENT), encoding="utf-8") as f:
+                version = f.read().strip()
+        with open(os.path.join(out_dir, version, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("format") == SNAPSHOT_FORMAT else None
+
+def load_snapshot(out_dir: str, manifest: dict):
+    """스냅샷 → (MenuCatalog, 메뉴쌍 행렬 또는 None). 숫자 배열은 읽기 전용 mmap."""
+    base = os.path.join(out_dir, manifest["version"])
+    arr = lambda name, mmap="r": np.load(os.path.join(base, f"{name}.npy"), mmap_mode=mmap, allow_pickle=False)
+    cols = {k: arr(k) for k in NUMERIC_COLS}
+    cols.update({k: arr(k, None).astype(object) for k in TEXT_COLS})   # dict 조회/문자열 연산용(작음)
+    catalog = MenuCatalog(null_snack_idx=int(manifest["null_snack_idx"]), **cols)
+
+    cooc, n = None, int(manifest["n"])
+    if manifest.get("has_cooc"):
+        indptr, indices, data = arr("cooc_indptr"), arr("cooc_indices"), arr("cooc_data")
+        if n > COOC_DENSE_MAX and sp is not None:
+            cooc = sp.csr_matrix((data, indices, indptr), shape=(n, n))
+        else:   # 작은 카탈로그는 build_cooc_matrix와 같은 dense 형태
+            cooc = np.zeros((n, n), dtype=np.float64)
+            rows = np.repeat(np.arange(n), np.diff(indptr))
+            cooc[rows, indices] = data
+    return catalog, cooc
+
+def find_snapshot(key: tuple):
+    """catalog_key(paths)와 원본 내용이 같은 현재 스냅샷이 있으면 (catalog, cooc), 없으면 None"""
+    out_dir = settings.resolve_path(getattr(settings, "catalog_snapshot_dir", None))
+    if not out_dir:
+        return None
+    manifest = read_manifest(out_dir)
+    if manifest is None:
+        return None
+    if [manifest["sources"].get(k, {}).get("sha256") for k, _, _ in key] != [d for _, _, d in key]:
+        logger.info(f"카탈로그 스냅샷 {manifest['version']}이 현재 CSV와 달라 사용하지 않음(compile-catalog 재실행 필요)")
+        return None
+    try:
+        return load_snapshot(out_dir, manifest)
+    except Exception as e:
+        logger.warning(f"카탈로그 스냅샷 읽기 실패({out_dir}): {e}")
+        return None
+
+# ===== 분석기용 원본 표 =====
+_tables: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_tables_lock = threading.Lock()
+
+def get_table(path) -> pd.DataFrame:
+    """CSV 원본 표(파일 버전당 한 번만 파싱). 요청끼리 공유하므로 고치지 말 것."""
+    path = str(path)
+    key = (path, file_digest(path))
+    with _tables_lock:
+        df = _tables.get(key)
+        if df is not None:
+            _tables.move_to_end(key)
+            return df
+    df = read_robust(path)
+    with _tables_lock:
+        _tables[key] = df
+        while len(_tables) > TABLE_CACHE_MAX:
+            _tables.popitem(last=False)
+    return df
+
+# ===== CLI =====
+def _preset_paths() -> Dict[str, Optional[str]]:
+    return {
+        "price": settings.resolve_path(settings.meal_price_csv),
+        "nutr": settings.resolve_path(settings.meal_nutrition_csv),
+        "cat": settings.resolve_path(settings.meal_category_csv),
+        "pref": settings.resolve_path(settings.meal_student_pref_csv),
+        "cooc": settings.resolve_path(settings.meal_pair_pref_csv),
+    }
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m app.services.catalog_snapshot")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    c = sub.add_parser("compile-catalog", help="CSV 5종을 mmap 스냅샷으로 컴파일")
+    c.add_argument("--out", default=getattr(settings, "catalog_snapshot_dir", None), help="스냅샷 폴더(기본 CATALOG_SNAPSHOT_DIR)")
+    for k in CATALOG_PATH_KEYS:
+        c.add_argument(f"--{k}", help=f"{k} CSV(기본: 프리셋 경로)")
+    args = ap.parse_args(argv)
+
+    if not args.out:
+        ap.error("--out 또는 CATALOG_SNAPSHOT_DIR가 필요합니다.")
+    paths = _preset_paths()
+    paths.update({k: getattr(args, k) for k in CATALOG_PATH_KEYS if getattr(args, k)})
+    manifest = compile_snapshot(paths, settings.resolve_path(args.out))
+    print(f"스냅샷 {manifest['version']}: 메뉴 {manifest['n']}개 → {settings.resolve_path(args.out)}")
+
+if __name__ == "__main__":
+    main()
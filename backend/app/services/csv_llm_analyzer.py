@@ -4,12 +4,14 @@ from typing import Dict, List, Any
 import re
 import json
 from pathlib import Path
+from app.services.catalog_snapshot import get_table
 
 class CSVLLMAnalyzer:
     def __init__(self, data_paths: Dict[str, str]):
-        self.nutrition_df = pd.read_csv(data_paths['nutrition'])
-        self.price_df = pd.read_csv(data_paths['price'])
-        self.category_df = pd.read_csv(data_paths.get('category', '')) if data_paths.get('category') else None
+        # 파일 버전당 한 번만 파싱된 공유 표(읽기 전용)
+        self.nutrition_df = get_table(data_paths['nutrition'])
+        self.price_df = get_table(data_paths['price'])
+        self.category_df = get_table(data_paths['category']) if data_paths.get('category') else None
         
         # CSV 데이터 기반 지식베이스 구축
         self._build_knowledge_base()
@@ -3,12 +3,14 @@ import numpy as np
 from typing import Dict, List, Any
 import os
 from pathlib import Path
+from app.services.catalog_snapshot import get_table
 
 class CSVRPAAnalyzer:
     def __init__(self, data_paths: Dict[str, str]):
-        self.nutrition_df = pd.read_csv(data_paths['nutrition'])
-        self.price_df = pd.read_csv(data_paths['price']) 
-        self.preference_df = pd.read_csv(data_paths.get('student_pref', '')) if data_paths.get('student_pref') else None
+        # 파일 버전당 한 번만 파싱된 공유 표(읽기 전용)
+        self.nutrition_df = get_table(data_paths['nutrition'])
+        self.price_df = get_table(data_paths['price'])
+        self.preference_df = get_table(data_paths['student_pref']) if data_paths.get('student_pref') else None
         
     def analyze_menu_results(self, menu_results: List[Dict]) -> List[Dict]:
         """3개 GA 결과를 실제 CSV 데이터로 분석"""
@@ -0,0 +1,147 @@
+# backend/app/services/day_bank.py
+"""
+가능한 하루 조합(밥, 국, 반찬×3, 간식) 뱅크
+- 무작위 조합을 배치로 대량 생성 → feasible_day_mask(칼로리 밴드/단백질 칼로리 상한/g 매크로/미크로 하한)로 거름
+- 간식 없는 날(NULL_SNACK)과 간식 있는 날(수요일) 뱅크를 따로 보관
+- 하루 비용 순으로 정렬해 두고(searchsorted로 비용 구간 조회), 칼로리 정렬 인덱스도 함께 보관
+- (카탈로그 지문, 하루 제약) 단위로 프로세스 안에서 캐시 → 요청마다 다시 만들지 않음
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from app.services.ga_engine import (
+    GAConfig, MenuCatalog, CATEGORY_CODES, K_PER_DAY, MICRO_COLS, _F_PRICE, _F_KCAL, feasible_day_mask,
+)
+
+# ===== 뱅크 크기/생성 한도 =====
+DAY_BANK_SIZE      = 20000      # 종류(간식 유/무)별 목표 조합 수
+DAY_BANK_BATCH     = 50000      # 한 번에 뽑는 후보 수
+DAY_BANK_MAX_DRAWS = 1_000_000  # 종류별 최대 시도 수(제약이 빡빡해도 여기서 멈춤)
+DAY_BANK_CACHE_MAX = 8
+
+@dataclass
+class DaySet:
+    """한 종류(간식 유/무)의 가능한 하루 조합. cost 오름차순 정렬."""
+    combos: np.ndarray      # (M, K_PER_DAY) 메뉴 인덱스, 슬롯 순서 그대로
+    cost: np.ndarray        # (M,) 하루 비용
+    kcal: np.ndarray        # (M,) 하루 칼로리
+    kcal_order: np.ndarray  # kcal 오름차순 인덱스
+    draws: int = 0          # 생성에 쓴 후보 수
+
+    def __len__(self) -> int:
+        return len(self.combos)
+
+    def cost_range(self, lo: float, hi: float) -> Tuple[int, int]:
+        """비용이 [lo, hi]인 조합의 [start, stop) 범위"""
+        return int(np.searchsorted(self.cost, lo, "left")), int(np.searchsorted(self.cost, hi, "right"))
+
+    def kcal_range(self, lo: float, hi: float) -> np.ndarray:
+        """칼로리가 [lo, hi]인 조합 인덱스"""
+        k = self.kcal[self.kcal_order]
+        return self.kcal_order[np.searchsorted(k, lo, "left"):np.searchsorted(k, hi, "right")]
+
+    def sample(self, rng: np.random.Generator, size: int, cost_window: Optional[Tuple[float, float]] = None) -> np.ndarray:
+        """조합 인덱스 size개. cost_window 안에 조합이 없으면 전체에서 뽑음."""
+        a, b = (0, len(self)) if cost_window is None else self.cost_range(*cost_window)
+        if b <= a: a, b = 0, len(self)
+        return rng.integers(a, b, size=size)
+
+    def sample_near(self, rng: np.random.Generator, size: int, target_kcal: float,
+                    cost_window: Optional[Tuple[float, float]] = None, k: int = 4) -> np.ndarray:
+        """k개씩 뽑아 목표 칼로리에 가장 가까운 것(칼로리 편차 벌점이 제곱이라 밴드 안이어도 차이가 큼)"""
+        cand = self.sample(rng, size * k, cost_window).reshape(size, k)
+        best = np.abs(self.kcal[cand] - target_kcal).argmin(axis=1)
+        return cand[np.arange(size), best]
+
+@dataclass
+class FeasibleDayBank:
+    plain: DaySet   # 간식 없는 날
+    snack: DaySet   # 간식 있는 날(간식 허용일용)
+
+    def for_day(self, snack_day: bool) -> DaySet:
+        return self.snack if snack_day else self.plain
+
+    def covers(self, cfg: GAConfig) -> bool:
+        """모든 날을 뱅크에서 채울 수 있는지"""
+        if len(self.plain) == 0: return False
+        return len(self.snack) > 0 or not any(cfg.snack_allowed)
+
+    def summary(self) -> dict:
+        return {"plain": len(self.plain), "snack": len(self.snack),
+                "draws": int(self.plain.draws + self.snack.draws)}
+
+# ===== 생성 =====
+def _build_set(catalog: MenuCatalog, cfg: GAConfig, snack_pool: np.ndarray, rng: np.random.Generator) -> DaySet:
+    cat = catalog.category
+    rice = np.flatnonzero(cat == CATEGORY_CODES["rice"])
+    soup = np.flatnonzero(cat == CATEGORY_CODES["soup"])
+    side = np.flatnonzero(cat == CATEGORY_CODES["side"])
+    F = catalog.feats
+    empty = DaySet(np.empty((0, K_PER_DAY), dtype=np.int64), np.empty(0), np.empty(0), np.empty(0, dtype=np.int64))
+    if len(rice) == 0 or len(soup) == 0 or len(side) < 3 or len(snack_pool) == 0:
+        return empty
+
+    found, seen, draws = [], 0, 0
+    while draws < DAY_BANK_MAX_DRAWS and seen < DAY_BANK_SIZE:
+        B = DAY_BANK_BATCH
+        r  = rice[rng.integers(0, len(rice), B)]
+        s  = soup[rng.integers(0, len(soup), B)]
+        sd = np.sort(side[rng.integers(0, len(side), (B, 3))], axis=1)   # 반찬은 정렬해 중복 조합을 한 가지로
+        sn = snack_pool[rng.integers(0, len(snack_pool), B)]
+        draws += B
+        distinct = (sd[:, 0] != sd[:, 1]) & (sd[:, 1] != sd[:, 2])
+        S = F[r] + F[s] + F[sd[:, 0]] + F[sd[:, 1]] + F[sd[:, 2]] + F[sn]
+        ok = distinct & feasible_day_mask(S, cfg)
+        if ok.any():
+            found.append(np.column_stack([r[ok], s[ok], sd[ok], sn[ok]]))
+            seen += int(ok.sum())
+
+    if not found:
+        empty.draws = draws
+        return empty
+    combos = np.unique(np.concatenate(found), axis=0)[:DAY_BANK_SIZE]
+    sums = F[combos].sum(axis=1)
+    order = np.argsort(sums[:, _F_PRICE], kind="stable")
+    combos, sums = combos[order], sums[order]
+    return DaySet(combos=combos, cost=sums[:, _F_PRICE].copy(), kcal=sums[:, _F_KCAL].copy(),
+                  kcal_order=np.argsort(sums[:, _F_KCAL], kind="stable"), draws=draws)
+
+def build_day_bank(catalog: MenuCatalog, cfg: GAConfig, seed: int = 0) -> FeasibleDayBank:
+    rng = np.random.default_rng(seed)
+    snack_real = np.flatnonzero((catalog.category == CATEGORY_CODES["snack"])
+                                & (np.arange(len(catalog)) != catalog.null_snack_idx))
+    return FeasibleDayBank(
+        plain=_build_set(catalog, cfg, np.array([catalog.null_snack_idx]), rng),
+        snack=_build_set(catalog, cfg, snack_real, rng),
+    )
+
+# ===== 캐시 =====
+_cache: "OrderedDict[tuple, FeasibleDayBank]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+def constraint_key(cfg: GAConfig) -> tuple:
+    """뱅크 내용을 좌우하는 하루 제약만 모은 키(예산/반복/GA 설정은 무관)"""
+    return (
+        tuple(round(x, 6) for x in cfg.kcal_band),
+        tuple((k, tuple(v)) for k, v in sorted(cfg.macro_bounds.items())),
+        tuple((k, float(cfg.micro_min[k])) for k in MICRO_COLS if cfg.micro_min.get(k)),
+    )
+
+def get_day_bank(catalog: MenuCatalog, cfg: GAConfig) -> FeasibleDayBank:
+    """(카탈로그 지문, 하루 제약)별 캐시 조회, 없으면 생성"""
+    key = (catalog.fingerprint, constraint_key(cfg))
+    with _cache_lock:
+        bank = _cache.get(key)
+        if bank is not None:
+            _cache.move_to_end(key)
+            return bank
+    bank = build_day_bank(catalog, cfg)
+    with _cache_lock:
+        _cache[key] = bank
+        while len(_cache) > DAY_BANK_CACHE_MAX:
+            _cache.popitem(last=False)
+    return bank
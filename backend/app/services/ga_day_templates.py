@@ -0,0 +1,83 @@
+# backend/app/services/ga_day_templates.py
+"""
+하루 템플릿 GA (engine="day_templates")
+- 염색체 = 날마다 '가능한 하루 조합 뱅크'의 템플릿 ID → 하루 제약(칼로리/매크로/미크로)은 구성상 항상 충족
+- GA는 월 단위 목표(예산, 월간 반복, REPEAT_WINDOW_DAYS, 선호/조합)만 최적화
+- 평가는 메뉴 단위로 펼친 뒤 기존 평가기(evaluate_full/evaluate_children)를 그대로 사용
+"""
+from typing import Optional
+
+import numpy as np
+
+from app.services.ga_engine import (
+    GAConfig, GAPopulation, MenuCatalog, RunLimits, EvalState, K_PER_DAY, pair_parents, daywise_tail_mask,
+    iter_population,
+)
+from app.services.day_bank import FeasibleDayBank, get_day_bank
+
+class DayTemplatePopulation(GAPopulation):
+    """self.tpl (N, D) 템플릿 ID와 펼친 self.pop (N, D*K)을 함께 유지"""
+
+    def __init__(self, catalog: MenuCatalog, cooc, cfg: GAConfig, rng: np.random.Generator,
+                 bank: Optional[FeasibleDayBank] = None):
+        bank = bank if bank is not None else get_day_bank(catalog, cfg)
+        if not bank.covers(cfg):
+            raise RuntimeError("가능한 하루 조합이 없어 day_templates 엔진을 쓸 수 없습니다. 제약 완화/메뉴 확장을 고려하세요.")
+        self.sets = [bank.for_day(bool(a)) for a in cfg.snack_allowed]
+        # 조합 → 템플릿 ID 역색인(엘리트/이주 개체를 템플릿으로 되돌릴 때). 날은 DaySet 두 개(간식 유/무)만
+        # 공유하므로 날마다가 아니라 종류마다 하나
+        self._lookup = {kind: {c.tobytes(): j for j, c in enumerate(bank.for_day(kind).combos)}
+                        for kind in {bool(a) for a in cfg.snack_allowed}}
+
+        window = (cfg.budget_per_person*0.8, cfg.budget_per_person*1.2)
+        self.tpl = np.column_stack([ds.sample_near(rng, cfg.pop_size, cfg.target_kcal, window) for ds in self.sets])
+        super().__init__(catalog, cooc, cfg, rng, pop=self.expand(self.tpl), bank=bank)
+
+    def expand(self, tpl: np.ndarray) -> np.ndarray:
+        """(N, D) 템플릿 ID → (N, D*K) 메뉴 인덱스"""
+        tpl = np.atleast_2d(tpl)
+        days = np.stack([ds.combos[tpl[:, d]] for d, ds in enumerate(self.sets)], axis=1)
+        return days.reshape(len(tpl), -1).astype(int)
+
+    def to_tpl(self, genes: np.ndarray) -> np.ndarray:
+        days = np.asarray(genes, dtype=np.int64).reshape(self.cfg.days, K_PER_DAY)
+        kinds = self.cfg.snack_allowed
+        return np.array([self._lookup[bool(kinds[d])][days[d].tobytes()] for d in range(self.cfg.days)])
+
+    def _breed(self, sel: np.ndarray):
+        cfg, rng, tpl = self.cfg, self.rng, self.tpl
+        N, D = tpl.shape
+        pa, pb = pair_parents(sel)
+
+        # 일 단위 1점 교차(쌍마다 cx_rate)
+        child = tpl[pa]
+        tail = daywise_tail_mask(N, D, cfg, rng)
+        child[tail] = tpl[pb][tail]
+
+        # 돌연변이: 날마다 mut_rate로 같은 종류의 다른 템플릿
+        mut = rng.random((N, D)) < cfg.mut_rate
+        for d in np.flatnonzero(mut.any(axis=0)):
+            rows = np.flatnonzero(mut[:, d])
+            child[rows, d] = self.sets[d].sample_near(rng, len(rows), cfg.target_kcal)
+
+        self.tpl = child
+        return self.expand(child), pa, pb
+
+    def _place(self, i: int, genes: np.ndarray, st: Optional[EvalState] = None, j: int = 0):
+        row = super()._place(i, genes, st, j)
+        self.tpl[i] = self.to_tpl(genes)
+        return row
+
+def iter_day_template_ga(catalog: MenuCatalog, cooc, cfg: GAConfig, rng: Optional[np.random.Generator] = None,
+                         limits: Optional[RunLimits] = None, info: Optional[dict] = None):
+    """iter_ga와 같은 규약의 세대별 스냅샷 제너레이터"""
+    if rng is None: rng = np.random.default_rng(cfg.seed)
+    yield from iter_population(DayTemplatePopulation(catalog, cooc, cfg, rng), cfg.generations, limits, info)
+
+def run_day_template_ga(catalog: MenuCatalog, cooc, cfg: GAConfig, rng: Optional[np.random.Generator] = None,
+                        limits: Optional[RunLimits] = None, info: Optional[dict] = None, on_progress=None):
+    """run_ga와 같은 규약(limits/정체에 걸리면 그때까지의 최고, info에 report(), 세대마다 on_progress)"""
+    info = {} if info is None else info
+    for snap in iter_day_template_ga(catalog, cooc, cfg, rng, limits, info):
+        if on_progress is not None: on_progress(snap)
+    return info["best"]
@@ -6,11 +6,19 @@
 - 가능해(예산/반복/영양 모두 충족) 해가 없으면 ANY-best라도 반환하고 summary.warning으로 알림.
 """
 
-import os, re, random
-from typing import Optional, List, Dict, Tuple
+import io, os, re, hashlib, threading, time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from typing import Optional, List, Dict, Tuple, Iterator
 import numpy as np
 import pandas as pd
 
+try:
+    from scipy import sparse as sp
+except ImportError:
+    sp = None
+
 # ================== 기본 하이퍼/상수 ==================
 DAYS_IN_MONTH      = 20
 DAILY_SLOTS        = ["rice","soup","side","side","side","snack"]
@@ -46,10 +54,10 @@ SNACK_LAMBDA     = 1e6
 NULL_SNACK_KEY   = "__null_snack__"
 NULL_SNACK_NAME  = "(no snack)"
 WEEK_DAYS        = 5
-def is_snack_allowed_day(day_index: int) -> bool:
+def is_snack_allowed_day(day_index: int, days: int = DAYS_IN_MONTH) -> bool:
     # 월(0)~금(4) 중 수(2)만, 그리고 4주까지만
     week = day_index // WEEK_DAYS
-    return (day_index % WEEK_DAYS == 2) and (week < min(4, (DAYS_IN_MONTH // WEEK_DAYS)))
+    return (day_index % WEEK_DAYS == 2) and (week < min(4, (days // WEEK_DAYS)))
 
 # 하드컷/페널티 상수
 STRICT_BUDGET       = True
@@ -61,7 +69,34 @@ GENERATIONS   = 300
 CX_RATE       = 0.10
 MUT_RATE      = 0.10
 SEED          = 100
-random.seed(SEED); np.random.seed(SEED)
+USE_DAY_BANK  = True   # 가능한 하루 조합 뱅크로 초기해/하루 단위 돌연변이
+DAY_MUT_RATE  = 0.02   # 하루 통째 교체 확률(일 단위)
+
+# 섬 모델(islands>1일 때): 섬마다 별도 프로세스, MIGRATE_EVERY 세대마다 상위 MIGRANTS개를 링으로 교환
+# pop_size는 섬 전체 합: 섬마다 pop_size // islands (ISLAND_MIN_POP 이상)
+ISLANDS        = 1
+MIGRATE_EVERY  = 20
+MIGRANTS       = 5
+ISLAND_MIN_POP = 20
+
+# 조기 종료/부분 재시작
+STALL_GENERATIONS = 80     # 최고 점수가 이만큼 연속으로 안 오르면 종료(0이면 끔)
+MIN_REL_IMPROVE   = 1e-4   # 이 비율 미만 상승은 개선으로 안 봄
+RESTART_FRAC      = 0.20   # 다양성이 무너지면 하위 이 비율을 새 개체로 교체(0이면 끔)
+DIVERSITY_MIN     = 0.05   # 다양성 = 최고 개체와 다른 유전자 비율의 평균
+
+# 웜 스타트(params.warm_start): 초기 개체군 중 이 비율을 이전 식단/엘리트와 그 변이 사본으로
+WARM_FRAC   = 0.5
+ELITE_KEEP  = 8      # 실행마다 보관하는 상위 개체 수(다음 웜 스타트용)
+
+# 목적 성분(개체별 벡터). 전략 가중치(nutrition/cost/preference_weight)는 그룹 안 성분에 고르게 나눠 줌.
+# 단일 실행은 params.weighted_fitness=true일 때만 가중합 적합도(기본은 기존 state_scores), 다중 전략 실행은 항상
+OBJECTIVES      = ("kcal", "macro", "micro", "cost", "pref", "cooc", "repeat")
+DAY_OBJECTIVES  = ("kcal", "macro", "micro", "pref", "cooc")   # 일별로 캐시하는 성분
+STRATEGY_GROUPS = {"nutrition_weight": ("kcal", "macro", "micro"), "cost_weight": ("cost",),
+                   "preference_weight": ("pref", "cooc")}
+REPEAT_WEIGHT   = 1.0 / 3  # 반복 벌점은 전략과 무관하게 그룹 하나의 평균 몫
+SCALE_SEED      = 0        # 정규화 스케일용 기준 개체군 시드(실행 시드와 무관 → 같은 카탈로그/설정이면 같은 스케일)
 
 # 미크로 영양소
 MICRO_COLS = ["vit_a","thiamin","riboflavin","niacin","vit_c","vit_d","calcium","iron"]
@@ -75,12 +110,171 @@ MICRO_MIN = {
 }
 MICRO_SCALE = {k: 1.0 for k in MICRO_COLS}  # 정규화 스케일
 
+# 배치 평가용 피처 열 순서: 가격 | kcal | 탄/단/지 | 미크로 | 선호
+FEAT_COLS = ["price_per_person","kcal","carbo","protein","fat"] + MICRO_COLS + ["pref_w"]
+_F_PRICE, _F_KCAL, _F_CARB, _F_PROT, _F_FAT = 0, 1, 2, 3, 4
+_F_MICRO = slice(5, 5 + len(MICRO_COLS))
+_F_PREF  = 5 + len(MICRO_COLS)
+
+# ================== 실행별 설정 ==================
+@dataclass(frozen=True)
+class GeneLock:
+    """고정 유전자(params.locked / free_days, locked_slots): mask 위치는 항상 genes 값, 나머지만 진화"""
+    mask: np.ndarray    # (D*K,) bool
+    genes: np.ndarray   # (D*K,) 고정 위치의 카탈로그 인덱스(자유 위치 값은 쓰지 않음)
+
+    @property
+    def day_locked(self) -> np.ndarray:
+        """(D,) 하루 통째로 고정된 날"""
+        return self.mask.reshape(-1, K_PER_DAY).all(axis=1)
+
+    def items(self) -> np.ndarray:
+        """고정된 메뉴 인덱스(중복 제거)"""
+        return np.unique(self.genes[self.mask])
+
+    def apply(self, pop: np.ndarray) -> np.ndarray:
+        """제자리: 개체(군)의 고정 위치를 고정값으로"""
+        pop[..., self.mask] = self.genes[self.mask]
+        return pop
+
+    def summary(self) -> dict:
+        free = np.flatnonzero(~self.day_locked)
+        return {"locked_genes": int(self.mask.sum()), "free_days": (free + 1).tolist()}
+
+@dataclass(frozen=True)
+class GAConfig:
+    """최적화 1회분 불변 설정. 위 모듈 상수는 기본값으로만 쓰고 실행 중에는 바꾸지 않는다
+    (동시 요청끼리 전역을 덮어쓰지 않도록)."""
+    days: int = DAYS_IN_MONTH
+    budget_per_person: float = BUDGET_PER_PERSON
+    target_kcal: float = TARGET_KCAL
+    kcal_band_frac: float = KCAL_BAND_FRAC
+    macro_target_pct: Dict[str, float] = field(default_factory=lambda: dict(MACRO_TARGET_PCT))
+    macro_bounds: Dict[str, Tuple[float, float]] = field(default_factory=lambda: dict(MACRO_BOUNDS))
+    max_repeat_per_month: int = MAX_REPEAT_PER_MONTH
+    repeat_window_days: int = REPEAT_WINDOW_DAYS
+    w_pref: float = W_PREF
+    w_cooc: float = W_COOC
+    w_micro_sum: float = W_MICRO_SUM
+    p_micro_shortfall: float = P_MICRO_SHORTFALL
+    p_kcal: float = P_KCAL
+    p_macro: float = P_MACRO
+    p_repeat: float = P_REPEAT
+    p_budget_total: float = P_BUDGET_TOTAL
+    snack_lambda: float = SNACK_LAMBDA
+    strict_budget: bool = STRICT_BUDGET
+    pop_size: int = POP_SIZE
+    generations: int = GENERATIONS
+    cx_rate: float = CX_RATE
+    mut_rate: float = MUT_RATE
+    seed: Optional[int] = SEED
+    use_day_bank: bool = USE_DAY_BANK
+    day_mut_rate: float = DAY_MUT_RATE
+    islands: int = ISLANDS
+    migrate_every: int = MIGRATE_EVERY
+    migrants: int = MIGRANTS
+    stall_generations: int = STALL_GENERATIONS
+    min_rel_improve: float = MIN_REL_IMPROVE
+    restart_frac: float = RESTART_FRAC
+    diversity_min: float = DIVERSITY_MIN
+    warm_frac: float = WARM_FRAC
+    objective_weights: Optional[Tuple[float, ...]] = None   # OBJECTIVES 순서. None이면 기존 단일 점수
+    objective_scales: Optional[Tuple[float, ...]] = None    # 성분 정규화 스케일(섬/실행 간 공유). None이면 개체군마다 계산
+    lock: Optional[GeneLock] = None   # 고정 슬롯(prepare_run이 카탈로그에 맞춰 채움)
+    micro_min: Dict[str, float] = field(default_factory=lambda: dict(MICRO_MIN))
+    micro_scale: Dict[str, float] = field(default_factory=lambda: dict(MICRO_SCALE))
+
+    @property
+    def kcal_band(self) -> Tuple[float, float]:
+        return self.target_kcal * (1.0 - self.kcal_band_frac), self.target_kcal * (1.0 + self.kcal_band_frac)
+
+    @property
+    def total_budget(self) -> float:
+        return float(self.budget_per_person) * float(self.days)
+
+    def is_snack_allowed_day(self, day_index: int) -> bool:
+        return is_snack_allowed_day(day_index, self.days)
+
+    @cached_property
+    def snack_allowed(self) -> np.ndarray:
+        return np.array([self.is_snack_allowed_day(d) for d in range(self.days)], dtype=bool)
+
+    @classmethod
+    def from_params(cls, params: dict) -> "GAConfig":
+        """API params(dict) → 설정. 없는 키는 모듈 기본값."""
+        kw = {}
+        # 일수/예산/칼로리
+        if "days" in params:          kw["days"]              = int(params["days"])
+        if "budget_won" in params:    kw["budget_per_person"] = float(params["budget_won"])
+        if "target_kcal" in params:   kw["target_kcal"]       = float(params["target_kcal"])
+        if "STRICT_BUDGET" in params: kw["strict_budget"]     = bool(params["STRICT_BUDGET"])
+
+        # 매크로 범위·목표 (% 입력을 0~1로 변환)
+        def _pair(p): return (float(p[0])/100.0, float(p[1])/100.0)
+        def _mid(p):  return (float(p[0]) + float(p[1]))/200.0
+        _b = dict(MACRO_BOUNDS); _t = dict(MACRO_TARGET_PCT)
+        if "carb_range" in params:
+            _b["carbo"] = _pair(params["carb_range"]); _t["carbo"] = _mid(params["carb_range"])
+        if "prot_range" in params:
+            _b["protein"] = _pair(params["prot_range"]); _t["protein"] = _mid(params["prot_range"])
+        if "fat_range"  in params:
+            _b["fat"]    = _pair(params["fat_range"]);  _t["fat"]    = _mid(params["fat_range"])
+        kw["macro_bounds"], kw["macro_target_pct"] = _b, _t
+
+        # (선택) 가중치/패널티 튜닝
+        for key, attr in [("W_PREF","w_pref"), ("P_REPEAT","p_repeat"), ("P_BUDGET_TOTAL","p_budget_total"),
+                          ("P_MACRO","p_macro"), ("P_KCAL","p_kcal"), ("P_MICRO_SHORTFALL","p_micro_shortfall"),
+                          ("W_MICRO_SUM","w_micro_sum"), ("W_COOC","w_cooc")]:
+            if key in params: kw[attr] = float(params[key])
+
+        # (선택) GA 설정
+        if "pop_size" in params:    kw["pop_size"]    = int(params["pop_size"])
+        if "generations" in params: kw["generations"] = int(params["generations"])
+        if params.get("seed") is not None: kw["seed"] = int(params["seed"])
+        if "use_day_bank" in params: kw["use_day_bank"] = bool(params["use_day_bank"])
+        if params.get("day_mut_rate") is not None: kw["day_mut_rate"] = float(params["day_mut_rate"])
+        if params.get("islands"):       kw["islands"]       = max(1, int(params["islands"]))
+        if params.get("migrate_every"): kw["migrate_every"] = max(1, int(params["migrate_every"]))
+        if params.get("migrants") is not None: kw["migrants"] = max(0, int(params["migrants"]))
+        if params.get("stall_generations") is not None: kw["stall_generations"] = max(0, int(params["stall_generations"]))
+        if params.get("min_rel_improve") is not None: kw["min_rel_improve"] = max(0.0, float(params["min_rel_improve"]))
+        if params.get("restart_frac") is not None: kw["restart_frac"] = min(max(0.0, float(params["restart_frac"])), 0.9)
+        if params.get("diversity_min") is not None: kw["diversity_min"] = max(0.0, float(params["diversity_min"]))
+        if params.get("warm_frac") is not None: kw["warm_frac"] = min(max(0.0, float(params["warm_frac"])), 1.0)
+
+        # 전략 가중치 → 목적 성분 가중치(정규화 성분의 가중합으로 적합도 계산). 명시적으로 켤 때만:
+        # optimizer.optimize_menu는 strategy_type 기본값으로 가중치를 늘 채우므로 가중치 유무로 판단하면 안 됨
+        if params.get("weighted_fitness"):
+            kw["objective_weights"] = objective_weights(*(params.get(k) for k in STRATEGY_GROUPS))
+        return cls(**kw)
+
+    def with_micro_scale(self, catalog: "MenuCatalog") -> "GAConfig":
+        """미크로 정규화 스케일 = 카탈로그 최대값 × 하루 슬롯 수."""
+        scale = {k: max(1e-9, float(catalog.micros[:, j].max()) * K_PER_DAY) for j, k in enumerate(MICRO_COLS)}
+        return replace(self, micro_scale=scale)
+
+    def with_objective_scales(self, catalog: "MenuCatalog", cooc) -> "GAConfig":
+        """목적 성분 정규화 스케일을 실행 전에 한 번 고정. SCALE_SEED 기준 개체군에서 계산하므로
+        섬마다/실행마다 같은 스케일 → 가중합 적합도를 섬 사이, 실행 사이에 비교할 수 있음."""
+        bank = None
+        if self.use_day_bank:
+            from app.services.day_bank import get_day_bank
+            bank = get_day_bank(catalog, self)
+        pop = init_population(catalog, cat_index_lists(catalog), self, np.random.default_rng(SCALE_SEED), bank)
+        scales = objective_scales(evaluate_full(pop, catalog, cooc, self), catalog, self)
+        return replace(self, objective_scales=tuple(float(s) for s in scales))
+
+DEFAULT_CONFIG = GAConfig()
+
 # ================== 유틸/로딩 ==================
 def read_robust(path: str) -> pd.DataFrame:
-    for enc in ("utf-8-sig","cp949","utf-8"):
-        try: return pd.read_csv(path, encoding=enc)
-        except Exception: pass
-    return pd.read_csv(path)
+    """바이트는 한 번만 읽고 디코딩만 인코딩별로 시도(인코딩마다 파일 전체를 다시 파싱하지 않음)"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    for enc in ("utf-8-sig","cp949"):
+        try: return pd.read_csv(io.StringIO(raw.decode(enc)))
+        except UnicodeDecodeError: pass
+    return pd.read_csv(io.BytesIO(raw))
 
 def to_num(x):
     return pd.to_numeric(str(x).replace(",","").strip(), errors="coerce")
@@ -214,9 +408,81 @@ def attach_pref_weight(cand: pd.DataFrame, pref_map: Dict[str,float]) -> pd.Data
     c["pref_w"] = c["menu_key"].map(pref_map).fillna(0.0).astype(float)
     return c
 
+# ================== 배열 기반 후보 카탈로그 ==================
+CATEGORY_CODES = {"rice": 0, "soup": 1, "side": 2, SNACK_CATEGORY: 3}
+
+@dataclass
+class MenuCatalog:
+    """GA 핫루프용 후보 메뉴 카탈로그. build_candidates + add_null_snack 결과에서 한 번만 만든다."""
+    keys: np.ndarray       # menu_key (object)
+    names: np.ndarray      # 표시용 메뉴명 (object)
+    category: np.ndarray   # int8 카테고리 코드 (CATEGORY_CODES, 미분류 -1)
+    price: np.ndarray      # float32
+    kcal: np.ndarray
+    carbo: np.ndarray
+    protein: np.ndarray
+    fat: np.ndarray
+    micros: np.ndarray     # (n, len(MICRO_COLS)) float32
+    pref_w: np.ndarray     # float32
+    null_snack_idx: int
+    feats: Optional[np.ndarray] = field(default=None, repr=False)  # (n, F) float64, FEAT_COLS 순서
+
+    def __post_init__(self):
+        if self.feats is None:
+            self.feats = np.column_stack(
+                [self.price, self.kcal, self.carbo, self.protein, self.fat, self.micros, self.pref_w])
+        self.feats = np.ascontiguousarray(self.feats, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def subset(self, idx) -> "MenuCatalog":
+        """idx(원래 인덱스) 행만 남긴 카탈로그. NULL_SNACK은 반드시 포함돼야 함."""
+        idx = np.asarray(idx, dtype=int)
+        pos = np.flatnonzero(idx == self.null_snack_idx)
+        if len(pos) == 0:
+            raise ValueError("subset에 NULL_SNACK이 빠져 있습니다.")
+        return MenuCatalog(
+            keys=self.keys[idx], names=self.names[idx], category=self.category[idx],
+            price=self.price[idx], kcal=self.kcal[idx], carbo=self.carbo[idx],
+            protein=self.protein[idx], fat=self.fat[idx], micros=self.micros[idx], pref_w=self.pref_w[idx],
+            null_snack_idx=int(pos[0]), feats=self.feats[idx],
+        )
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """내용 해시(카탈로그별 캐시 키). 같은 CSV면 프로세스가 달라도 같은 값."""
+        h = hashlib.sha1()
+        h.update(self.feats.tobytes())
+        h.update(self.category.tobytes())
+        h.update("\x1f".join(map(str, self.keys)).encode("utf-8"))
+        h.update(str(self.null_snack_idx).encode())
+        return h.hexdigest()
+
+    @classmethod
+    def from_frame(cls, cand: pd.DataFrame, null_snack_idx: int) -> "MenuCatalog":
+        def col(k):
+            if k not in cand.columns: return np.zeros(len(cand), dtype=np.float64)
+            return pd.to_numeric(cand[k], errors="coerce").fillna(0.0).values.astype(np.float64)
+        full = np.column_stack([col(k) for k in FEAT_COLS])
+        f32 = full.astype(np.float32)
+        codes = cand["category"].map(CATEGORY_CODES).fillna(-1).values.astype(np.int8)
+        return cls(
+            keys=cand["menu_key"].values.astype(object),
+            names=cand["menu"].values.astype(object),
+            category=codes,
+            price=f32[:, _F_PRICE].copy(), kcal=f32[:, _F_KCAL].copy(), carbo=f32[:, _F_CARB].copy(),
+            protein=f32[:, _F_PROT].copy(), fat=f32[:, _F_FAT].copy(),
+            micros=np.ascontiguousarray(f32[:, _F_MICRO]), pref_w=f32[:, _F_PREF].copy(),
+            null_snack_idx=int(null_snack_idx),
+            # 평가는 원본 float64 값으로: 초기해 보정이 칼로리 밴드 경계(810/990)에 딱 붙는 경우가 많아
+            # float32 반올림만으로 하드컷 판정이 뒤집힐 수 있음
+            feats=full,
+        )
+
 def load_cooc_df(path: Optional[str]) -> pd.DataFrame:
     if not path or not os.path.exists(path):
-        return pd.DataFrame(columns=["pair","weight"])
+        return pd.DataFrame(columns=["a","b","weight"])
     df = read_robust(path)
     normcols = {str(c).replace("\ufeff","").strip().lower(): c for c in df.columns}
     def pick(cands):
@@ -236,28 +502,69 @@ def load_cooc_df(path: Optional[str]) -> pd.DataFrame:
     wmin, wmax = df["weight"].min(), df["weight"].max()
     if (wmax > 1.5) or (wmin < 0):
         df["weight"] = (df["weight"] - wmin) / (wmax - wmin + 1e-9)
-    df["pair"] = df.apply(lambda r: tuple(sorted([r["a"], r["b"]])), axis=1)
-    df = df.groupby("pair", as_index=False).agg(weight=("weight","mean"))
+    # 순서 무관 쌍 키: (작은 키, 큰 키)
+    swap = df["a"] > df["b"]
+    a, b = df["a"].where(~swap, df["b"]), df["b"].where(~swap, df["a"])
+    df = (pd.DataFrame({"a": a, "b": b, "weight": df["weight"]})
+            .groupby(["a","b"], as_index=False).agg(weight=("weight","mean")))
     return df
 
-def build_cooc_index(cand: pd.DataFrame, cooc_df: pd.DataFrame) -> Dict[Tuple[int,int], float]:
-    key_to_idx = {k:i for i,k in enumerate(cand["menu_key"])}
-    pairs = {}
-    for _, r in cooc_df.iterrows():
-        a_key, b_key = r["pair"]
-        if a_key in key_to_idx and b_key in key_to_idx:
-            ia, ib = sorted([key_to_idx[a_key], key_to_idx[b_key]])
-            pairs[(ia, ib)] = float(r["weight"])
-    return pairs
+COOC_DENSE_MAX = 4096  # 후보 수가 이보다 크면 CSR (dense n×n float64 = 128MB)
+
+def build_cooc_matrix(catalog: MenuCatalog, cooc_df: pd.DataFrame):
+    """메뉴쌍 선호를 대칭 행렬 W로. 작은 카탈로그는 dense ndarray, 큰 카탈로그는 CSR. 쌍이 없으면 None."""
+    n = len(catalog)
+    key_to_idx = {k:i for i,k in enumerate(catalog.keys)}
+    ia = cooc_df["a"].map(key_to_idx)
+    ib = cooc_df["b"].map(key_to_idx)
+    ok = ia.notna() & ib.notna()
+    ia = ia[ok].astype(int).values; ib = ib[ok].astype(int).values
+    w  = cooc_df["weight"][ok].astype(float).values
+    off = ia != ib
+    ia, ib, w = ia[off], ib[off], w[off]
+    if len(w) == 0:
+        return None
+    if n > COOC_DENSE_MAX and sp is not None:
+        rows = np.concatenate([ia, ib]); cols = np.concatenate([ib, ia])
+        W = sp.csr_matrix((np.concatenate([w, w]), (rows, cols)), shape=(n, n))
+        W.sum_duplicates()
+        return W
+    W = np.zeros((n, n), dtype=np.float64)
+    W[ia, ib] = w
+    W[ib, ia] = w
+    return W
+
+def subset_cooc(W, idx):
+    """MenuCatalog.subset(idx)에 맞춰 W도 같은 행/열만"""
+    if W is None: return None
+    idx = np.asarray(idx, dtype=int)
+    if sp is not None and sp.issparse(W):
+        return W[idx][:, idx].tocsr()
+    return np.ascontiguousarray(W[np.ix_(idx, idx)])
+
+_TRIU_I, _TRIU_J = np.triu_indices(K_PER_DAY, 1)
+
+def cooc_day_scores(days: np.ndarray, W) -> np.ndarray:
+    """(..., K) 일별 메뉴 인덱스 → (...) 일별 조합 점수.
+    W[idx[:,None], idx[None,:]]의 상삼각 합과 같지만 상삼각 쌍만 바로 모은다."""
+    days = np.asarray(days)
+    if W is None:
+        return np.zeros(days.shape[:-1], dtype=float)
+    ia = days[..., _TRIU_I]; ib = days[..., _TRIU_J]
+    if isinstance(W, np.ndarray):
+        vals = W[ia, ib]
+    else:
+        vals = np.asarray(W[ia.ravel(), ib.ravel()]).reshape(ia.shape)
+    return vals.sum(axis=-1)
 
 # ================== 평가/제약 ==================
-def day_metrics(indices: List[int], cand: pd.DataFrame)->Dict[str,float]:
-    sub = cand.iloc[indices]
-    cost  = float(sub["price_per_person"].sum())
-    kcal  = float(sub["kcal"].sum())
-    carbo = float(sub["carbo"].sum())
-    protein = float(sub["protein"].sum())
-    fat   = float(sub["fat"].sum())  # 반드시 포함! (is_feasible_day에서 g-비율 계산)
+def day_metrics(indices: List[int], catalog: MenuCatalog, cfg: GAConfig = DEFAULT_CONFIG)->Dict[str,float]:
+    sub = catalog.feats[indices].sum(axis=0)
+    cost  = float(sub[_F_PRICE])
+    kcal  = float(sub[_F_KCAL])
+    carbo = float(sub[_F_CARB])
+    protein = float(sub[_F_PROT])
+    fat   = float(sub[_F_FAT])  # 반드시 포함! (is_feasible_day에서 g-비율 계산)
 
     # 칼로리 기준 매크로 비중
     prot_kcal = protein * 4.0
@@ -270,10 +577,10 @@ def day_metrics(indices: List[int], cand: pd.DataFrame)->Dict[str,float]:
     fat_pct_cal  = fat_kcal  / max(pct_den, 1e-9)
 
     # 미크로 정규화 평균
-    micros = {k: float(sub[k].sum()) for k in MICRO_COLS}
+    micros = {k: float(v) for k, v in zip(MICRO_COLS, sub[_F_MICRO])}
     micro_norms = []
     for k, v in micros.items():
-        scale = max(MICRO_SCALE.get(k, 1.0), 1e-9)
+        scale = max(cfg.micro_scale.get(k, 1.0), 1e-9)
         micro_norms.append(min(v/scale, 1.0))
     micro_norm_mean = float(np.mean(micro_norms)) if micro_norms else 0.0
 
@@ -286,11 +593,10 @@ def day_metrics(indices: List[int], cand: pd.DataFrame)->Dict[str,float]:
         d[f"micro_{k}"] = v
     return d
 
-def is_feasible_day(m: dict) -> bool:
+def is_feasible_day(m: dict, cfg: GAConfig = DEFAULT_CONFIG) -> bool:
     # 칼로리 밴드
     kcal = float(m.get("kcal", 0.0))
-    lo = TARGET_KCAL * (1.0 - KCAL_BAND_FRAC)
-    hi = TARGET_KCAL * (1.0 + KCAL_BAND_FRAC)
+    lo, hi = cfg.kcal_band
     if not (lo <= kcal <= hi): return False
 
     # g-기준 매크로 비율 (칼로리 기준 단백질 상한은 별도)
@@ -301,147 +607,387 @@ def is_feasible_day(m: dict) -> bool:
     if den <= 0: return False
     carb_g = c/den; prot_g = p/den; fat_g = f/den
     for k, pct in [("carbo",carb_g),("protein",prot_g),("fat",fat_g)]:
-        lo_b, hi_b = MACRO_BOUNDS[k]
+        lo_b, hi_b = cfg.macro_bounds[k]
         if not (lo_b <= pct <= hi_b): return False
 
     # 단백질 칼로리 비중 < 0.20
     if float(m.get("prot_pct_cal", 0.0)) >= 0.20: return False
 
     # 미크로 하한
-    for k, tgt in MICRO_MIN.items():
+    for k, tgt in cfg.micro_min.items():
         if tgt and float(m.get(f"micro_{k}", 0.0)) < float(tgt):
             return False
     return True
 
-def violates_repeat_limits(ch: np.ndarray) -> bool:
+DAY_VIOLATIONS = ("kcal_band", "macro", "protein_cal", "micro")
+VIOLATIONS = DAY_VIOLATIONS + ("budget", "repeat_month", "repeat_window")
+
+def day_violation_flags(S: np.ndarray, cfg: GAConfig = DEFAULT_CONFIG) -> np.ndarray:
+    """S: (..., F) 하루 피처 합 → (..., 4) bool, 열 순서는 DAY_VIOLATIONS(True = 위반)"""
+    kcal = S[..., _F_KCAL]
+    c, p, f = S[..., _F_CARB], S[..., _F_PROT], S[..., _F_FAT]
+    out = np.zeros(S.shape[:-1] + (len(DAY_VIOLATIONS),), dtype=bool)
+    lo, hi = cfg.kcal_band
+    out[..., 0] = (kcal < lo) | (kcal > hi)
+    den = c + p + f
+    safe = np.where(den > 0, den, 1.0)
+    bad = den <= 0
+    for k, g in (("carbo", c), ("protein", p), ("fat", f)):
+        lo_b, hi_b = cfg.macro_bounds[k]
+        bad |= (g / safe < lo_b) | (g / safe > hi_b)
+    out[..., 1] = bad
+    pct_den = np.where(kcal > 0, kcal, 4.0*c + 4.0*p + 9.0*f)
+    out[..., 2] = (4.0 * p / np.maximum(pct_den, 1e-9)) >= 0.20
+    micro = S[..., _F_MICRO]
+    for j, k in enumerate(MICRO_COLS):
+        tgt = cfg.micro_min.get(k)
+        if tgt: out[..., 3] |= micro[..., j] < float(tgt)
+    return out
+
+def feasible_day_mask(S: np.ndarray, cfg: GAConfig = DEFAULT_CONFIG) -> np.ndarray:
+    """is_feasible_day의 배치판. S: (..., F) 하루 피처 합 → (...) bool"""
+    return ~day_violation_flags(S, cfg).any(axis=-1)
+
+def violates_repeat_limits(ch: np.ndarray, cfg: GAConfig = DEFAULT_CONFIG, ignore: Optional[int] = None) -> bool:
+    """ignore: 반복 제한에서 뺄 인덱스(NULL_SNACK = '간식 없음'은 메뉴가 아님)"""
     # 1) 월간 총횟수 제한
     counts = np.bincount(ch, minlength=int(ch.max())+1)
-    if np.any(counts > MAX_REPEAT_PER_MONTH): return True
+    if ignore is not None and ignore < len(counts): counts[ignore] = 0
+    if np.any(counts > cfg.max_repeat_per_month): return True
     # 2) 근접 재등장 (일 단위)
-    if REPEAT_WINDOW_DAYS > 1:
-        days = ch.reshape(DAYS_IN_MONTH, K_PER_DAY)
+    if cfg.repeat_window_days > 1:
+        days = ch.reshape(cfg.days, K_PER_DAY)
         last = {}
-        for d in range(DAYS_IN_MONTH):
+        for d in range(cfg.days):
             for idx in days[d].tolist():  # set() 쓰지 않음
-                if idx in last and (d - last[idx]) < REPEAT_WINDOW_DAYS:
+                if idx == ignore: continue
+                if idx in last and (d - last[idx]) < cfg.repeat_window_days:
                     return True
                 last[idx] = d
     return False
 
-def is_feasible_chrom(ch: np.ndarray, cand: pd.DataFrame) -> bool:
-    if violates_repeat_limits(ch): return False
+def is_feasible_chrom(ch: np.ndarray, catalog: MenuCatalog, cfg: GAConfig = DEFAULT_CONFIG) -> bool:
+    if violates_repeat_limits(ch, cfg, ignore=catalog.null_snack_idx): return False
     # 월 예산
-    total_budget = float(BUDGET_PER_PERSON) * float(DAYS_IN_MONTH)
-    month_cost = float(cand["price_per_person"].values[ch].sum())
-    if month_cost > total_budget: return False
+    month_cost = float(catalog.feats[ch, _F_PRICE].sum())
+    if month_cost > cfg.total_budget: return False
     # 일별 제약
-    days = ch.reshape(DAYS_IN_MONTH, K_PER_DAY)
-    for d in range(DAYS_IN_MONTH):
-        if not is_feasible_day(day_metrics(days[d].tolist(), cand)):
+    days = ch.reshape(cfg.days, K_PER_DAY)
+    for d in range(cfg.days):
+        if not is_feasible_day(day_metrics(days[d].tolist(), catalog, cfg), cfg):
             return False
     return True
 
-def cooc_score(indices: List[int], cooc_pairs: Dict[Tuple[int,int],float])->float:
-    if len(indices) < 2 or not cooc_pairs: return 0.0
-    s=0.0
-    for i in range(len(indices)):
-        for j in range(i+1, len(indices)):
-            a,b = sorted([indices[i], indices[j]])
-            s += cooc_pairs.get((a,b), 0.0)
-    return s
+def cooc_score(indices: List[int], W)->float:
+    if len(indices) < 2 or W is None: return 0.0
+    idx = np.asarray(indices)
+    ia, ib = np.triu_indices(len(idx), 1)
+    if isinstance(W, np.ndarray):
+        return float(W[idx[ia], idx[ib]].sum())
+    return float(np.asarray(W[idx[ia], idx[ib]]).sum())
+
+def repeat_window_day_hits(pop: np.ndarray, cfg: GAConfig) -> np.ndarray:
+    """(P, D) 일별 근접 재등장 횟수. 같은 메뉴의 직전 등장과 일수 차이가 repeat_window_days 미만이면 1회."""
+    P = len(pop)
+    if cfg.repeat_window_days <= 1:
+        return np.zeros((P, cfg.days), dtype=int)
+    # 안정 정렬하면 같은 값끼리 원래 위치 순서가 유지됨 → 인접 쌍 = (직전 등장, 현재)
+    order = np.argsort(pop, axis=1, kind="stable")
+    vals  = np.take_along_axis(pop, order, axis=1)
+    day   = order // K_PER_DAY
+    hit = np.zeros(pop.shape, dtype=bool)
+    hit[:, 1:] = (vals[:, 1:] == vals[:, :-1]) & ((day[:, 1:] - day[:, :-1]) < cfg.repeat_window_days)
+    out = np.zeros(pop.shape, dtype=bool)
+    np.put_along_axis(out, order, hit, axis=1)
+    return out.reshape(P, cfg.days, K_PER_DAY).sum(axis=2)
+
+def repeat_window_hits(pop: np.ndarray, cfg: GAConfig) -> np.ndarray:
+    """개체별 근접 재등장 횟수 합."""
+    return repeat_window_day_hits(pop, cfg).sum(axis=1)
+
+def _window_hits_at(days: np.ndarray, rows: np.ndarray, ds: np.ndarray, cfg: GAConfig) -> np.ndarray:
+    """days(P, D, K)에서 (rows[b], ds[b]) 날짜들의 근접 재등장 횟수만 계산."""
+    W, K = cfg.repeat_window_days, K_PER_DAY
+    if W <= 1 or len(rows) == 0:
+        return np.zeros(len(rows), dtype=int)
+    dd = ds[:, None] + np.arange(-(W - 1), 1)                       # (B, W)
+    win = days[rows[:, None], np.clip(dd, 0, None)]                 # (B, W, K)
+    win = np.where((dd >= 0)[..., None], win, -1).reshape(len(rows), W * K)
+    cur = win[:, -K:]
+    # 당일 k번째 슬롯은 창 안의 이전 날 전체 + 당일 앞 슬롯과만 비교
+    before = np.arange(W * K)[None, :] < ((W - 1) * K + np.arange(K))[:, None]   # (K, W*K)
+    return ((cur[:, :, None] == win[:, None, :]) & before).any(axis=2).sum(axis=1)
+
+def repeat_over_counts(pop: np.ndarray, n_items: int, cfg: GAConfig) -> np.ndarray:
+    """개체별 월간 최대 반복 횟수 초과분 합."""
+    return np.maximum(0, item_counts(pop, n_items) - cfg.max_repeat_per_month).sum(axis=1)
+
+def item_counts(pop: np.ndarray, n_items: int) -> np.ndarray:
+    """(P, n) 개체별 메뉴 등장 횟수."""
+    P = len(pop)
+    flat = pop + (np.arange(P) * n_items)[:, None]
+    return np.bincount(flat.ravel(), minlength=P * n_items).reshape(P, n_items).astype(np.int32)
+
+def day_terms(S: np.ndarray, days: np.ndarray, cooc, cfg: GAConfig):
+    """일별 합계 S(..., F)와 메뉴 인덱스 days(..., K) → (일별 점수, 일별 하드컷 여부, 일별 목적 성분 (..., 5)).
+    점수는 성분의 합(기존과 같은 순서로 더해 값이 비트 단위로 같음), 성분은 DAY_OBJECTIVES 순서."""
+    kcal = S[..., _F_KCAL]
+    carbo, protein, fat = S[..., _F_CARB], S[..., _F_PROT], S[..., _F_FAT]
 
-def fitness(chrom: np.ndarray, cand: pd.DataFrame, cooc_pairs, NULL_SNACK_IDX:int) -> float:
-    days = chrom.reshape(DAYS_IN_MONTH, K_PER_DAY)
-    prices = cand["price_per_person"].values
-    pref   = cand["pref_w"].values if "pref_w" in cand.columns else np.zeros(len(cand), dtype=float)
+    # 칼로리 기준 매크로 비중
+    prot_kcal = protein * 4.0
+    carb_kcal = carbo   * 4.0
+    fat_kcal  = fat     * 9.0
+    pct_den = np.maximum(np.where(kcal > 0, kcal, prot_kcal + carb_kcal + fat_kcal), 1e-9)
+    carb_pct_cal = carb_kcal / pct_den
+    prot_pct_cal = prot_kcal / pct_den
+    fat_pct_cal  = fat_kcal  / pct_den
+
+    # 하드컷: 단백질 칼로리 비중 / 칼로리 밴드
+    lo, hi = cfg.kcal_band
+    hard = (prot_pct_cal >= 0.20) | (kcal < lo) | (kcal > hi)
+
+    # 소프트: 칼로리/매크로 편차, 미크로, 선호/조합
+    tgt_pct = cfg.macro_target_pct
+    c_kcal = -cfg.p_kcal * (kcal - cfg.target_kcal) ** 2
+    macro_dev = cfg.p_macro * (np.abs(carb_pct_cal - tgt_pct["carbo"]) +
+                               np.abs(prot_pct_cal - tgt_pct["protein"]) +
+                               np.abs(fat_pct_cal  - tgt_pct["fat"]))
+    micro = S[..., _F_MICRO]
+    scale = np.array([max(cfg.micro_scale.get(k, 1.0), 1e-9) for k in MICRO_COLS])
+    micro_sum = cfg.w_micro_sum * np.minimum(micro / scale, 1.0).mean(axis=-1)
+    short_cols = [j for j, k in enumerate(MICRO_COLS) if cfg.micro_min.get(k)]
+    micro_short = 0.0
+    if short_cols:
+        tgt = np.array([float(cfg.micro_min[MICRO_COLS[j]]) for j in short_cols])
+        micro_short = cfg.p_micro_shortfall * np.maximum(0.0, (tgt - micro[..., short_cols]) / tgt).mean(axis=-1)
+    c_pref = cfg.w_pref * S[..., _F_PREF]
+    c_cooc = cfg.w_cooc * cooc_day_scores(days, cooc)
+
+    score = c_kcal - macro_dev
+    score += micro_sum
+    score -= micro_short
+    score += c_pref
+    score += c_cooc
+    comp = np.stack(np.broadcast_arrays(c_kcal, -macro_dev, micro_sum - micro_short, c_pref, c_cooc), axis=-1)
+    return score, hard, comp
+
+@dataclass
+class EvalState:
+    """개체군 평가 캐시: 일별 지표 벡터 + 월간 항(반복 횟수/근접 재등장)."""
+    genes: np.ndarray      # (P, D*K)
+    S: np.ndarray          # (P, D, F) 일별 합계
+    day_score: np.ndarray  # (P, D)
+    day_hard: np.ndarray   # (P, D) bool
+    rep_day: np.ndarray    # (P, D) 근접 재등장 횟수
+    counts: np.ndarray     # (P, n) 메뉴 등장 횟수
+    day_viol: np.ndarray   # (P, D, 4) bool, DAY_VIOLATIONS 순서
+    day_obj: np.ndarray    # (P, D, 5) 일별 목적 성분, DAY_OBJECTIVES 순서
+
+    def set_row(self, i: int, other: "EvalState", j: int = 0):
+        for k in ("genes", "S", "day_score", "day_hard", "rep_day", "counts", "day_viol", "day_obj"):
+            getattr(self, k)[i] = getattr(other, k)[j]
+
+def evaluate_full(pop: np.ndarray, catalog: MenuCatalog, cooc, cfg: GAConfig) -> EvalState:
+    """(POP, DAYS*K) 개체군 전체를 처음부터 평가."""
+    pop = np.asarray(pop, dtype=int)
+    if pop.ndim == 1: pop = pop[None, :]
+    days = pop.reshape(len(pop), cfg.days, K_PER_DAY)
+    # (P, D, K, F) 모아서 슬롯 합 → (P, D, F)
+    S = catalog.feats[days].sum(axis=2)
+    day_score, day_hard, day_obj = day_terms(S, days, cooc, cfg)
+    return EvalState(pop.copy(), S, day_score, day_hard,
+                     repeat_window_day_hits(pop, cfg), item_counts(pop, len(catalog)), day_violation_flags(S, cfg),
+                     day_obj)
+
+def evaluate_children(prev: EvalState, children: np.ndarray, pa: np.ndarray, pb: np.ndarray,
+                      catalog: MenuCatalog, cooc, cfg: GAConfig, copy: bool = True) -> EvalState:
+    """교차/변이 자식의 증분 평가. 자식 i는 부모 pa[i](주)/pb[i](교차 상대)에서 왔다고 보고,
+    부모와 날이 통째로 같으면 그 부모의 일별 캐시를 재사용하고 바뀐 날만 다시 계산한다.
+    월간 항은 등장 횟수 증감과 바뀐 날 주변 창(repeat_window_days)만 갱신."""
+    P, D, K = len(children), cfg.days, K_PER_DAY
+    G  = children.reshape(P, D, K)
+    Pd = prev.genes.reshape(len(prev.genes), D, K)
+    eq_a = (G == Pd[pa]).all(axis=2)
+    eq_b = (G == Pd[pb]).all(axis=2) & ~eq_a
+    src = np.where(eq_a, pa[:, None], np.where(eq_b, pb[:, None], -1))   # (P, D), -1 = 다시 계산
+    src_c = np.maximum(src, 0)
+    dd = np.broadcast_to(np.arange(D), (P, D))
+
+    S = prev.S[src_c, dd]
+    day_score = prev.day_score[src_c, dd]
+    day_hard = prev.day_hard[src_c, dd]
+    day_viol = prev.day_viol[src_c, dd]
+    day_obj = prev.day_obj[src_c, dd]
+    rows, ds = np.nonzero(src < 0)
+    if len(rows):
+        S[rows, ds] = catalog.feats[G[rows, ds]].sum(axis=1)
+        day_score[rows, ds], day_hard[rows, ds], day_obj[rows, ds] = day_terms(S[rows, ds], G[rows, ds], cooc, cfg)
+        day_viol[rows, ds] = day_violation_flags(S[rows, ds], cfg)
+
+    # 근접 재등장: 창 안의 날이 모두 같은 부모에서 그대로 왔을 때만 재사용
+    valid = src >= 0
+    for j in range(1, cfg.repeat_window_days):
+        same = np.ones((P, D), dtype=bool)
+        same[:, j:] = src[:, j:] == src[:, :-j]
+        valid &= same
+    rows, ds = np.nonzero(~valid)
+    if len(rows) * 2 > P * D:
+        rep_day = repeat_window_day_hits(children, cfg)   # 대부분 바뀌었으면 정렬 한 번이 더 쌈
+    else:
+        rep_day = prev.rep_day[src_c, dd]
+        rep_day[rows, ds] = _window_hits_at(G, rows, ds, cfg)
+
+    # 등장 횟수: 주 부모 기준으로 바뀐 유전자만 증감
+    counts = prev.counts[pa]
+    base = prev.genes[pa]
+    r, c = np.nonzero(children != base)
+    np.add.at(counts, (r, base[r, c]), -1)
+    np.add.at(counts, (r, children[r, c]), 1)
+    # copy=False: children 버퍼를 그대로 보관(호출자가 다음 세대까지 덮어쓰지 않을 때)
+    return EvalState(children.copy() if copy else children, S, day_score, day_hard, rep_day, counts, day_viol, day_obj)
+
+def state_violations(st: EvalState, catalog: MenuCatalog, cfg: GAConfig) -> np.ndarray:
+    """(P, len(VIOLATIONS)) 개체별 제약 위반 수: 일별 항목은 위반 일수, 예산은 0/1, 반복은 초과/재등장 횟수.
+    is_feasible_chrom과 같은 기준(NULL_SNACK은 반복 제한에서 제외) → 행 합이 0이면 가능해."""
+    P, D = len(st.genes), cfg.days
+    null = catalog.null_snack_idx
+    out = np.empty((P, len(VIOLATIONS)), dtype=np.int64)
+    out[:, :len(DAY_VIOLATIONS)] = st.day_viol.sum(axis=1)
+    out[:, 4] = st.S[..., _F_PRICE].sum(axis=1) > cfg.total_budget
+    over = np.maximum(0, st.counts - cfg.max_repeat_per_month)
+    out[:, 5] = over.sum(axis=1) - over[:, null]
+    # 근접 재등장에서 NULL_SNACK 몫 빼기(간식 슬롯에만 나오므로 그 열만 보면 됨)
+    rep = st.rep_day.sum(axis=1)
+    W = cfg.repeat_window_days
+    if W > 1:
+        is_null = st.genes.reshape(P, D, K_PER_DAY)[:, :, 5] == null
+        prev_null = np.zeros_like(is_null)
+        for j in range(1, min(W, D)):
+            prev_null[:, j:] |= is_null[:, :-j]
+        rep = rep - (is_null & prev_null).sum(axis=1)
+    out[:, 6] = rep
+    return out
 
-    # 월 예산 빠른 하드컷
-    if STRICT_BUDGET:
-        cost_quick = float(prices[chrom].sum())
-        if cost_quick > (BUDGET_PER_PERSON * DAYS_IN_MONTH):
-            return -HARD_FAIL
+def state_feasible(st: EvalState, catalog: MenuCatalog, cfg: GAConfig):
+    """반환: (개체별 가능 여부 bool (P,), 위반 벡터 (P, len(VIOLATIONS)))"""
+    viol = state_violations(st, catalog, cfg)
+    return ~viol.any(axis=1), viol
 
-    score = 0.0
+def state_scores(st: EvalState, catalog: MenuCatalog, cfg: GAConfig) -> np.ndarray:
+    """캐시된 일별/월간 항을 합쳐 개체별 점수로."""
+    P = len(st.genes)
+    days = st.genes.reshape(P, cfg.days, K_PER_DAY)
+    month_cost = st.S[..., _F_PRICE].sum(axis=1)
 
     # 반복 벌점
-    counts = np.bincount(chrom, minlength=len(cand))
-    over_counts = np.maximum(0, counts - MAX_REPEAT_PER_MONTH).sum()
-    score -= P_REPEAT * float(over_counts)
-
-    if REPEAT_WINDOW_DAYS > 1:
-        last = {}
-        rep = 0
-        for d in range(DAYS_IN_MONTH):
-            for idx in days[d].tolist():
-                if idx in last and (d - last[idx]) < REPEAT_WINDOW_DAYS:
-                    rep += 1
-                last[idx] = d
-        score -= P_REPEAT * float(rep)
-
-    month_cost = 0.0
-    snack_pen  = 0.0
-    lo = TARGET_KCAL * (1.0 - KCAL_BAND_FRAC)
-    hi = TARGET_KCAL * (1.0 + KCAL_BAND_FRAC)
-
-    for d in range(DAYS_IN_MONTH):
-        idxs = days[d].tolist()
-        m = day_metrics(idxs, cand)
-        month_cost += float(m.get("cost", 0.0))
-
-        # 하드컷: 단백질 칼로리 비중 < 20%, 칼로리 밴드
-        if float(m.get("prot_pct_cal", 0.0)) >= 0.20: return -HARD_FAIL
-        k = float(m.get("kcal", 0.0))
-        if (k < lo) or (k > hi): return -HARD_FAIL
-
-        # 소프트: 칼로리/매크로 편차, 미크로, 선호/조합
-        score -= P_KCAL * (k - TARGET_KCAL) ** 2
-        score -= P_MACRO * (
-            abs(float(m.get("carb_pct_cal", 0.0)) - MACRO_TARGET_PCT["carbo"]) +
-            abs(float(m.get("prot_pct_cal", 0.0)) - MACRO_TARGET_PCT["protein"]) +
-            abs(float(m.get("fat_pct_cal",  0.0)) - MACRO_TARGET_PCT["fat"])
-        )
-        score += W_MICRO_SUM * float(m.get("micro_norm", 0.0))
-        shortfalls = []
-        for kk in MICRO_COLS:
-            tgt = MICRO_MIN.get(kk)
-            if tgt:
-                val = float(m.get(f"micro_{kk}", 0.0))
-                shortfalls.append(max(0.0, (tgt - val) / tgt))
-        if shortfalls:
-            score -= P_MICRO_SHORTFALL * float(np.mean(shortfalls))
-
-        score += W_COOC * cooc_score(idxs, cooc_pairs)
-        score += W_PREF * float(pref[idxs].sum())
-
-        # 스낵 요일 제약
-        snack_is_real = (days[d, 5] != NULL_SNACK_IDX)
-        snack_pen += 0 if (snack_is_real == is_snack_allowed_day(d)) else 1
+    score = -cfg.p_repeat * np.maximum(0, st.counts - cfg.max_repeat_per_month).sum(axis=1).astype(float)
+    score -= cfg.p_repeat * st.rep_day.sum(axis=1).astype(float)
+    score += st.day_score.sum(axis=1)
 
     # 월간 벌점: 스낵/예산
-    score -= SNACK_LAMBDA * snack_pen
-    total_budget = BUDGET_PER_PERSON * DAYS_IN_MONTH
-    over = max(0.0, month_cost - total_budget)
-    score -= P_BUDGET_TOTAL * (over**2) / (total_budget**2)
+    snack_pen = ((days[:, :, 5] != catalog.null_snack_idx) != cfg.snack_allowed).sum(axis=1)
+    score -= cfg.snack_lambda * snack_pen
+    total_budget = cfg.total_budget
+    over = np.maximum(0.0, month_cost - total_budget)
+    score -= cfg.p_budget_total * (over**2) / (total_budget**2)
+
+    # 하드컷: 월 예산 / 일별(단백질 비중, 칼로리 밴드)
+    hard = st.day_hard.any(axis=1)
+    if cfg.strict_budget:
+        hard |= month_cost > total_budget
+    score[hard] = -HARD_FAIL
+    return score
+
+def fitness_population(pop: np.ndarray, catalog: MenuCatalog, cooc, cfg: GAConfig = DEFAULT_CONFIG) -> np.ndarray:
+    """(POP, DAYS*K) 개체군 전체를 한 번에 평가. 개체별 점수는 fitness()와 동일."""
+    return state_scores(evaluate_full(pop, catalog, cooc, cfg), catalog, cfg)
+
+def fitness(chrom: np.ndarray, catalog: MenuCatalog, cooc, cfg: GAConfig = DEFAULT_CONFIG) -> float:
+    return float(fitness_population(chrom[None, :], catalog, cooc, cfg)[0])
+
+# ---------- 목적 성분 / 전략 가중 점수 ----------
+def objective_weights(nutrition=None, cost=None, preference=None) -> Tuple[float, ...]:
+    """전략 그룹 가중치 → OBJECTIVES 순서의 성분 가중치(그룹 가중치를 그룹 안 성분 수로 나눔)"""
+    w = dict(zip(STRATEGY_GROUPS, (nutrition, cost, preference)))
+    out = {"repeat": REPEAT_WEIGHT}
+    for key, names in STRATEGY_GROUPS.items():
+        for name in names:
+            out[name] = float(w[key] or 0.0) / len(names)
+    return tuple(out[k] for k in OBJECTIVES)
+
+def objective_scales(st: EvalState, catalog: MenuCatalog, cfg: GAConfig) -> np.ndarray:
+    """성분별 정규화 스케일 = 초기 개체군(하드컷 제외)에서의 표준편차. 원래 단위는 칼로리 편차가 다른 성분보다
+    몇 자릿수 커서, 퍼짐을 1로 맞춰야 전략 가중치가 순위를 실제로 바꿈. 실행 중에는 고정(점수 비교가 일관되게).
+    prepare_run은 GAConfig.with_objective_scales로 기준 개체군에서 한 번 계산해 모든 섬이 공유."""
+    obj = state_objectives(st, catalog, cfg)
+    ok = ~state_penalties(st, catalog, cfg)[1]
+    if ok.sum() >= 2:
+        obj = obj[ok]
+    spread = obj.std(axis=0)
+    floor = np.maximum(np.abs(obj).mean(axis=0), 1.0) * 1e-3
+    return np.maximum(spread, floor)
+
+def state_objectives(st: EvalState, catalog: MenuCatalog, cfg: GAConfig) -> np.ndarray:
+    """(P, len(OBJECTIVES)) 개체별 목적 성분(클수록 좋음). 일별 성분은 캐시 합, 월간은 비용/반복만 새로 계산."""
+    P = len(st.genes)
+    out = np.empty((P, len(OBJECTIVES)), dtype=np.float64)
+    day = st.day_obj.sum(axis=1)
+    for j, name in enumerate(DAY_OBJECTIVES):
+        out[:, OBJECTIVES.index(name)] = day[:, j]
+    month_cost = st.S[..., _F_PRICE].sum(axis=1)
+    tb = cfg.total_budget
+    over = np.maximum(0.0, month_cost - tb)
+    out[:, 3] = -month_cost / tb - cfg.p_budget_total * (over**2) / (tb**2)
+    out[:, 6] = -cfg.p_repeat * (np.maximum(0, st.counts - cfg.max_repeat_per_month).sum(axis=1)
+                                 + st.rep_day.sum(axis=1)).astype(float)
+    return out
 
-    return float(score)
+def state_penalties(st: EvalState, catalog: MenuCatalog, cfg: GAConfig):
+    """전략과 무관한 항: (스낵 규칙 벌점 (P,), 하드컷 여부 (P,))"""
+    P = len(st.genes)
+    days = st.genes.reshape(P, cfg.days, K_PER_DAY)
+    snack_pen = cfg.snack_lambda * ((days[:, :, 5] != catalog.null_snack_idx) != cfg.snack_allowed).sum(axis=1)
+    hard = st.day_hard.any(axis=1)
+    if cfg.strict_budget:
+        hard |= st.S[..., _F_PRICE].sum(axis=1) > cfg.total_budget
+    return snack_pen, hard
+
+def strategy_scores(st: EvalState, catalog: MenuCatalog, cfg: GAConfig, weights: np.ndarray,
+                    scales: np.ndarray) -> np.ndarray:
+    """(P, S) 전략별 점수 = 정규화 성분 · 가중치 - 스낵 벌점, 하드컷은 -HARD_FAIL.
+    성분은 개체당 한 번만 계산하고 전략 수만큼 행렬곱만 함."""
+    obj = state_objectives(st, catalog, cfg) / scales
+    snack_pen, hard = state_penalties(st, catalog, cfg)
+    out = obj @ np.atleast_2d(weights).T - snack_pen[:, None]
+    out[hard] = -HARD_FAIL
+    return out
 
 # ================== GA ==================
-def cat_index_lists(cand: pd.DataFrame) -> Dict[str, np.ndarray]:
-    cat = cand["category"].values
-    return {
-        "rice":  np.where(cat == "rice")[0],
-        "soup":  np.where(cat == "soup")[0],
-        "side":  np.where(cat == "side")[0],
-        "snack": np.where(cat == SNACK_CATEGORY)[0],
-    }
+def cat_index_lists(catalog: MenuCatalog) -> Dict[str, np.ndarray]:
+    return {name: np.flatnonzero(catalog.category == code) for name, code in CATEGORY_CODES.items()}
+
+def init_population_from_bank(bank, cfg: GAConfig, rng: np.random.Generator) -> np.ndarray:
+    """하루 조합 뱅크에서 날마다 통째로 뽑아 초기해 구성(하루 비용은 예산 ±20% 구간 우선)"""
+    pop = np.empty((cfg.pop_size, cfg.days*K_PER_DAY), dtype=int)
+    window = (cfg.budget_per_person*0.8, cfg.budget_per_person*1.2)
+    for d in range(cfg.days):
+        ds = bank.for_day(cfg.snack_allowed[d])
+        pop[:, d*K_PER_DAY:(d+1)*K_PER_DAY] = ds.combos[ds.sample_near(rng, cfg.pop_size, cfg.target_kcal, window)]
+    return pop
 
-def init_population(cand: pd.DataFrame, cat_idx: Dict[str, np.ndarray], NULL_SNACK_IDX:int) -> np.ndarray:
-    pop = np.empty((POP_SIZE, DAYS_IN_MONTH*K_PER_DAY), dtype=int)
+def init_population(catalog: MenuCatalog, cat_idx: Dict[str, np.ndarray],
+                    cfg: GAConfig, rng: np.random.Generator, bank=None) -> np.ndarray:
+    if bank is not None and bank.covers(cfg):
+        pop = init_population_from_bank(bank, cfg, rng)
+        return cfg.lock.apply(pop) if cfg.lock is not None else pop
+    pop = np.empty((cfg.pop_size, cfg.days*K_PER_DAY), dtype=int)
+    NULL_SNACK_IDX = catalog.null_snack_idx
 
-    kcal = cand["kcal"].values.astype(float)
-    prot = cand["protein"].values.astype(float)
-    carb = cand["carbo"].values.astype(float)
-    price= cand["price_per_person"].values.astype(float)
+    kcal = catalog.feats[:, _F_KCAL]
+    prot = catalog.feats[:, _F_PROT]
+    carb = catalog.feats[:, _F_CARB]
+    price= catalog.feats[:, _F_PRICE]
 
     # 밀도 지표
     prot_den = (prot*4.0) / np.maximum(kcal, 1e-9)
@@ -456,21 +1002,20 @@ def init_population(cand: pd.DataFrame, cat_idx: Dict[str, np.ndarray], NULL_SNA
     snack_all  = list(cat_idx["snack"])
     snack_real = [i for i in snack_all if i != NULL_SNACK_IDX]
 
-    lo = TARGET_KCAL*(1-KCAL_BAND_FRAC)
-    hi = TARGET_KCAL*(1+KCAL_BAND_FRAC)
-    target_cost = BUDGET_PER_PERSON
+    lo, hi = cfg.kcal_band
+    target_cost = cfg.budget_per_person
     cost_slack  = 0.20
 
     # 최근 사용일 기록 (초기해에서도 반복 간격 벌리기)
     last_day_global: Dict[int,int] = {}
 
     def pick_from(pool, used_today: set, d: int):
-        # 최근 REPEAT_WINDOW_DAYS 내 사용 안 한 후보를 우선
+        # 최근 repeat_window_days 내 사용 안 한 후보를 우선
         choices = [x for x in pool
-                   if x not in used_today and ((x not in last_day_global) or (d - last_day_global[x]) >= REPEAT_WINDOW_DAYS)]
+                   if x not in used_today and ((x not in last_day_global) or (d - last_day_global[x]) >= cfg.repeat_window_days)]
         if not choices:
             choices = [x for x in pool if x not in used_today]  # 백업
-        return int(np.random.choice(choices))
+        return int(rng.choice(choices))
 
     def day_ok(tmp_idx):
         dk = float(kcal[tmp_idx].sum())
@@ -482,9 +1027,9 @@ def init_population(cand: pd.DataFrame, cat_idx: Dict[str, np.ndarray], NULL_SNA
         if abs(day_cost - target_cost) > target_cost*cost_slack: return False
         return True
 
-    for i in range(POP_SIZE):
+    for i in range(cfg.pop_size):
         genes=[]
-        for d in range(DAYS_IN_MONTH):
+        for d in range(cfg.days):
             tries = 0
             while True:
                 tries += 1
@@ -499,7 +1044,7 @@ def init_population(cand: pd.DataFrame, cat_idx: Dict[str, np.ndarray], NULL_SNA
                 for _ in range(3):
                     si = pick_from(side_sorted[:half_side], used_today, d)
                     sides.append(si); used_today.add(si)
-                sn = np.random.choice(snack_real) if (snack_real and is_snack_allowed_day(d)) else NULL_SNACK_IDX
+                sn = rng.choice(snack_real) if (snack_real and cfg.is_snack_allowed_day(d)) else NULL_SNACK_IDX
                 tmp = [r, s, *sides, sn]
 
                 # 빠른 스왑으로 미세조정
@@ -544,122 +1089,358 @@ def init_population(cand: pd.DataFrame, cat_idx: Dict[str, np.ndarray], NULL_SNA
                     break
 
         pop[i] = np.array(genes, dtype=int)
-    return pop
-
-def tournament_select(pop: np.ndarray, fits: np.ndarray, t:int=3) -> np.ndarray:
-    N = len(pop)
-    out = np.empty_like(pop)
-    f = np.array(fits, dtype=float)
-    f[~np.isfinite(f)] = -1e30
-    for i in range(N):
-        cand = np.random.randint(0, N, size=t)
-        best = cand[np.argmax(f[cand])]
-        out[i] = pop[best]
-    return out
+    return cfg.lock.apply(pop) if cfg.lock is not None else pop
+
+def tournament_indices(fits: np.ndarray, rng: np.random.Generator, t:int=3) -> np.ndarray:
+    """개체군 전체 토너먼트를 한 번에: (N, t) 후보 → 적합도 argmax"""
+    N = len(fits)
+    f = np.where(np.isfinite(fits), fits, -1e30)
+    cand = rng.integers(0, N, size=(N, t))
+    return cand[np.arange(N), f[cand].argmax(axis=1)]
+
+def tournament_select(pop: np.ndarray, fits: np.ndarray, rng: np.random.Generator, t:int=3) -> np.ndarray:
+    return pop[tournament_indices(fits, rng, t)]
+
+# ---------- 개체군 단위 연산자 ----------
+def pair_parents(sel: np.ndarray):
+    """선택 순서대로 둘씩 짝 → (주 부모 pa, 교차 상대 pb). 자식 2k는 (a,b), 2k+1은 (b,a)"""
+    N = len(sel)
+    a = sel[0::2]; b = sel[1::2]
+    if len(b) < len(a): b = np.append(b, sel[0])
+    pa = np.empty(N, dtype=int); pb = np.empty(N, dtype=int)
+    pa[0::2], pb[0::2] = a, b
+    pa[1::2], pb[1::2] = b[:N//2], a[:N//2]
+    return pa, pb
+
+def daywise_tail_mask(N: int, D: int, cfg: GAConfig, rng: np.random.Generator) -> np.ndarray:
+    """짝마다 cx_rate 확률로 1점 교차: 자르는 날부터 True인 (N, D) 마스크(짝 자식은 같은 cut)"""
+    if D <= 1: return np.zeros((N, D), dtype=bool)
+    npairs = (N + 1) // 2
+    cut = np.repeat(rng.integers(1, D, npairs), 2)[:N]
+    do = np.repeat(rng.random(npairs) <= cfg.cx_rate, 2)[:N]
+    return do[:, None] & (np.arange(D)[None, :] >= cut[:, None])
+
+@dataclass
+class SlotPools:
+    """유전자 위치별 돌연변이 후보: 카테고리 풀을 이어붙인 flat에서 [start, start+size) 구간"""
+    flat: np.ndarray
+    start: np.ndarray  # (D*K,)
+    size: np.ndarray   # (D*K,)
+
+def slot_pools(catalog: MenuCatalog, cat_idx: Dict[str, np.ndarray], cfg: GAConfig) -> SlotPools:
+    null = catalog.null_snack_idx
+    snack_real = cat_idx["snack"][cat_idx["snack"] != null]
+    named = {k: cat_idx[k] for k in ("rice", "soup", "side")}
+    named["snack"] = snack_real if len(snack_real) else np.array([null])
+    named["null"] = np.array([null])
+    flat, off = [], {}
+    pos = 0
+    for k, v in named.items():
+        off[k] = (pos, len(v)); flat.append(v); pos += len(v)
+    start = np.empty(cfg.days*K_PER_DAY, dtype=np.int64); size = np.empty_like(start)
+    for g in range(cfg.days*K_PER_DAY):
+        slot, day = DAILY_SLOTS[g % K_PER_DAY], g // K_PER_DAY
+        if slot == "snack" and not cfg.snack_allowed[day]: slot = "null"
+        start[g], size[g] = off[slot]
+    if cfg.lock is not None:
+        size[cfg.lock.mask] = 0   # 고정 유전자는 변이 안 함
+    return SlotPools(np.concatenate(flat).astype(int), start, size)
+
+def mutate_population(children: np.ndarray, pools: SlotPools, cfg: GAConfig,
+                      rng: np.random.Generator, bank=None) -> np.ndarray:
+    """제자리 변이: 유전자별 베르누이 마스크 → 위치별 풀에서 균등 추출, (뱅크 있으면) 하루 통째 교체.
+    cfg.lock이 있으면 자유 유전자만 바뀜(통째 고정된 날은 하루 교체도 안 함)"""
+    N = len(children)
+    if bank is not None and cfg.day_mut_rate > 0:
+        days = children.reshape(N, cfg.days, K_PER_DAY)
+        dm = rng.random((N, cfg.days)) < cfg.day_mut_rate
+        if cfg.lock is not None: dm &= ~cfg.lock.day_locked[None, :]
+        for snack_day in (False, True):
+            rows, ds = np.nonzero(dm & (cfg.snack_allowed[None, :] == snack_day))
+            dset = bank.for_day(snack_day)
+            if len(rows) and len(dset):
+                days[rows, ds] = dset.combos[dset.sample_near(rng, len(rows), cfg.target_kcal)]
+    r, c = np.nonzero((rng.random(children.shape) < cfg.mut_rate) & (pools.size > 0)[None, :])
+    if len(r):
+        children[r, c] = pools.flat[pools.start[c] + (rng.random(len(c)) * pools.size[c]).astype(np.int64)]
+    if cfg.lock is not None:
+        cfg.lock.apply(children)   # 일부만 고정된 날의 하루 교체 되돌림
+    return children
+
+# ---------- 실행 제한(마감/취소) ----------
+@dataclass
+class RunLimits:
+    """세대마다 확인하는 실행 제한.
+    deadline: time.time() 기준 절대 시각, cancel/accept: is_set()이 있는 토큰(threading.Event / Manager().Event())
+    accept는 '지금까지의 최선으로 확정'(스트리밍 클라이언트), cancel은 중단 요청"""
+    deadline: Optional[float] = None
+    cancel: Optional[object] = None
+    accept: Optional[object] = None
+
+    def tighten(self, seconds: Optional[float]) -> "RunLimits":
+        """지금부터 seconds 안으로 마감을 당김(더 이른 쪽 유지)"""
+        if not seconds: return self
+        d = time.time() + float(seconds)
+        return replace(self, deadline=d if self.deadline is None else min(self.deadline, d))
+
+    def remaining(self) -> Optional[float]:
+        return None if self.deadline is None else max(0.0, self.deadline - time.time())
+
+    def check(self) -> Optional[str]:
+        """멈춰야 하면 사유("cancelled"/"accepted"/"deadline"), 아니면 None"""
+        if self.cancel is not None and self.cancel.is_set(): return "cancelled"
+        if self.accept is not None and self.accept.is_set(): return "accepted"
+        if self.deadline is not None and time.time() >= self.deadline: return "deadline"
+        return None
 
-def crossover_daywise(p1: np.ndarray, p2: np.ndarray):
-    if np.random.rand() > CX_RATE: return p1.copy(), p2.copy()
-    days_len = p1.size // K_PER_DAY
-    if days_len <= 1: return p1.copy(), p2.copy()
-    cut_day = np.random.randint(1, days_len)
-    cut = cut_day * K_PER_DAY
-    return np.concatenate([p1[:cut], p2[cut:]]), np.concatenate([p2[:cut], p1[cut:]])
+class GAPopulation:
+    """개체군 1개(단일 GA 또는 섬 모델의 섬 하나)의 진화 상태. step() 한 번 = 한 세대."""
+
+    def __init__(self, catalog: MenuCatalog, cooc, cfg: GAConfig, rng: np.random.Generator,
+                 pop: Optional[np.ndarray] = None, bank=None):
+        self.catalog, self.cooc, self.cfg, self.rng = catalog, cooc, cfg, rng
+        self.cat_idx = cat_index_lists(catalog)
+        if bank is None and cfg.use_day_bank:
+            from app.services.day_bank import get_day_bank
+            bank = get_day_bank(catalog, cfg)
+        self.bank = bank
+        self.pools = slot_pools(catalog, self.cat_idx, cfg)
+        self.pop = init_population(catalog, self.cat_idx, cfg, rng, bank) if pop is None else np.array(pop, dtype=int)
+        if cfg.lock is not None: cfg.lock.apply(self.pop)   # 넘겨받은 개체군(웜 스타트/이주)도 고정값으로
+        self._spare = np.empty_like(self.pop)   # 이중 버퍼: 자식은 여기에 쓰고 세대마다 맞바꿈
+        self.state = evaluate_full(self.pop, catalog, cooc, cfg)
+        self.scales = (np.asarray(cfg.objective_scales) if cfg.objective_scales is not None
+                       else objective_scales(self.state, catalog, cfg))
+        self.fits = self._score(self.state)
+        self.generation = 0
+        self.trace: List[dict] = []   # 세대별 진단(최고 점수, 가능해 수, 제약별 위반 개체 수, 다양성)
+        self.stall = 0                # 최고 점수가 안 오른 연속 세대 수
+        self.restarts = 0
+        self.stopped_reason: Optional[str] = None
+        self.elapsed = 0.0            # run()에 쓴 시간(초)
+        self._planned = self._ran = 0 # run()에 요청된/실제 돈 세대 수
+        self._progress = None
+
+        best_i = int(self.fits.argmax())
+        self.best_any = self.pop[best_i].copy()
+        self.best_any_fit = float(self.fits[best_i])
+        self.best_feas, self.best_feas_fit = None, -np.inf
+        self._track_feasible(*state_feasible(self.state, catalog, cfg))
+
+    def _score(self, st: EvalState) -> np.ndarray:
+        """개체별 적합도. cfg.objective_weights가 있으면 정규화한 목적 성분의 가중합(strategy_scores)"""
+        if self.cfg.objective_weights is None:
+            return state_scores(st, self.catalog, self.cfg)
+        return strategy_scores(st, self.catalog, self.cfg, np.asarray(self.cfg.objective_weights), self.scales)[:, 0]
+
+    def _select(self) -> np.ndarray:
+        return tournament_indices(self.fits, self.rng)
+
+    def _breed(self, sel: np.ndarray):
+        """선택된 부모 인덱스 → (자식 개체군, 부모A, 부모B). 자식은 예비 버퍼에 씀."""
+        cfg, rng, pop = self.cfg, self.rng, self.pop
+        N = len(pop)
+        pa, pb = pair_parents(sel)
+        out = self._spare
+        np.take(pop, pa, axis=0, out=out)
+        tail = np.repeat(daywise_tail_mask(N, cfg.days, cfg, rng), K_PER_DAY, axis=1)
+        np.copyto(out, pop[pb], where=tail)
+        mutate_population(out, self.pools, cfg, rng, self.bank)
+        self._spare = pop   # 이번 부모 버퍼는 다음 세대 자식용
+        return out, pa, pb
+
+    def _track_feasible(self, feas: np.ndarray, viol: np.ndarray):
+        """가능해 중 최고(마스크 argmax)로 feasible-best 갱신, 정체/다양성 갱신 + trace 기록"""
+        masked = np.where(feas, self.fits, -np.inf)
+        i = int(masked.argmax())
+        if masked[i] > self.best_feas_fit:
+            self.best_feas = self.pop[i].copy(); self.best_feas_fit = float(masked[i])
+
+        # 정체: (가능해 여부, 점수) 사전순으로 MIN_REL_IMPROVE 넘게 오른 기준점이 하나라도 있을 때만 개선
+        prog = self._progress_points()
+        ref = self._progress
+        tol = self.cfg.min_rel_improve
+        if ref is None or any(p[0] > r[0] or p[1] > r[1] + tol * max(abs(r[1]), 1.0) for p, r in zip(prog, ref)):
+            self._progress, self.stall = prog, 0
+        else:
+            self.stall += 1
+
+        # 다양성: 최고 개체와 다른 유전자 비율의 개체군 평균(고정 슬롯이 있으면 자유 유전자만)
+        diff = self.pop != self.pop[int(self.fits.argmax())]
+        if self.cfg.lock is not None:
+            diff = diff[:, ~self.cfg.lock.mask]
+        self.diversity = float(diff.mean()) if diff.size else 1.0
+        self.trace.append({
+            "generation": self.generation,
+            "best_fitness": self.best_any_fit,
+            "feasible": int(feas.sum()),
+            "violations": dict(zip(VIOLATIONS, np.count_nonzero(viol, axis=0).tolist())),
+            "diversity": round(self.diversity, 4),
+        })
 
-def mutate_category(ch: np.ndarray, cat_idx: Dict[str, np.ndarray], NULL_SNACK_IDX:int) -> np.ndarray:
-    ch = ch.copy()
-    snack_all  = list(cat_idx["snack"])
-    snack_real = [i for i in snack_all if i != NULL_SNACK_IDX]
-    for pos in range(ch.size):
-        if np.random.rand() < MUT_RATE:
-            slot = DAILY_SLOTS[pos % K_PER_DAY]
-            day  = pos // K_PER_DAY
-            if slot == "snack":
-                ch[pos] = np.random.choice(snack_real) if (snack_real and is_snack_allowed_day(day)) else NULL_SNACK_IDX
-            else:
-                ch[pos] = np.random.choice(cat_idx[slot])
-    return ch
-
-def run_ga(cand, cooc_pairs, NULL_SNACK_IDX):
-    cat_idx = cat_index_lists(cand)
-    pop = init_population(cand, cat_idx, NULL_SNACK_IDX)
-    fits = np.array([fitness(ind, cand, cooc_pairs, NULL_SNACK_IDX) for ind in pop], dtype=float)
-
-    best_i = int(fits.argmax())
-    best_any = pop[best_i].copy()
-    best_any_fit = float(fits[best_i])
-
-    best_feas, best_feas_fit = (best_any.copy(), best_any_fit) if is_feasible_chrom(best_any, cand) else (None, -np.inf)
-
-    for gen in range(GENERATIONS):
-        sel = tournament_select(pop, fits)
-        nxt=[]
-        for i in range(0, POP_SIZE, 2):
-            p1 = sel[i]; p2 = sel[i+1 if i+1<POP_SIZE else 0]
-            c1,c2 = crossover_daywise(p1,p2)
-            c1 = mutate_category(c1, cat_idx, NULL_SNACK_IDX)
-            c2 = mutate_category(c2, cat_idx, NULL_SNACK_IDX)
-            nxt.extend([c1,c2])
-        pop = np.array(nxt[:POP_SIZE], dtype=int)
-
-        fits = np.array([fitness(ind, cand, cooc_pairs, NULL_SNACK_IDX) for ind in pop], dtype=float)
+    def _progress_points(self) -> List[tuple]:
+        """정체 판정 기준점 [(가능해 여부, 점수)]"""
+        return [(self.best_feas is not None, self.best()[1])]
+
+    def restart(self, frac: float):
+        """하위 frac 비율을 새 초기 개체로 교체(다양성 붕괴 시)"""
+        m = int(len(self.pop) * frac)
+        if m <= 0: return
+        fresh = init_population(self.catalog, self.cat_idx, replace(self.cfg, pop_size=m), self.rng, self.bank)
+        self.immigrate(fresh)
+        self.restarts += 1
+
+    def _place(self, i: int, genes: np.ndarray, st: Optional[EvalState] = None, j: int = 0):
+        """i번 개체를 genes로 교체하고 평가 캐시 행을 갱신. st(이미 평가한 묶음)가 있으면 그 j행을 쓰고,
+        없으면 그 행만 평가(평가 결과 반환)"""
+        self.pop[i] = genes
+        if st is None:
+            st, j = evaluate_full(self.pop[i], self.catalog, self.cooc, self.cfg), 0
+        self.state.set_row(i, st, j)
+        return st
+
+    def _rescore(self, idx: np.ndarray, st: EvalState):
+        """idx 행들의 적합도를 st(같은 순서로 평가한 묶음)로 갱신"""
+        self.fits[idx] = self._score(st)
+
+    def step(self):
+        catalog, cooc, cfg = self.catalog, self.cooc, self.cfg
+        pop, pa, pb = self._breed(self._select())
+
+        # 부모 캐시 기준 증분 평가(바뀐 날만 재계산)
+        self.state = evaluate_children(self.state, pop, pa, pb, catalog, cooc, cfg, copy=False)
+        fits = self._score(self.state)
+        self.pop, self.fits = pop, fits
 
         # any-best
         cur_best_i = int(fits.argmax())
-        if fits[cur_best_i] > best_any_fit:
-            best_any_fit = float(fits[cur_best_i]); best_any = pop[cur_best_i].copy()
+        if fits[cur_best_i] > self.best_any_fit:
+            self.best_any_fit = float(fits[cur_best_i]); self.best_any = pop[cur_best_i].copy()
 
-        # feasible-best
-        for i in range(POP_SIZE):
-            if fits[i] > best_feas_fit and is_feasible_chrom(pop[i], cand):
-                best_feas = pop[i].copy(); best_feas_fit = float(fits[i])
+        # feasible-best: 같은 평가에서 나온 위반 벡터로
+        self.generation += 1
+        self._track_feasible(*state_feasible(self.state, catalog, cfg))
 
         # 엘리트 보존
-        pop[int(fits.argmin())] = (best_feas if best_feas is not None else best_any).copy()
-
-    final = best_feas if best_feas is not None else best_any
-    final_fit = best_feas_fit if best_feas is not None else best_any_fit
-    return final, final_fit
+        worst = int(fits.argmin())
+        self._place(worst, (self.best_feas if self.best_feas is not None else self.best_any).copy())
+
+        # 다양성 붕괴 → 부분 재시작
+        if cfg.restart_frac > 0 and self.diversity < cfg.diversity_min:
+            self.restart(cfg.restart_frac)
+
+    def evolve(self, generations: int, limits: Optional[RunLimits] = None) -> Iterator[dict]:
+        """generations세대 진화 제너레이터: 세대마다 snapshot()을 내보냄.
+        세대마다 제한/정체를 확인해 걸리면 그 자리에서 멈추고 stopped_reason을 남김
+        (completed / deadline / cancelled / accepted / converged)"""
+        t0 = time.perf_counter()
+        start = self.generation
+        self._planned = generations
+        reason = "completed"
+        try:
+            for _ in range(generations):
+                r = limits.check() if limits is not None else None
+                if r is None and self.cfg.stall_generations and self.stall >= self.cfg.stall_generations:
+                    r = "converged"
+                if r:
+                    reason = r; break
+                self.step()
+                self._ran = self.generation - start
+                self.elapsed = time.perf_counter() - t0
+                yield self.snapshot()
+        finally:
+            self.elapsed = time.perf_counter() - t0
+            self.stopped_reason = reason
+
+    def run(self, generations: int, limits: Optional[RunLimits] = None) -> str:
+        """evolve()를 끝까지 돌림 → 멈춘 사유"""
+        for _ in self.evolve(generations, limits): pass
+        return self.stopped_reason
+
+    def snapshot(self) -> dict:
+        """진행 상황 요약(스트리밍용, JSON 직렬화 가능): 세대, 최고/평균 점수, 가능해 수, 현재 최선 식단 요약"""
+        ch, fit = self.best()
+        S = self.catalog.feats[ch].reshape(self.cfg.days, K_PER_DAY, -1).sum(axis=1)
+        ok = self.fits > -HARD_FAIL
+        last = self.trace[-1] if self.trace else {}
+        return {
+            "generation": self.generation,
+            "best_fitness": float(fit),
+            "mean_fitness": float(self.fits[ok].mean()) if ok.any() else None,
+            "feasible": last.get("feasible", 0),
+            "diversity": last.get("diversity"),
+            "stall": self.stall,
+            "elapsed_s": round(self.elapsed, 3),
+            "best_plan": {
+                "feasible": self.best_feas is not None,
+                "total_cost": float(S[:, _F_PRICE].sum()),
+                "avg_kcal": round(float(S[:, _F_KCAL].mean()), 2),
+                "kcal_range": [round(float(S[:, _F_KCAL].min()), 2), round(float(S[:, _F_KCAL].max()), 2)],
+                "pref_sum": round(float(S[:, _F_PREF].sum()), 4),
+            },
+        }
+
+    def report(self) -> dict:
+        """run() 결과 요약: trace/stopped_reason/generations_used/restarts/time_saved_s(남은 세대 × 세대당 평균 시간 추정)"""
+        skipped = max(0, self._planned - self._ran)
+        per_gen = self.elapsed / self._ran if self._ran else 0.0
+        return {
+            "trace": self.trace,
+            "stopped_reason": self.stopped_reason or "completed",
+            "generations_used": self.generation,
+            "restarts": self.restarts,
+            "time_saved_s": round(skipped * per_gen, 3),
+        }
+
+    def top(self, k: int) -> np.ndarray:
+        """적합도 상위 k개 개체(이주용 사본)."""
+        order = np.argsort(-self.fits, kind="stable")[:k]
+        return self.pop[order].copy()
+
+    def immigrate(self, genes: np.ndarray):
+        """이주 개체로 하위 개체를 교체하고 그 행만 다시 평가."""
+        genes = np.asarray(genes, dtype=int)
+        if len(genes) == 0: return
+        worst = np.argsort(self.fits, kind="stable")[:len(genes)]
+        batch = evaluate_full(genes, self.catalog, self.cooc, self.cfg)   # 이주 개체는 묶음으로 한 번만 평가
+        for j, i in enumerate(worst):
+            self._place(int(i), genes[j], batch, j)
+        self._rescore(worst, batch)
+
+    def best(self):
+        if self.best_feas is not None:
+            return self.best_feas, self.best_feas_fit
+        return self.best_any, self.best_any_fit
+
+def iter_population(ga: GAPopulation, generations: int, limits: Optional[RunLimits] = None,
+                    info: Optional[dict] = None) -> Iterator[dict]:
+    """초기 개체군 + 세대별 스냅샷을 내보내고, 끝나면 info에 report(), best=(염색체, 점수), elites(상위 개체)를 채움"""
+    yield ga.snapshot()
+    yield from ga.evolve(generations, limits)
+    if info is not None:
+        info.update(ga.report(), best=ga.best(), elites=ga.top(ELITE_KEEP))
+
+def iter_ga(catalog: MenuCatalog, cooc, cfg: GAConfig, rng: Optional[np.random.Generator] = None,
+            limits: Optional[RunLimits] = None, info: Optional[dict] = None,
+            pop: Optional[np.ndarray] = None) -> Iterator[dict]:
+    """GA를 세대별 스냅샷 제너레이터로. 다 돌면(또는 마감/취소/확정/정체로 멈추면) info['best']가 결과.
+    pop을 넘기면 그것을 초기 개체군으로(웜 스타트)"""
+    if rng is None: rng = np.random.default_rng(cfg.seed)
+    yield from iter_population(GAPopulation(catalog, cooc, cfg, rng, pop=pop), cfg.generations, limits, info)
+
+def run_ga(catalog: MenuCatalog, cooc, cfg: GAConfig, rng: Optional[np.random.Generator] = None,
+           limits: Optional[RunLimits] = None, info: Optional[dict] = None, on_progress=None,
+           pop: Optional[np.ndarray] = None):
+    """iter_ga를 끝까지 돌려 최고(가능해 우선)를 반환. 마감/취소/정체에 걸리면 그때까지의 최고.
+    info에 dict를 넘기면 GAPopulation.report()를 채워 주고, on_progress(snapshot)는 세대마다 호출"""
+    info = {} if info is None else info
+    for snap in iter_ga(catalog, cooc, cfg, rng, limits, info, pop):
+        if on_progress is not None: on_progress(snap)
+    return info["best"]
 
 # ================== Django에서 쓰는 래퍼 ==================
-def optimize_menu(paths: dict, params: dict):
-    import os
-    import numpy as np
-    import pandas as pd
-
-    # ✅ global 구문을 괄호 없이 한 줄로
-    global DAYS_IN_MONTH, BUDGET_PER_PERSON, TARGET_KCAL
-    global MACRO_BOUNDS, MACRO_TARGET_PCT, STRICT_BUDGET
-    global W_PREF, P_REPEAT, P_BUDGET_TOTAL, P_MACRO, P_KCAL
-    global P_MICRO_SHORTFALL, W_MICRO_SUM, W_COOC, MICRO_SCALE
-
-    # 일수/예산/칼로리
-    if "days" in params:         DAYS_IN_MONTH     = int(params["days"])
-    if "budget_won" in params:   BUDGET_PER_PERSON = float(params["budget_won"])
-    if "target_kcal" in params:  TARGET_KCAL       = float(params["target_kcal"])
-    if "STRICT_BUDGET" in params: STRICT_BUDGET    = bool(params["STRICT_BUDGET"])
-
-    # 매크로 범위·목표 (% 입력을 0~1로 변환)
-    def _pair(p): return (float(p[0])/100.0, float(p[1])/100.0)
-    def _mid(p):  return (float(p[0]) + float(p[1]))/200.0
-    _b = dict(MACRO_BOUNDS); _t = dict(MACRO_TARGET_PCT)
-    if "carb_range" in params:
-        _b["carbo"] = _pair(params["carb_range"]); _t["carbo"] = _mid(params["carb_range"])
-    if "prot_range" in params:
-        _b["protein"] = _pair(params["prot_range"]); _t["protein"] = _mid(params["prot_range"])
-    if "fat_range"  in params:
-        _b["fat"]    = _pair(params["fat_range"]);  _t["fat"]    = _mid(params["fat_range"])
-    MACRO_BOUNDS, MACRO_TARGET_PCT = _b, _t
-
-    # (선택) 가중치/패널티 튜닝
-    W_PREF            = float(params.get("W_PREF",            W_PREF))
-    P_REPEAT          = float(params.get("P_REPEAT",          P_REPEAT))
-    P_BUDGET_TOTAL    = float(params.get("P_BUDGET_TOTAL",    P_BUDGET_TOTAL))
-    P_MACRO           = float(params.get("P_MACRO",           P_MACRO))
-    P_KCAL            = float(params.get("P_KCAL",            P_KCAL))
-    P_MICRO_SHORTFALL = float(params.get("P_MICRO_SHORTFALL", P_MICRO_SHORTFALL))
-    W_MICRO_SUM       = float(params.get("W_MICRO_SUM",       W_MICRO_SUM))
-    W_COOC            = float(params.get("W_COOC",            W_COOC))
-
+def load_catalog(paths: dict):
+    """CSV 경로들 → (MenuCatalog, 메뉴쌍 선호 행렬 또는 None). 요청 파라미터와 무관해 미리 만들어 둘 수 있음."""
     # ====== 데이터 로드 ======
     cost = load_cost(paths["price"])
     nutr = load_nutr(paths["nutr"])
@@ -679,35 +1460,224 @@ def optimize_menu(paths: dict, params: dict):
     else:
         cand["pref_w"] = 0.0
 
-    # 미크로 스케일(정규화용) 업데이트
-    for k in MICRO_COLS:
-        if k in cand.columns:
-            MICRO_SCALE[k] = max(1e-9, float(cand[k].max()) * K_PER_DAY)
+    # GA 핫루프는 DataFrame 대신 배열 카탈로그만 사용
+    catalog = MenuCatalog.from_frame(cand, NULL_SNACK_IDX)
 
-    # 메뉴쌍 선호(없으면 빈 딕셔너리)
-    cooc_pairs = {}
+    # 메뉴쌍 선호 행렬(없으면 None)
+    cooc = None
     cooc_path = paths.get("cooc")
     if cooc_path and os.path.exists(cooc_path):
         try:
             cooc_df = load_cooc_df(cooc_path)
-            cooc_pairs = build_cooc_index(cand, cooc_df)
+            cooc = build_cooc_matrix(catalog, cooc_df)
         except Exception:
-            cooc_pairs = {}
+            cooc = None
+    return catalog, cooc
+
+# ================== 카탈로그 캐시 ==================
+CATALOG_PATH_KEYS = ("price", "nutr", "cat", "pref", "cooc")
+CATALOG_CACHE_MAX = 4
+
+_digests: Dict[str, Tuple[int, int, str]] = {}   # 경로 → (mtime_ns, size, sha256)
+_catalog_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_catalog_lock = threading.Lock()
+
+def file_digest(path: Optional[str]) -> str:
+    """파일 내용 sha256. (mtime, 크기)가 그대로면 다시 읽지 않음."""
+    if not path:
+        return ""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "missing"
+    with _catalog_lock:
+        hit = _digests.get(path)
+    if hit is not None and hit[:2] == (st.st_mtime_ns, st.st_size):
+        return hit[2]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    with _catalog_lock:
+        _digests[path] = (st.st_mtime_ns, st.st_size, h.hexdigest())
+    return h.hexdigest()
+
+def catalog_key(paths: dict) -> tuple:
+    """(경로, 내용 해시) 5종. 해시는 mtime/크기가 바뀐 파일만 다시 계산."""
+    return tuple((k, paths.get(k) or "", file_digest(paths.get(k))) for k in CATALOG_PATH_KEYS)
+
+def get_catalog(paths: dict):
+    """load_catalog의 프로세스 전역 캐시판. CSV가 바뀌었을 때만 다시 파싱.
+    같은 내용으로 컴파일된 스냅샷(catalog_snapshot)이 있으면 파싱 대신 mmap으로 연다.
+    반환 카탈로그/행렬은 요청끼리 공유하므로 읽기 전용으로 다룰 것."""
+    key = catalog_key(paths)
+    with _catalog_lock:
+        hit = _catalog_cache.get(key)
+        if hit is not None:
+            _catalog_cache.move_to_end(key)
+            return hit
+    from app.services.catalog_snapshot import find_snapshot
+    hit = find_snapshot(key) or load_catalog(paths)
+    with _catalog_lock:
+        _catalog_cache[key] = hit
+        while len(_catalog_cache) > CATALOG_CACHE_MAX:
+            _catalog_cache.popitem(last=False)
+    return hit
+
+ENGINES = ("slots", "day_templates", "milp", "pareto")
+LOCK_ENGINES = ("slots", "pareto")   # 고정 슬롯(locked/free_days)을 지원하는 엔진(섬 모델 포함)
+
+def prepare_run(paths: dict, params: dict, catalog: Optional[MenuCatalog] = None, cooc=None, engine: str = "slots"):
+    """optimize_menu/optimize_strategies 공통 준비: 설정 + 카탈로그 + 사전 점검 + 후보 가지치기.
+    반환: (cfg, catalog, cooc, extras) — extras는 summary에 그대로 붙일 precheck/pruning"""
+    # 실행별 불변 설정 + 전용 난수 생성기 (모듈 전역은 건드리지 않음 → 동시 실행 안전)
+    cfg = GAConfig.from_params(params)
+    if catalog is None:
+        catalog, cooc = get_catalog(paths)
+
+    # 미크로 스케일(정규화용)
+    cfg = cfg.with_micro_scale(catalog)
+    extras = {}
+
+    # ====== 고정 슬롯: (일, 슬롯) → 메뉴. 고정 메뉴는 가지치기에서 남기고 cfg.lock으로 GA에 넘김 ======
+    lock_menus = keep = None
+    if params.get("locked") or params.get("free_days") is not None:
+        if engine not in LOCK_ENGINES:
+            raise ValueError(f"locked/free_days는 {', '.join(LOCK_ENGINES)} 엔진에서만 쓸 수 있습니다(engine={engine})")
+        from app.services.locked_slots import locked_menus, resolve_lock
+        lock_menus = locked_menus(params, cfg)
+        keep = resolve_lock(lock_menus, catalog, cfg).items()
+
+    # ====== 사전 점검: 불가능한 요청은 GA 전에 InfeasibleParamsError ======
+    if params.get("precheck", True):
+        from app.services.presolve import ensure_feasible
+        precheck = ensure_feasible(catalog, cfg, engine)
+        extras["precheck"] = {"elapsed_ms": precheck["elapsed_ms"], "warnings": precheck["warnings"]}
+
+    # ====== 후보 가지치기: 어떤 가능한 하루에도 못 들어가는 메뉴/근사 중복 제거 ======
+    if params.get("prune", True):
+        from app.services.pruning import get_pruned
+        catalog, cooc, extras["pruning"] = get_pruned(catalog, cooc, cfg, hard_micro=(engine == "milp"),
+                                                      dedupe=bool(params.get("dedupe", True)), keep=keep)
+    if lock_menus is not None:
+        cfg = replace(cfg, lock=resolve_lock(lock_menus, catalog, cfg))
+    if cfg.objective_weights is not None:   # 가중합 적합도: 섬/실행 사이에 같은 스케일
+        cfg = cfg.with_objective_scales(catalog, cooc)
+    return cfg, catalog, cooc, extras
+
+def add_run_info(summary: dict, run_info: dict, params: dict):
+    """GA 실행 정보(중단 사유/세대 수/재시작/절약 시간, 위반 요약, trace=True면 세대별 기록)를 summary에"""
+    for k in ("stopped_reason", "generations_used", "restarts", "time_saved_s"):
+        if k in run_info: summary[k] = run_info[k]
+    trace = run_info.get("trace")
+    if trace:
+        # 마지막 세대 제약별 위반 개체 수는 항상, 세대별 전체 기록은 trace=True일 때만
+        summary["violations"] = trace[-1]["violations"]
+        if params.get("trace"):
+            summary["trace"] = trace
+    return summary
+
+def optimize_menu(paths: dict, params: dict, catalog: Optional[MenuCatalog] = None, cooc=None,
+                  limits: Optional[RunLimits] = None, on_progress=None):
+    """catalog를 넘기면(워커에 미리 올려둔 경우) CSV를 다시 읽지 않는다.
+    limits(마감/취소/확정) 또는 params.time_budget(초)에 걸리면 그때까지의 최고 해로 결과를 만든다.
+    on_progress(snapshot)는 GA 엔진(slots/day_templates/pareto)에서 세대마다 호출(스트리밍용).
+    engine="pareto"면 summary.pareto에 파레토 앞 전체가 붙고 식단은 그중 기본 선택점."""
+    engine = str(params.get("engine") or "slots")
+    if engine not in ENGINES:
+        raise ValueError(f"알 수 없는 engine: {engine} (가능: {', '.join(ENGINES)})")
+
+    # ====== 결과 캐시: 같은 CSV 내용 + params + 시드면 GA 없이 바로 반환 ======
+    cache = cache_key = None
+    warm = params.get("warm_start")
+    if params.get("cache") is not False and not warm:   # None(API 기본값)도 사용. 웜 스타트는 엘리트 보관 상태에 따라 달라 제외
+        from app.services.result_cache import get_result_cache, result_key
+        cache = get_result_cache()
+        cache_key = result_key(paths, params) if cache.enabled else None
+        hit = cache.get(cache_key) if cache_key else None
+        if hit is not None:
+            hit[1]["cache_hit"] = True
+            return hit
+
+    limits = (limits or RunLimits()).tighten(params.get("time_budget"))
+    cfg, catalog, cooc, extras = prepare_run(paths, params, catalog, cooc, engine)
+
+    # ====== 웜 스타트: 이전 식단/가까운 파라미터의 엘리트로 초기 개체군 일부 ======
+    warm_pop = warm_info = None
+    rng = np.random.default_rng(cfg.seed)
+    if warm and engine in ("slots", "pareto") and cfg.islands <= 1:
+        from app.services.warm_start import warm_population
+        warm_pop, warm_info = warm_population(paths, params, catalog, cfg, rng)
 
     # ====== GA 실행 ======
-    best_ch, best_fit = run_ga(cand, cooc_pairs, NULL_SNACK_IDX)
+    island_best = milp_info = pareto = None
+    run_info: dict = {}
+    if engine == "milp":
+        from app.services.milp_engine import solve_milp, MILP_TIME_LIMIT
+        time_limit = params.get("time_limit")
+        if limits.deadline is not None:   # 남은 시간 안으로 HiGHS 제한 시간을 줄임(시간 초과 시 incumbent 반환)
+            time_limit = min(float(time_limit or MILP_TIME_LIMIT), max(limits.remaining(), 0.1))
+        best_ch, milp_info = solve_milp(catalog, cfg, time_limit, params.get("mip_gap"))
+        if best_ch is None:   # 시간 안에 incumbent 없음 → 같은 카탈로그로 slots GA
+            milp_info["fallback"] = "slots"
+            best_ch, best_fit = run_ga(catalog, cooc, cfg, rng, limits, run_info, on_progress)
+    elif engine == "day_templates":
+        from app.services.ga_day_templates import run_day_template_ga
+        best_ch, best_fit = run_day_template_ga(catalog, cooc, cfg, np.random.default_rng(cfg.seed), limits, run_info,
+                                             on_progress)
+    elif engine == "pareto":
+        from app.services.ga_pareto import run_pareto, pareto_summary
+        front = run_pareto(catalog, cooc, cfg, rng, limits, run_info, on_progress, warm_pop)
+        pareto = pareto_summary(front, params, catalog)
+        best_ch = front[0][pareto["selected"]]
+    elif cfg.islands > 1:
+        from app.services.ga_islands import run_islands
+        best_ch, best_fit, island_best = run_islands(catalog, cooc, cfg, limits, run_info)
+    else:
+        best_ch, best_fit = run_ga(catalog, cooc, cfg, rng, limits, run_info, on_progress, warm_pop)
     if best_ch is None:
         raise RuntimeError("해를 찾지 못함")
+    if run_info.get("elites") is not None:
+        from app.services.warm_start import remember_elites
+        remember_elites(paths, cfg, catalog, run_info["elites"])
+
+    plan_df, summary = build_result(best_ch, catalog, cfg)
+    summary["engine"] = engine
+    summary.update(extras)
+    if milp_info is not None:
+        summary["solver"] = milp_info
+        summary["mip_gap"] = milp_info["mip_gap"]
+    if pareto is not None:
+        summary["pareto"] = pareto
+    if cfg.lock is not None:
+        summary["locked"] = cfg.lock.summary()
+    if warm:
+        summary["warm_start"] = warm_info or {"seeded": 0, "skipped": f"engine={engine}, islands={cfg.islands}"}
+    if island_best is not None:
+        summary["islands"] = int(cfg.islands)
+        summary["island_pop_size"] = run_info["island_pop_size"]
+        summary["pop_size_total"] = run_info["island_pop_size"] * int(cfg.islands)
+        summary["island_best"] = island_best
+    add_run_info(summary, run_info, params)
+    summary["cache_hit"] = False
+    if cache_key:
+        summary["cache_key"] = cache_key
+        from app.services.result_cache import cacheable
+        if cacheable(summary):
+            cache.put(cache_key, plan_df, summary)
+    return plan_df, summary
 
+def build_result(best_ch: np.ndarray, catalog: MenuCatalog, cfg: GAConfig):
+    """최종 염색체 → (plan_df, summary). 엔진과 무관하게 같은 모양."""
     # ====== 결과 표 생성 ======
-    days = best_ch.reshape(DAYS_IN_MONTH, len(DAILY_SLOTS))
-    pref_vec = cand["pref_w"].values if "pref_w" in cand.columns else np.zeros(len(cand))
+    days = best_ch.reshape(cfg.days, len(DAILY_SLOTS))
+    pref_vec = catalog.feats[:, _F_PREF]
 
     rows = []
-    for d in range(DAYS_IN_MONTH):
+    for d in range(cfg.days):
         idxs  = days[d].tolist()
-        names = [cand.iloc[i]["menu"] for i in idxs]
-        m     = day_metrics(idxs, cand)
+        names = catalog.names[idxs].tolist()
+        m     = day_metrics(idxs, catalog, cfg)
 
         rows.append({
             "day": d+1,
@@ -749,16 +1719,16 @@ def optimize_menu(paths: dict, params: dict):
     plan_df = pd.concat([plan_df, pd.DataFrame([sum_row])], ignore_index=True)
 
     # 가능해(하드 제약 충족) 여부
-    feasible = bool(is_feasible_chrom(best_ch, cand))
+    feasible = bool(is_feasible_chrom(best_ch, catalog, cfg))
 
     summary = {
-        "days": int(DAYS_IN_MONTH),
-        "budget_won": float(BUDGET_PER_PERSON),
-        "target_kcal": float(TARGET_KCAL),
+        "days": int(cfg.days),
+        "budget_won": float(cfg.budget_per_person),
+        "target_kcal": float(cfg.target_kcal),
         "macro_bounds": {
-            "carbo": tuple(MACRO_BOUNDS["carbo"]),
-            "protein": tuple(MACRO_BOUNDS["protein"]),
-            "fat": tuple(MACRO_BOUNDS["fat"]),
+            "carbo": tuple(cfg.macro_bounds["carbo"]),
+            "protein": tuple(cfg.macro_bounds["protein"]),
+            "fat": tuple(cfg.macro_bounds["fat"]),
         },
         "total_cost": total_cost,   # 합계행 포함 금지
         "avg_kcal":   avg_kcal,
@@ -0,0 +1,159 @@
+# backend/app/services/ga_islands.py
+"""
+섬 모델(island model) 병렬 GA
+- 섬(하위 개체군)마다 별도 프로세스에서 GAPopulation을 진화. pop_size는 섬끼리 나눔(섬마다 pop_size // islands,
+  ISLAND_MIN_POP 이상) → 섬 수를 늘려도 세대당 전체 평가량은 그대로
+- migrate_every 세대마다 각 섬의 상위 migrants개를 공유 메모리에 쓰고 Barrier로 맞춘 뒤,
+  링 토폴로지(i-1 → i)로 이웃 섬의 개체를 받아 하위 개체를 교체
+- 데몬 프로세스(프로세스 풀 워커 등) 안에서는 자식 프로세스를 만들 수 없으므로 같은 절차를 인프로세스로 수행
+- 마감/취소(RunLimits)는 조율 프로세스가 확인해 공유 정지 플래그를 세움. 섬은 플래그를 보면 진화를 멈추고,
+  남은 이주 지점에서는 정지 투표를 Barrier로 맞춰 모두 같은 지점에서 빠져나옴(한 섬만 Barrier에 남지 않게)
+"""
+import logging
+import multiprocessing
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+from dataclasses import replace
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.services.ga_engine import GAConfig, GAPopulation, MenuCatalog, RunLimits, K_PER_DAY, ISLAND_MIN_POP
+
+logger = logging.getLogger(__name__)
+
+BARRIER_TIMEOUT = 600.0  # 섬 하나가 죽었을 때 나머지가 영원히 기다리지 않도록
+STOP_POLL       = 0.05   # 조율 프로세스가 마감/취소를 확인하는 주기(초)
+STOP_CODES      = {"deadline": 1, "cancelled": 2, "accepted": 3}
+
+# ===== 공유 메모리 =====
+def _shared(shape, dtype, name: Optional[str] = None):
+    """공유 메모리 블록과 그 위의 ndarray 뷰. name이 있으면 기존 블록에 붙음."""
+    nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    shm = shared_memory.SharedMemory(name=name) if name else shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+def island_config(cfg: GAConfig) -> GAConfig:
+    """섬 하나의 설정: 전체 pop_size를 섬 수로 나눔(ISLAND_MIN_POP 미만으로는 안 줄임, 원래 pop_size보다는 안 큼)"""
+    size = min(cfg.pop_size, max(ISLAND_MIN_POP, cfg.pop_size // cfg.islands))
+    return replace(cfg, pop_size=size)
+
+def _island_seeds(cfg: GAConfig):
+    return np.random.SeedSequence(cfg.seed).spawn(cfg.islands)
+
+def _migration_points(cfg: GAConfig, k: int):
+    """이주가 일어나는 세대 번호(마지막 세대 직후는 제외)."""
+    if k <= 0: return set()
+    return set(range(cfg.migrate_every, cfg.generations, cfg.migrate_every))
+
+# ===== 섬 프로세스 =====
+def _island_worker(i: int, catalog: MenuCatalog, cooc, cfg: GAConfig, seed_seq, names: dict, barrier):
+    blocks = []
+    try:
+        n, k, L = cfg.islands, min(cfg.migrants, cfg.pop_size), cfg.days * K_PER_DAY
+        shm, mig = _shared((n, max(k, 1), L), np.int64, names["mig"]); blocks.append(shm)
+        shm, res_genes = _shared((n, L), np.int64, names["genes"]); blocks.append(shm)
+        shm, res_fit = _shared((n, 3), np.float64, names["fit"]); blocks.append(shm)
+        shm, ctl = _shared((n + 1,), np.int64, names["ctl"]); blocks.append(shm)   # [정지 플래그, 섬별 정지 투표]
+
+        ga = GAPopulation(catalog, cooc, cfg, np.random.default_rng(seed_seq))
+        points = _migration_points(cfg, k)
+        last = max(points, default=0)
+        stopping = False
+        for gen in range(1, cfg.generations + 1):
+            stopping = stopping or bool(ctl[0])
+            if stopping and gen > last: break        # 남은 Barrier가 없으면 바로 멈춤
+            if not stopping: ga.step()                # 멈추는 중이면 다음 이주 지점까지 건너뜀
+            if gen in points:
+                ctl[1 + i] = stopping
+                mig[i, :k] = ga.top(k)
+                barrier.wait(BARRIER_TIMEOUT)       # 전원 쓰기/투표 완료
+                if ctl[1:].any(): break             # 투표는 다음 지점 전까지 안 바뀌므로 모두 같은 결론
+                ga.immigrate(mig[(i - 1) % n, :k].copy())
+                barrier.wait(BARRIER_TIMEOUT)       # 전원 읽기 완료 → 다음 쓰기 허용
+
+        ch, fit = ga.best()
+        res_genes[i] = ch
+        res_fit[i] = (fit, 1.0 if ga.best_feas is not None else 0.0, ga.generation)
+    except BaseException:
+        barrier.abort()  # 다른 섬이 Barrier에서 멈춰 있지 않게
+        raise
+    finally:
+        for shm in blocks: shm.close()
+
+def _run_islands_processes(catalog: MenuCatalog, cooc, cfg: GAConfig, limits: Optional[RunLimits] = None):
+    n, k, L = cfg.islands, min(cfg.migrants, cfg.pop_size), cfg.days * K_PER_DAY
+    ctx = multiprocessing.get_context("spawn")
+    shm_mig, _ = _shared((n, max(k, 1), L), np.int64)
+    shm_genes, res_genes = _shared((n, L), np.int64)
+    shm_fit, res_fit = _shared((n, 3), np.float64)
+    shm_ctl, ctl = _shared((n + 1,), np.int64)
+    res_fit[:] = (-np.inf, 0.0, 0.0)
+    ctl[:] = 0
+    names = {"mig": shm_mig.name, "genes": shm_genes.name, "fit": shm_fit.name, "ctl": shm_ctl.name}
+    barrier = ctx.Barrier(n)
+
+    procs = [ctx.Process(target=_island_worker, args=(i, catalog, cooc, cfg, seed, names, barrier), daemon=True)
+             for i, seed in enumerate(_island_seeds(cfg))]
+    reason = "completed"
+    try:
+        for p in procs: p.start()
+        # 섬이 도는 동안 마감/취소 확인(토큰 종류와 무관하게 여기서만 봄 → 섬에는 플래그만 전달)
+        while any(p.is_alive() for p in procs):
+            if limits is not None and not ctl[0]:
+                r = limits.check()
+                if r: reason, ctl[0] = r, STOP_CODES[r]
+            wait([p.sentinel for p in procs if p.is_alive()], STOP_POLL)
+        failed = [i for i, p in enumerate(procs) if p.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"섬 프로세스 실패: {failed}")
+        results = [(res_genes[i].astype(int).copy(), float(res_fit[i, 0]), bool(res_fit[i, 1]), int(res_fit[i, 2]))
+                   for i in range(n)]
+        return results, reason
+    finally:
+        for p in procs:
+            if p.is_alive(): p.terminate()
+        for shm in (shm_mig, shm_genes, shm_fit, shm_ctl):
+            shm.close(); shm.unlink()
+
+# ===== 인프로세스 대체 경로 =====
+def _run_islands_inprocess(catalog: MenuCatalog, cooc, cfg: GAConfig, limits: Optional[RunLimits] = None):
+    """프로세스 경로와 같은 시드/이주 순서 → 같은 결과(병렬성만 없음)."""
+    n, k = cfg.islands, min(cfg.migrants, cfg.pop_size)
+    isl = [GAPopulation(catalog, cooc, cfg, np.random.default_rng(s)) for s in _island_seeds(cfg)]
+    points = _migration_points(cfg, k)
+    reason = "completed"
+    for gen in range(1, cfg.generations + 1):
+        r = limits.check() if limits is not None else None
+        if r:
+            reason = r; break
+        for ga in isl: ga.step()
+        if gen in points:
+            tops = [ga.top(k) for ga in isl]
+            for i, ga in enumerate(isl):
+                ga.immigrate(tops[(i - 1) % n])
+    out = []
+    for ga in isl:
+        ch, fit = ga.best()
+        out.append((ch, float(fit), ga.best_feas is not None, ga.generation))
+    return out, reason
+
+# ===== 진입점 =====
+def run_islands(catalog: MenuCatalog, cooc, cfg: GAConfig, limits: Optional[RunLimits] = None,
+                info: Optional[dict] = None) -> Tuple[np.ndarray, float, List[dict]]:
+    """반환: (최종 해, 적합도, 섬별 최고 [{island, best_fitness, feasible, generations}])
+    최종 해는 가능해를 낸 섬 중 최고, 없으면 전체 최고. info에 stopped_reason/generations_used/island_pop_size."""
+    cfg = island_config(cfg)
+    if multiprocessing.current_process().daemon:
+        logger.info("데몬 프로세스 안이라 섬 모델을 인프로세스로 실행")
+        results, reason = _run_islands_inprocess(catalog, cooc, cfg, limits)
+    else:
+        results, reason = _run_islands_processes(catalog, cooc, cfg, limits)
+
+    island_best = [{"island": i, "best_fitness": fit, "feasible": feas, "generations": gens}
+                   for i, (_, fit, feas, gens) in enumerate(results)]
+    if info is not None:
+        info.update(stopped_reason=reason, generations_used=max(r[3] for r in results), island_pop_size=cfg.pop_size)
+    best_i = max(range(len(results)), key=lambda i: (results[i][2], results[i][1]))
+    ch, fit = results[best_i][:2]
+    return ch, fit, island_best
@@ -0,0 +1,256 @@
+# backend/app/services/ga_pareto.py
+"""
+NSGA-II 파레토 엔진 (engine="pareto")
+- 목적 3개(모두 클수록 좋음): 영양(칼로리/매크로/미크로 항의 합), 비용(월 비용의 음수), 선호(선호 + 메뉴쌍)
+- 제약 위반 수(위반 벡터 합 + 스낵 규칙)는 Deb 방식: 위반이 적은 쪽이 지배, 같으면 목적끼리 파레토 비교
+- 비지배 정렬/혼잡 거리는 배열 연산으로: 지배 행렬 (2N, 2N) 한 번 + 앞(front)마다 '남은 지배자 수' 열 합 갱신
+- 세대마다 부모 + 자식 2N에서 (앞 번호, 혼잡 거리 큰 순)으로 N개 생존 → 엘리트 보존이 따로 필요 없음
+- 결과: 마지막 개체군의 첫 앞(중복 제거) 전체 + 기본 선택점(정규화 가중합 최대).
+  API 쪽은 attach_front()로 앞을 보관하고 pick_point()로 GA 없이 다른 점의 식단을 만든다.
+  앞은 메뉴 키로 보관(가지친 카탈로그 인덱스는 CSV가 바뀌면 다른 메뉴를 가리킴).
+  보관소는 프로세스 메모리(API 프로세스별 LRU): 서버 재시작이나 uvicorn 워커가 여럿이면
+  다른 프로세스에서 front_id를 못 찾을 수 있음(404 → 다시 최적화).
+"""
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import fields
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.services.ga_engine import (
+    GAConfig, GAPopulation, MenuCatalog, RunLimits, EvalState, OBJECTIVES, K_PER_DAY, _F_PRICE,
+    evaluate_children, state_objectives, state_feasible, state_scores, iter_population, prepare_run, build_result,
+)
+
+PARETO_OBJECTIVES = ("nutrition", "cost", "preference")
+PARETO_WEIGHT_KEYS = {"nutrition": "nutrition_weight", "cost": "cost_weight", "preference": "preference_weight"}
+FRONT_STORE_MAX = 32   # 보관할 파레토 앞 수(프로세스당)
+
+# ===== 목적/제약 =====
+_OBJ = {k: i for i, k in enumerate(OBJECTIVES)}
+
+def pareto_objectives(st: EvalState, catalog: MenuCatalog, cfg: GAConfig) -> np.ndarray:
+    """(P, 3) PARETO_OBJECTIVES 순서, 클수록 좋음. 비용은 원 단위 월 비용의 음수."""
+    obj = state_objectives(st, catalog, cfg)
+    nutrition = obj[:, _OBJ["kcal"]] + obj[:, _OBJ["macro"]] + obj[:, _OBJ["micro"]]
+    preference = obj[:, _OBJ["pref"]] + obj[:, _OBJ["cooc"]]
+    return np.column_stack([nutrition, -st.S[..., _F_PRICE].sum(axis=1), preference])
+
+def constraint_violation(st: EvalState, catalog: MenuCatalog, cfg: GAConfig) -> np.ndarray:
+    """(P,) 위반 수: 제약별 위반(일수/횟수) 합 + 스낵 규칙을 어긴 날 수. 0이면 가능해."""
+    _, viol = state_feasible(st, catalog, cfg)
+    days = st.genes.reshape(len(st.genes), cfg.days, K_PER_DAY)
+    snack = ((days[:, :, 5] != catalog.null_snack_idx) != cfg.snack_allowed).sum(axis=1)
+    return viol.sum(axis=1) + snack
+
+# ===== 비지배 정렬 / 혼잡 거리 =====
+def nondominated_ranks(F: np.ndarray, cv: Optional[np.ndarray] = None) -> np.ndarray:
+    """(N, M) 목적(클수록 좋음) → (N,) 앞 번호(0이 최상). cv가 있으면 위반이 적은 쪽이 먼저 지배."""
+    N, M = F.shape
+    ge = np.ones((N, N), dtype=bool)
+    gt = np.zeros((N, N), dtype=bool)
+    for m in range(M):   # 목적마다 (N, N) 비교(3차원 배열을 만드는 것보다 빠름)
+        a, b = F[:, m, None], F[None, :, m]
+        ge &= a >= b
+        gt |= a > b
+    dom = ge & gt                                   # dom[i, j]: i가 j를 지배
+    if cv is not None:
+        a, b = cv[:, None], cv[None, :]
+        dom = (a < b) | ((a == b) & dom)
+    n_dom = np.count_nonzero(dom, axis=0)           # j를 지배하는 개체 수
+    ranks = np.full(N, -1, dtype=np.int64)
+    left = np.ones(N, dtype=bool)
+    cur = n_dom == 0
+    r = 0
+    while cur.any():
+        ranks[cur] = r
+        left &= ~cur
+        n_dom -= np.count_nonzero(dom[cur], axis=0)
+        cur = left & (n_dom == 0)
+        r += 1
+    return ranks
+
+def crowding_distance(F: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """앞마다 목적별 이웃 간격(앞의 폭으로 정규화) 합. 앞의 양 끝은 inf."""
+    N, M = F.shape
+    dist = np.zeros(N)
+    if N == 0: return dist
+    for m in range(M):
+        o = np.lexsort((F[:, m], ranks))
+        f, r = F[o, m], ranks[o]
+        first = np.r_[True, r[1:] != r[:-1]]
+        last = np.r_[r[1:] != r[:-1], True]
+        starts = np.flatnonzero(first)
+        span = (np.maximum.reduceat(f, starts) - np.minimum.reduceat(f, starts))[np.cumsum(first) - 1]
+        gap = np.zeros(N)
+        gap[1:-1] = f[2:] - f[:-2]
+        dist[o] += np.where(first | last, np.inf, gap / np.where(span > 0, span, 1.0))
+    return dist
+
+def select_point(F: np.ndarray, weights=None) -> int:
+    """앞 위의 점 하나: 목적별 min-max 정규화 후 가중합 최대(weights가 없으면 같은 가중치 → 타협점)"""
+    w = np.ones(F.shape[1]) if weights is None else np.asarray(weights, dtype=np.float64)
+    lo, hi = F.min(axis=0), F.max(axis=0)
+    Z = (F - lo) / np.where(hi > lo, hi - lo, 1.0)
+    return int(np.argmax(Z @ w))
+
+def pareto_weights(values: Optional[Dict[str, float]]) -> Optional[List[float]]:
+    """{nutrition|nutrition_weight: …} → PARETO_OBJECTIVES 순서 가중치(하나도 없으면 None)"""
+    if not values: return None
+    w = [values.get(k, values.get(PARETO_WEIGHT_KEYS[k])) for k in PARETO_OBJECTIVES]
+    if all(x is None for x in w): return None
+    return [float(x or 0.0) for x in w]
+
+# ===== 개체군 =====
+def concat_states(a: EvalState, b: EvalState) -> EvalState:
+    return EvalState(**{f.name: np.concatenate([getattr(a, f.name), getattr(b, f.name)]) for f in fields(EvalState)})
+
+def take_state(st: EvalState, idx: np.ndarray) -> EvalState:
+    return EvalState(**{f.name: getattr(st, f.name)[idx] for f in fields(EvalState)})
+
+class ParetoPopulation(GAPopulation):
+    """NSGA-II. self.F (N, 3) 목적, self.cv 위반 수, self.ranks 앞 번호, self.crowd 혼잡 거리.
+    self.fits는 기존 단일 점수(state_scores)로 any/feasible-best 추적·진행 표시에만 씀."""
+
+    def _score(self, st: EvalState) -> np.ndarray:
+        if st is getattr(self, "state", None):
+            self._rank(st)
+        return state_scores(st, self.catalog, self.cfg)
+
+    def _rank(self, st: EvalState):
+        self.F = pareto_objectives(st, self.catalog, self.cfg)
+        self.cv = constraint_violation(st, self.catalog, self.cfg)
+        self.ranks = nondominated_ranks(self.F, self.cv)
+        self.crowd = crowding_distance(self.F, self.ranks)
+
+    def _select(self) -> np.ndarray:
+        """이진 토너먼트: 앞 번호가 작은 쪽, 같으면 혼잡 거리가 큰 쪽"""
+        N = len(self.pop)
+        a, b = self.rng.integers(0, N, size=(2, N))
+        ra, rb = self.ranks[a], self.ranks[b]
+        win_a = (ra < rb) | ((ra == rb) & (self.crowd[a] >= self.crowd[b]))
+        return np.where(win_a, a, b)
+
+    def step(self):
+        catalog, cooc, cfg = self.catalog, self.cooc, self.cfg
+        N = len(self.pop)
+        pop, pa, pb = self._breed(self._select())
+        # 자식은 부모 캐시 기준 증분 평가, 부모 + 자식 2N에서 N개 생존(합칠 때 복사되므로 자식 버퍼는 그대로 둠)
+        both = concat_states(self.state, evaluate_children(self.state, pop, pa, pb, catalog, cooc, cfg, copy=False))
+        F = pareto_objectives(both, catalog, cfg)
+        cv = constraint_violation(both, catalog, cfg)
+        ranks = nondominated_ranks(F, cv)
+        keep = np.lexsort((-crowding_distance(F, ranks), ranks))[:N]
+
+        self.state = take_state(both, keep)
+        self.pop = self.state.genes
+        self.F, self.cv, self.ranks = F[keep], cv[keep], ranks[keep]
+        self.crowd = crowding_distance(self.F, self.ranks)   # 잘린 마지막 앞은 남은 점끼리 다시
+        self.fits = state_scores(self.state, catalog, cfg)
+
+        i = int(self.fits.argmax())
+        if self.fits[i] > self.best_any_fit:
+            self.best_any_fit = float(self.fits[i]); self.best_any = self.pop[i].copy()
+        self.generation += 1
+        self._track_feasible(*state_feasible(self.state, catalog, cfg))
+
+    def _progress_points(self) -> List[tuple]:
+        """최소 위반 수와, 최소 위반 개체들 중 목적별 최고가 하나라도 오르면 개선"""
+        low = self.cv == self.cv.min()
+        feas = bool(self.cv.min() == 0)
+        return [(feas, -float(self.cv.min()))] + [(feas, float(self.F[low, m].max())) for m in range(self.F.shape[1])]
+
+    def front(self):
+        """첫 앞(같은 식단 제외, 비용 낮은 순) → (염색체 (F, D*K), 목적 (F, 3), 가능해 여부 (F,))"""
+        idx = np.flatnonzero(self.ranks == 0)
+        _, first = np.unique(self.pop[idx], axis=0, return_index=True)
+        idx = idx[np.sort(first)]
+        idx = idx[np.argsort(-self.F[idx, 1], kind="stable")]
+        return self.pop[idx].copy(), self.F[idx].copy(), self.cv[idx] == 0
+
+    def snapshot(self) -> dict:
+        snap = super().snapshot()
+        snap["front_size"] = int((self.ranks == 0).sum())
+        return snap
+
+def run_pareto(catalog: MenuCatalog, cooc, cfg: GAConfig, rng: Optional[np.random.Generator] = None,
+               limits: Optional[RunLimits] = None, info: Optional[dict] = None, on_progress=None,
+               pop: Optional[np.ndarray] = None):
+    """NSGA-II를 끝까지(또는 마감/취소/확정/정체까지) → ga.front(). pop은 초기 개체군(웜 스타트)"""
+    if rng is None: rng = np.random.default_rng(cfg.seed)
+    ga = ParetoPopulation(catalog, cooc, cfg, rng, pop=pop)
+    for snap in iter_population(ga, cfg.generations, limits, info):
+        if on_progress is not None: on_progress(snap)
+    return ga.front()
+
+class StaleFrontError(ValueError):
+    """보관된 앞의 메뉴가 지금 카탈로그에 없음(CSV가 바뀜)"""
+
+def pareto_summary(front, params: dict, catalog: MenuCatalog) -> dict:
+    """summary['pareto']: 점 목록 + 기본 선택점 + 점별 메뉴 키(attach_front가 front_id로 바꿈)"""
+    genes, F, feas = front
+    selected = select_point(F, pareto_weights({k: params.get(k) for k in PARETO_WEIGHT_KEYS.values()}))
+    points = [{"index": i, "nutrition": float(F[i, 0]), "cost": float(-F[i, 1]), "preference": float(F[i, 2]),
+               "feasible": bool(feas[i])} for i in range(len(F))]
+    return {"objectives": list(PARETO_OBJECTIVES), "points": points, "selected": selected,
+            "menus": catalog.keys[genes].tolist(), "fingerprint": catalog.fingerprint}
+
+# ===== 앞 보관 / 점 고르기 =====
+_fronts: "OrderedDict[str, dict]" = OrderedDict()
+_fronts_lock = threading.Lock()
+
+def attach_front(paths: Dict[str, str], params: dict, result: dict) -> Optional[str]:
+    """최적화 결과에 파레토 앞이 있으면 점별 메뉴 키를 이 프로세스에 보관하고 summary.pareto.front_id로 바꿈"""
+    pareto = (result.get("summary") or {}).get("pareto")
+    if not pareto or "menus" not in pareto:
+        return None
+    if paths is None:   # 워커 상주 프리셋으로 돈 작업
+        from app.services.optimizer_pool import preset_paths
+        paths = preset_paths()
+        if paths is None:
+            return None
+    front_id = uuid.uuid4().hex
+    entry = {"paths": dict(paths), "params": dict(params), "menus": np.asarray(pareto.pop("menus"), dtype=object),
+             "fingerprint": pareto.pop("fingerprint", None), "points": pareto["points"], "selected": pareto["selected"]}
+    with _fronts_lock:
+        _fronts[front_id] = entry
+        while len(_fronts) > FRONT_STORE_MAX:
+            _fronts.popitem(last=False)
+    pareto["front_id"] = front_id
+    return front_id
+
+def get_front(front_id: str) -> Optional[dict]:
+    with _fronts_lock:
+        entry = _fronts.get(front_id)
+        if entry is not None:
+            _fronts.move_to_end(front_id)
+        return entry
+
+def pick_point(front_id: str, index: Optional[int] = None, weights: Optional[Dict[str, float]] = None):
+    """보관된 앞에서 점 하나(index 또는 weights의 정규화 가중합 최대)의 식단을 GA 없이 → (plan_df, summary)"""
+    entry = get_front(front_id)
+    if entry is None:
+        raise KeyError(front_id)
+    points = entry["points"]
+    if index is None:
+        F = np.array([[p["nutrition"], -p["cost"], p["preference"]] for p in points], dtype=np.float64)
+        w = pareto_weights(weights)
+        index = entry["selected"] if w is None else select_point(F, w)
+    if not 0 <= int(index) < len(points):
+        raise ValueError(f"index는 0~{len(points) - 1} 범위여야 합니다.")
+    index = int(index)
+
+    # 지금 CSV로 (가지치기된) 카탈로그를 다시 만들고 메뉴 키로 인덱스를 찾음. 사전 점검은 생략
+    cfg, catalog, _, extras = prepare_run(entry["paths"], {**entry["params"], "precheck": False}, engine="pareto")
+    index_of = {k: i for i, k in enumerate(catalog.keys)}
+    menus = entry["menus"][index]
+    missing = sorted({str(k) for k in menus if k not in index_of})
+    if missing:
+        raise StaleFrontError(f"최적화 뒤 CSV가 바뀌어 이 점의 메뉴({', '.join(missing[:5])})가 후보에 없습니다. 다시 최적화하세요.")
+    plan_df, summary = build_result(np.array([index_of[k] for k in menus], dtype=np.int64), catalog, cfg)
+    summary.update(extras, engine="pareto", front_id=front_id, pareto_index=index, pareto_point=points[index])
+    if entry["fingerprint"] != catalog.fingerprint:
+        summary["catalog_changed"] = True   # 식단 지표는 지금 CSV 기준, pareto_point는 최적화 당시 값
+    return plan_df, summary
@@ -0,0 +1,148 @@
+# backend/app/services/ga_strategies.py
+"""
+다중 전략 GA: 한 번의 진화로 전략(영양/경제/선호 …)별 식단
+- 개체마다 목적 성분 벡터(state_objectives)는 한 번만 계산하고, 전략별 점수는 가중치 행렬곱으로(strategy_scores)
+- 선택은 짝마다 전략을 돌아가며 그 전략 점수로 토너먼트 → 전략 방향마다 선택압 유지
+- 전략마다 엘리트 보관소(가능해 상위 ARCHIVE_SIZE개, 중복 제외)를 따로 두고, 보관소 1위가 빠지면 개체군에 되돌림
+- 결과 = 보관소별 최고 → 전략 3개면 GA 3번 대신 1번(대략 1/3 CPU)
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.ga_engine import (
+    GAConfig, GAPopulation, MenuCatalog, RunLimits, STRATEGY_GROUPS, EvalState,
+    strategy_scores, objective_weights, iter_population, prepare_run, build_result, add_run_info,
+)
+
+ARCHIVE_SIZE = 5
+
+class StrategyArchive:
+    """전략 하나의 엘리트 보관소: 가능해 상위 size개(점수 내림차순, 같은 식단 중복 제외) + 가능해가 없을 때의 최고"""
+
+    def __init__(self, size: int = ARCHIVE_SIZE):
+        self.size = size
+        self.genes: List[np.ndarray] = []
+        self.scores: List[float] = []
+        self.best_any, self.best_any_fit = None, -np.inf
+
+    def offer(self, pop: np.ndarray, scores: np.ndarray, feas: np.ndarray):
+        i = int(scores.argmax())
+        if scores[i] > self.best_any_fit:
+            self.best_any, self.best_any_fit = pop[i].copy(), float(scores[i])
+        cand = np.flatnonzero(feas)
+        if len(cand) == 0: return
+        top = cand[np.argsort(-scores[cand], kind="stable")[:self.size]]
+        if len(self.scores) >= self.size and scores[top[0]] <= self.scores[-1]:
+            return   # 보관소 꼴찌보다 나은 게 없음
+        merged = list(zip(self.scores, self.genes)) + [(float(scores[j]), pop[j].copy()) for j in top]
+        merged.sort(key=lambda x: -x[0])
+        seen = set()
+        self.scores, self.genes = [], []
+        for s, g in merged:
+            k = g.tobytes()
+            if k in seen: continue
+            seen.add(k)
+            self.scores.append(s); self.genes.append(g)
+            if len(self.scores) >= self.size: break
+
+    def best(self):
+        """(염색체, 점수, 가능해 여부)"""
+        if self.genes:
+            return self.genes[0], self.scores[0], True
+        return self.best_any, self.best_any_fit, False
+
+class MultiStrategyPopulation(GAPopulation):
+    """개체군 하나 + 전략별 점수(self.sfits (P, S))와 보관소. self.fits는 전략 점수의 최댓값
+    (어느 전략에서도 최하위인 개체부터 교체됨)."""
+
+    def __init__(self, catalog: MenuCatalog, cooc, cfg: GAConfig, rng: np.random.Generator,
+                 weights: Dict[str, Sequence[float]], archive_size: int = ARCHIVE_SIZE):
+        self.names = list(weights)
+        self.W = np.array([weights[n] for n in self.names], dtype=np.float64)   # (S, len(OBJECTIVES))
+        self.archives = {n: StrategyArchive(archive_size) for n in self.names}
+        self.sfits: Optional[np.ndarray] = None
+        super().__init__(catalog, cooc, cfg, rng)
+
+    def _score(self, st: EvalState) -> np.ndarray:
+        sf = strategy_scores(st, self.catalog, self.cfg, self.W, self.scales)
+        if st is getattr(self, "state", None):
+            self.sfits = sf   # 개체군 전체 평가일 때만 보관(선택/보관소용)
+        return sf.max(axis=1)
+
+    def _select(self) -> np.ndarray:
+        """짝(sel[2k], sel[2k+1])마다 전략을 돌아가며 그 전략 점수로 3-토너먼트"""
+        N, S = self.sfits.shape
+        f = np.where(np.isfinite(self.sfits), self.sfits, -1e30)
+        cand = self.rng.integers(0, N, size=(N, 3))
+        col = (np.arange(N) // 2) % S
+        return cand[np.arange(N), f[cand, col[:, None]].argmax(axis=1)]
+
+    def _place(self, i: int, genes: np.ndarray, st: Optional[EvalState] = None, j: int = 0):
+        row = super()._place(i, genes, st, j)
+        if st is None:   # 단건 교체(보관소 복귀)는 바로 점수, 묶음(이주/재시작)은 _rescore에서 한 번에
+            self._rescore(np.array([i]), row)
+        return row
+
+    def _rescore(self, idx: np.ndarray, st: EvalState):
+        sf = strategy_scores(st, self.catalog, self.cfg, self.W, self.scales)
+        self.sfits[idx] = sf
+        self.fits[idx] = sf.max(axis=1)
+
+    def _track_feasible(self, feas: np.ndarray, viol: np.ndarray):
+        for s, name in enumerate(self.names):
+            self.archives[name].offer(self.pop, self.sfits[:, s], feas)
+        super()._track_feasible(feas, viol)
+
+    def _progress_points(self) -> List[tuple]:
+        """전략 하나라도 보관소 최고가 오르면 개선"""
+        return [(b[2], b[1]) for b in (self.archives[n].best() for n in self.names)]
+
+    def step(self):
+        super().step()
+        # 보관소 1위가 개체군에서 빠졌으면 최하위 자리에 되돌림(전략별 엘리트 보존)
+        for name in self.names:
+            genes, _, _ = self.archives[name].best()
+            if genes is None or (self.pop == genes).all(axis=1).any(): continue
+            self._place(int(self.fits.argmin()), genes.copy())
+
+    def snapshot(self) -> dict:
+        snap = super().snapshot()
+        snap["strategies"] = {n: {"best_fitness": float(b[1]), "feasible": bool(b[2])}
+                              for n, b in ((n, self.archives[n].best()) for n in self.names)}
+        return snap
+
+def iter_strategies(catalog: MenuCatalog, cooc, cfg: GAConfig, weights: Dict[str, Sequence[float]],
+                    rng: Optional[np.random.Generator] = None, limits: Optional[RunLimits] = None,
+                    info: Optional[dict] = None):
+    """iter_ga와 같은 규약. 끝나면 info['strategies'] = {전략: (염색체, 점수, 가능해 여부)}"""
+    if rng is None: rng = np.random.default_rng(cfg.seed)
+    ga = MultiStrategyPopulation(catalog, cooc, cfg, rng, weights)
+    yield from iter_population(ga, cfg.generations, limits, info)
+    if info is not None:
+        info["strategies"] = {n: ga.archives[n].best() for n in ga.names}
+
+def optimize_strategies(paths: dict, params: dict, strategies: Dict[str, Dict[str, float]],
+                        catalog: Optional[MenuCatalog] = None, cooc=None,
+                        limits: Optional[RunLimits] = None, on_progress=None):
+    """strategies = {이름: {nutrition_weight, cost_weight, preference_weight}} → {이름: (plan_df, summary)}.
+    slots 엔진 단일 개체군으로 한 번만 진화(engine/islands 파라미터는 쓰지 않음)."""
+    base = {k: v for k, v in params.items() if k not in STRATEGY_GROUPS}
+    limits = (limits or RunLimits()).tighten(params.get("time_budget"))
+    cfg, catalog, cooc, extras = prepare_run(paths, base, catalog, cooc, "slots")
+    cfg = cfg.with_objective_scales(catalog, cooc)   # strategy_fitness를 실행 사이에 비교할 수 있게
+    weights = {name: objective_weights(*(w.get(k) for k in STRATEGY_GROUPS)) for name, w in strategies.items()}
+
+    run_info: dict = {}
+    for snap in iter_strategies(catalog, cooc, cfg, weights, None, limits, run_info):
+        if on_progress is not None: on_progress(snap)
+
+    out = {}
+    for name, (ch, score, feasible) in run_info["strategies"].items():
+        if ch is None:
+            raise RuntimeError(f"해를 찾지 못함({name})")
+        plan_df, summary = build_result(ch, catalog, cfg)
+        summary.update(extras, engine="slots", shared_run=True, strategy_fitness=float(score))
+        add_run_info(summary, run_info, params)
+        out[name] = (plan_df, summary)
+    return out
@@ -0,0 +1,230 @@
+# backend/app/services/job_queue.py
+"""
+식단 최적화 비동기 작업(job) 큐
+- submit()은 바로 job_id를 돌려주고, 계산은 optimizer_pool(상주 워커 프로세스 풀)에서 수행
+- 대기+실행 중 작업 수를 job_queue_max로 제한(넘치면 JobQueueFull → API 429)
+- 취소: 대기 중이면 큐에서 빼고, 실행 중이면 취소 토큰 → GA가 다음 세대에서 멈추고 그때까지의 최선 식단을 남김
+- 상태/결과는 메모리 + (database_url이 sqlite면) SQLite에 저장 → 서버 재시작 뒤에도 조회 가능
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINAL_STATES = (JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED)
+
+class JobQueueFull(RuntimeError):
+    """대기열이 가득 참(잠시 후 다시 요청)"""
+
+@dataclass
+class Job:
+    id: str
+    params: Dict[str, Any]
+    paths: Optional[Dict[str, str]] = None
+    status: str = JOB_QUEUED
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Dict[str, Any]] = None
+    cancel_requested: bool = False
+    future: Any = None
+    cancel: Any = None
+
+    def to_dict(self, with_result: bool = True) -> Dict[str, Any]:
+        d = {"job_id": self.id, "status": self.status, "created_at": self.created_at,
+             "finished_at": self.finished_at, "params": self.params, "error": self.error}
+        if with_result:
+            d["result"] = self.result
+        return d
+
+# ===== SQLite 저장소 =====
+def _sqlite_path(url: Optional[str]) -> Optional[str]:
+    """sqlite:///상대/경로 또는 sqlite:////절대/경로 → 파일 경로(sqlite가 아니면 None)"""
+    if not url or not url.startswith("sqlite:///"):
+        return None
+    p = url[len("sqlite:///"):]
+    return p if p.startswith("/") else settings.resolve_path(p)
+
+class JobStore:
+    """작업 상태 영속화(SQLite). 경로가 없으면 아무것도 안 함(메모리만)."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._lock = threading.Lock()
+        if path:
+            with self._db() as c:
+                c.execute("""CREATE TABLE IF NOT EXISTS optimization_jobs (
+                    id TEXT PRIMARY KEY, status TEXT NOT NULL, params TEXT, created_at REAL,
+                    finished_at REAL, result TEXT, error TEXT)""")
+                # 이전 프로세스에서 끝나지 못한 작업은 실패 처리
+                c.execute("UPDATE optimization_jobs SET status=?, error=?, finished_at=? WHERE status IN (?, ?)",
+                          (JOB_FAILED, json.dumps({"status": 500, "message": "서버 재시작으로 중단됨"}), time.time(),
+                           JOB_QUEUED, JOB_RUNNING))
+
+    @contextmanager
+    def _db(self):
+        """연결 1개: 잠금 안에서 열고, 끝나면 커밋(예외면 롤백) 후 닫음"""
+        with self._lock, closing(sqlite3.connect(self.path, timeout=10, check_same_thread=False)) as conn, conn:
+            yield conn
+
+    def save(self, job: Job):
+        if not self.path: return
+        row = (job.id, job.status, json.dumps(job.params, ensure_ascii=False, default=str), job.created_at,
+               job.finished_at, None if job.result is None else json.dumps(job.result, ensure_ascii=False, default=str),
+               None if job.error is None else json.dumps(job.error, ensure_ascii=False, default=str))
+        try:
+            with self._db() as c:
+                c.execute("INSERT OR REPLACE INTO optimization_jobs VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+        except sqlite3.Error as e:
+            logger.error(f"작업 저장 실패({job.id}): {e}")
+
+    def load(self, job_id: str) -> Optional[Job]:
+        if not self.path: return None
+        with self._db() as c:
+            r = c.execute("SELECT id, status, params, created_at, finished_at, result, error "
+                          "FROM optimization_jobs WHERE id=?", (job_id,)).fetchone()
+        if r is None: return None
+        loads = lambda s: None if s is None else json.loads(s)
+        return Job(id=r[0], status=r[1], params=loads(r[2]) or {}, created_at=r[3], finished_at=r[4],
+                   result=loads(r[5]), error=loads(r[6]))
+
+# ===== 관리자 =====
+class JobManager:
+    def __init__(self, max_pending: int, store: JobStore, keep: int = 200):
+        self.max_pending = max_pending
+        self.store = store
+        self.keep = keep   # 메모리에 남길 끝난 작업 수(이후는 SQLite에서 조회)
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _pending(self) -> int:
+        """끝나지 않은 작업 수(self._lock 안에서 호출)"""
+        return sum(1 for j in self.jobs.values() if j.status not in FINAL_STATES)
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending()
+
+    def submit(self, params: Dict[str, Any], paths: Optional[Dict[str, str]] = None) -> Job:
+        from app.services import optimizer_pool
+
+        params = dict(params)
+        # 마감은 큐 대기 시간이 아니라 실행 시작부터: time_budget(초)로 넘겨 optimize_menu 안에서 계산.
+        # 서버 상한으로 줄인 값은 워커에 넘기는 사본에만(저장되는 요청 params는 그대로)
+        timeout_sec = float(getattr(settings, "optimization_timeout", 180))
+        run_params = dict(params, time_budget=min(float(params.get("time_budget") or timeout_sec), timeout_sec))
+        with self._lock:
+            if self._pending() >= self.max_pending:
+                raise JobQueueFull(f"대기 중인 최적화 작업이 {self.max_pending}개로 가득 찼습니다.")
+            job = Job(id=uuid.uuid4().hex, params=params, paths=paths)
+            job.cancel = optimizer_pool.new_cancel_event()
+            self.jobs[job.id] = job
+            self._evict()
+        self.store.save(job)
+        try:
+            job.future = optimizer_pool.submit_optimization(run_params, seed=params.get("seed"), paths=paths,
+                                                            cancel=job.cancel, on_start=lambda j=job: self._start(j))
+        except Exception as e:   # 풀 고장 등: queued로 남아 대기 슬롯을 차지하지 않게 실패로 기록
+            with self._lock:
+                job.status, job.error = JOB_FAILED, {"status": 500, "message": f"작업 제출 실패: {e}"}
+                job.finished_at = time.time()
+                job.cancel = None
+                self.store.save(job)
+            logger.error(f"[job {job.id}] 제출 실패: {e}")
+            raise
+        job.future.add_done_callback(lambda f, j=job: self._finish(j, f))
+        logger.info(f"[job {job.id}] 제출 (대기 {self.pending()}/{self.max_pending})")
+        return job
+
+    def _start(self, job: Job):
+        """워커가 작업을 시작하면(optimizer_pool on_start) running으로 바꾸고 저장"""
+        with self._lock:
+            if job.status != JOB_QUEUED:
+                return
+            job.status = JOB_RUNNING
+            self.store.save(job)
+        logger.info(f"[job {job.id}] running")
+
+    def _finish(self, job: Job, fut):
+        from app.services.presolve import InfeasibleParamsError
+        from app.services.ga_pareto import attach_front
+        result = error = None
+        try:
+            result = fut.result()
+            attach_front(job.paths, job.params, result)
+            stopped = (result.get("summary") or {}).get("stopped_reason")
+            status = JOB_CANCELLED if job.cancel_requested or stopped == "cancelled" else JOB_SUCCEEDED
+        except CancelledError:
+            status = JOB_CANCELLED
+        except InfeasibleParamsError as e:
+            status, error = JOB_FAILED, {"status": 422, "message": str(e), "report": e.report}
+        except ValueError as e:   # 잘못된 요청 값(engine, locked/free_days/base_plan 등) → API와 같은 400
+            status, error = JOB_FAILED, {"status": 400, "message": str(e)}
+        except Exception as e:
+            status, error = JOB_FAILED, {"status": 500, "message": f"최적화 실행 오류: {e}"}
+            logger.error(f"[job {job.id}] 실패: {e}")
+        with self._lock:   # _start(running 저장)와 같은 잠금 안에서 → 최종 상태가 덮이지 않음
+            job.status, job.result, job.error = status, result, error
+            job.finished_at = time.time()
+            job.future = job.cancel = None
+            self.store.save(job)
+        logger.info(f"[job {job.id}] {job.status}")
+
+    def _evict(self):
+        done = [k for k, j in self.jobs.items() if j.status in FINAL_STATES]
+        for k in done[:max(0, len(done) - self.keep)]:
+            del self.jobs[k]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        job = self.jobs.get(job_id)
+        return job if job is not None else self.store.load(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """대기 중이면 바로 취소, 실행 중이면 취소 토큰(최선 식단은 result에 남음)"""
+        job = self.get(job_id)
+        if job is None or job.status in FINAL_STATES:
+            return job
+        job.cancel_requested = True
+        if job.future is not None and job.future.cancel():
+            return job   # done 콜백이 cancelled로 기록
+        if job.cancel is not None:
+            try:
+                job.cancel.set()
+            except Exception as e:
+                logger.warning(f"[job {job.id}] 취소 토큰 설정 실패: {e}")
+        return job
+
+    def recent(self, limit: int = 20) -> List[Job]:
+        with self._lock:   # 제출/정리와 동시에 순회하지 않게 잠금 안에서 사본
+            jobs = list(self.jobs.values())
+        return jobs[-limit:][::-1]
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+def get_job_manager() -> JobManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            path = _sqlite_path(getattr(settings, "database_url", None))
+            if getattr(settings, "database_url", None) and path is None:
+                logger.warning(f"sqlite가 아닌 database_url은 작업 저장에 쓰지 않음(메모리만): {settings.database_url}")
+            try:
+                store = JobStore(path)
+            except sqlite3.Error as e:
+                logger.error(f"작업 저장소(SQLite) 열기 실패, 메모리만 사용: {e}")
+                store = JobStore(None)
+            _manager = JobManager(int(getattr(settings, "job_queue_max", 32)), store)
+        return _manager
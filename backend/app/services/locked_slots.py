@@ -0,0 +1,92 @@
+# backend/app/services/locked_slots.py
+"""
+고정 슬롯 / 부분 재최적화 (params.locked, params.free_days, params.base_plan)
+- locked = [{"day": 3, "slot": "rice", "menu": "현미밥"}, ...] 또는 {"3:rice": "현미밥"}  (day는 1부터, slot은 plan 열 이름)
+- free_days = [16, 17, ...] → 나머지 날은 base_plan(이전 결과 plan | 작업 ID | 결과 캐시 키) 그대로 고정
+  (locked가 같은 자리를 가리키면 locked가 우선)
+- 고정 위치는 GeneLock으로 cfg.lock에 실려 GA로 감: 그 자리는 변이 후보 풀이 비고, 초기화/변이 뒤 고정값으로 덮음
+  → 자유 유전자만 진화하고, 반복 창/월 반복 제한/월 예산은 고정된 날까지 포함한 전체 식단으로 계산
+- 메뉴는 그 슬롯 카테고리 안에서 메뉴 키 → 이름 → 정규화 키 순으로 찾고, 없으면 ValueError
+"""
+import logging
+from typing import Any, Dict
+
+import numpy as np
+
+from app.services.ga_engine import (
+    GAConfig, GeneLock, MenuCatalog, CATEGORY_CODES, DAILY_SLOTS, K_PER_DAY, NULL_SNACK_NAME, norm_key,
+)
+from app.services.warm_start import PLAN_SLOTS, plan_keys, _resolve_plan
+
+logger = logging.getLogger(__name__)
+
+# ===== params → {유전자 위치: 메뉴} =====
+def _gene_pos(day, slot, cfg: GAConfig) -> int:
+    try:
+        d = int(day)
+    except (TypeError, ValueError):
+        raise ValueError(f"locked의 day가 숫자가 아닙니다: {day!r}")
+    if not 1 <= d <= cfg.days:
+        raise ValueError(f"locked의 day는 1~{cfg.days} 범위여야 합니다: {d}")
+    if slot not in PLAN_SLOTS:
+        raise ValueError(f"locked의 slot은 {', '.join(PLAN_SLOTS)} 중 하나여야 합니다: {slot!r}")
+    return (d - 1) * K_PER_DAY + PLAN_SLOTS.index(slot)
+
+def _parse_locked(locked, cfg: GAConfig) -> Dict[int, str]:
+    if isinstance(locked, dict):
+        items = []
+        for k, menu in locked.items():
+            day, _, slot = str(k).partition(":")
+            items.append((day, slot.strip(), menu))
+    else:
+        items = [(e.get("day"), e.get("slot"), e.get("menu")) for e in (locked or []) if isinstance(e, dict)]
+    return {_gene_pos(day, slot, cfg): str(menu or "") for day, slot, menu in items}
+
+def locked_menus(params: Dict[str, Any], cfg: GAConfig) -> Dict[int, str]:
+    """free_days 밖의 날은 base_plan에서, 그 위에 locked → {유전자 위치: 메뉴 이름/키}"""
+    out: Dict[int, str] = {}
+    free = params.get("free_days")
+    if free is not None:
+        free = {int(d) for d in free}
+        if any(not 1 <= d <= cfg.days for d in free):
+            raise ValueError(f"free_days는 1~{cfg.days} 범위여야 합니다: {sorted(free)}")
+        plan = _resolve_plan(params.get("base_plan"))
+        names = plan_keys(plan, cfg.days) if plan else None
+        if names is None:
+            raise ValueError("free_days를 쓰려면 base_plan(이전 결과 plan, 작업 ID 또는 결과 캐시 키)이 필요합니다.")
+        for g in range(cfg.days * K_PER_DAY):
+            if g // K_PER_DAY + 1 not in free:
+                out[g] = names[g]
+    out.update(_parse_locked(params.get("locked"), cfg))
+    return out
+
+# ===== 메뉴 → 카탈로그 인덱스 =====
+def resolve_lock(menus: Dict[int, str], catalog: MenuCatalog, cfg: GAConfig) -> GeneLock:
+    """{유전자 위치: 메뉴} → GeneLock(이 카탈로그 인덱스). 가지치기 전/후 카탈로그 모두에 씀"""
+    index: Dict[tuple, int] = {}
+    for i, (cat, key) in enumerate(zip(catalog.category, catalog.keys)):
+        index.setdefault((int(cat), key), i)
+    for i, (cat, name) in enumerate(zip(catalog.category, catalog.names)):
+        index.setdefault((int(cat), name), i)
+    null = catalog.null_snack_idx
+
+    mask = np.zeros(cfg.days * K_PER_DAY, dtype=bool)
+    genes = np.zeros(cfg.days * K_PER_DAY, dtype=np.int64)
+    missing = []
+    for g, menu in menus.items():
+        slot, day = DAILY_SLOTS[g % K_PER_DAY], g // K_PER_DAY
+        if slot == "snack" and (not menu or menu == NULL_SNACK_NAME or not cfg.snack_allowed[day]):
+            if menu and menu != NULL_SNACK_NAME:
+                logger.warning(f"고정 슬롯: {day + 1}일은 간식이 없는 날이라 '{menu}' 대신 간식 없음으로 고정")
+            i = null
+        else:
+            code = CATEGORY_CODES[slot]
+            i = index.get((code, menu), index.get((code, norm_key(menu)), -1))
+        if i < 0:
+            missing.append(f"{day + 1}일 {PLAN_SLOTS[g % K_PER_DAY]}={menu}")
+            continue
+        mask[g], genes[g] = True, i
+    if missing:
+        raise ValueError(f"고정 슬롯 메뉴를 후보에서 찾지 못했습니다: {', '.join(missing[:5])}"
+                         + (f" 외 {len(missing) - 5}개" if len(missing) > 5 else ""))
+    return GeneLock(mask=mask, genes=genes)
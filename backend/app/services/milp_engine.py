@@ -0,0 +1,185 @@
+# backend/app/services/milp_engine.py
+"""
+MILP 정확해 엔진 (engine="milp", scipy.optimize.milp / HiGHS)
+- 변수: x[d,i] ∈ {0,1} (d일에 메뉴 i 배정) + u[d] ≥ 0 (d일 칼로리 목표 편차의 절댓값)
+- 일별: 슬롯 개수(밥1/국1/반찬3/간식1), 칼로리 밴드, g 기준 매크로 범위(선형화), 단백질 칼로리 < 20%, 미크로 하한
+- 월간: 예산, 메뉴별 MAX_REPEAT_PER_MONTH, REPEAT_WINDOW_DAYS 안 재등장 금지 (NULL_SNACK 제외)
+- 목적: Σ|kcal - 목표| - W_PREF·Σ선호  (메뉴쌍 조합 점수/칼로리 기준 매크로 목표 편차는 비선형이라 모델에 없음)
+- time_limit에 걸리면 그때까지의 최선해(incumbent)를 반환. 월 단위 모델은 크기가 커서 gap이 잘 안 닫히므로
+  기본 제한 시간은 짧게 두고, summary.mip_gap / summary.solver로 최적성 증명 여부를 알려 줌
+  (제한 시간 안에 가능해가 하나도 없으면 optimize_menu가 slots GA로 대신 풀고 solver.fallback에 기록)
+- 목적식이 GA 적합도와 다르므로(조합 점수/매크로 목표 없음) 기본 엔진이 아니라 engine="milp"로 명시할 때만 씀
+"""
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+try:
+    from scipy import sparse as sp
+    from scipy.optimize import milp, LinearConstraint, Bounds
+except ImportError:
+    milp = None
+
+from app.services.ga_engine import (
+    GAConfig, MenuCatalog, CATEGORY_CODES, DAILY_SLOTS, K_PER_DAY, MICRO_COLS,
+    _F_PRICE, _F_KCAL, _F_CARB, _F_PROT, _F_FAT, _F_MICRO, _F_PREF,
+)
+
+logger = logging.getLogger(__name__)
+
+MILP_TIME_LIMIT = 10.0   # 초 (요청 time_limit으로 늘릴 수 있음)
+MILP_GAP        = 1e-4   # 상대 MIP gap
+PROT_CAL_EPS    = 1e-6   # 단백질 칼로리 비중 '< 0.20'(엄격 부등식)용 여유
+OMITTED_TERMS   = ("cooc", "macro_target")   # GA 적합도에는 있지만 MILP 목적식에는 없는 항
+
+@dataclass
+class MilpModel:
+    c: np.ndarray
+    constraints: list
+    lb: np.ndarray
+    ub: np.ndarray
+    integrality: np.ndarray
+    n_items: int
+    days: int
+
+def _require_scipy():
+    if milp is None:
+        raise RuntimeError("engine='milp'에는 scipy(>=1.9)가 필요합니다. pip install scipy")
+
+# ===== 모델 구성 =====
+def build_milp_model(catalog: MenuCatalog, cfg: GAConfig, micro: bool = True, repeats: bool = True,
+                     budget: bool = True) -> MilpModel:
+    """micro/repeats/budget=False면 해당 제약 제외(사전 점검용 LP 완화에서 GA 기준 하드 제약만 볼 때)"""
+    _require_scipy()
+    n, D = len(catalog), cfg.days
+    F = catalog.feats
+    nx = D * n                      # x[d,i] → d*n + i, 그 뒤에 u[d]
+    null = catalog.null_snack_idx
+    cat = catalog.category
+    rows, lo, hi = [], [], []
+
+    def add(A, l, u):
+        A = sp.csr_matrix(A); m = A.shape[0]
+        rows.append(A)
+        lo.append(np.broadcast_to(np.asarray(l, dtype=float), (m,)))
+        hi.append(np.broadcast_to(np.asarray(u, dtype=float), (m,)))
+
+    def per_day(V, l, u):
+        """V: (R, n) 하루 계수 → 날마다 같은 행을 쌓음(u 열은 0)"""
+        V = np.atleast_2d(V); R = V.shape[0]
+        A = sp.kron(sp.eye(D), sp.csr_matrix(V))
+        add(sp.hstack([A, sp.csr_matrix((A.shape[0], D))]),
+            np.tile(np.broadcast_to(l, (R,)), D), np.tile(np.broadcast_to(u, (R,)), D))
+
+    # 슬롯 개수(간식은 아래 변수 범위로 처리)
+    counts = {"rice": 1, "soup": 1, "side": DAILY_SLOTS.count("side")}
+    V = np.array([(cat == CATEGORY_CODES[k]).astype(float) for k in counts])
+    cnt = np.array(list(counts.values()), dtype=float)
+    per_day(V, cnt, cnt)
+
+    # 칼로리 밴드
+    kcal = F[:, _F_KCAL]
+    lo_k, hi_k = cfg.kcal_band
+    per_day(kcal[None, :], lo_k, hi_k)
+
+    # g 기준 매크로 비율: lo·(c+p+f) ≤ g ≤ hi·(c+p+f)
+    tot = F[:, _F_CARB] + F[:, _F_PROT] + F[:, _F_FAT]
+    for k, col in (("carbo", _F_CARB), ("protein", _F_PROT), ("fat", _F_FAT)):
+        lo_b, hi_b = cfg.macro_bounds[k]
+        per_day(np.vstack([F[:, col] - lo_b*tot, F[:, col] - hi_b*tot]), [0.0, -np.inf], [np.inf, 0.0])
+
+    # 단백질 칼로리 비중 < 0.20  ⇔  4p - 0.2·kcal < 0
+    per_day((4.0*F[:, _F_PROT] - 0.20*kcal)[None, :], -np.inf, -PROT_CAL_EPS)
+
+    # 미크로 하한
+    mic = F[:, _F_MICRO]
+    mins = [(j, float(cfg.micro_min[k])) for j, k in enumerate(MICRO_COLS) if cfg.micro_min.get(k)]
+    if micro and mins:
+        per_day(np.vstack([mic[:, j] for j, _ in mins]), [m for _, m in mins], np.inf)
+
+    # 칼로리 편차 |kcal_d - T| ≤ u_d
+    Kd = sp.kron(sp.eye(D), sp.csr_matrix(kcal[None, :]))
+    add(sp.hstack([Kd, -sp.eye(D)]), -np.inf, np.full(D, cfg.target_kcal))
+    add(sp.hstack([Kd,  sp.eye(D)]), np.full(D, cfg.target_kcal), np.inf)
+
+    # 월 예산
+    if budget:
+        add(np.concatenate([np.tile(F[:, _F_PRICE], D), np.zeros(D)])[None, :], -np.inf, cfg.total_budget)
+
+    # 반복: 월간 횟수 / 윈도우(연속 W일 안에 최대 1번). NULL_SNACK은 '간식 없음'이라 제외
+    keep = np.flatnonzero(np.arange(n) != null)
+    E = sp.eye(n, format="csr")[keep]
+    if repeats:
+        add(sp.hstack([sp.kron(np.ones((1, D)), E), sp.csr_matrix((len(keep), D))]), -np.inf, cfg.max_repeat_per_month)
+    W = cfg.repeat_window_days
+    if repeats and W > 1:
+        starts = range(max(1, D - W + 1))
+        band = np.zeros((len(starts), D))
+        for r, s0 in enumerate(starts): band[r, s0:s0+W] = 1.0
+        add(sp.hstack([sp.kron(band, E), sp.csr_matrix((band.shape[0]*len(keep), D))]), -np.inf, 1.0)
+
+    # 변수 범위: 간식 허용일엔 실제 간식 1개, 아니면 NULL_SNACK 고정. 미분류 메뉴는 0
+    lb = np.zeros(nx + D); ub = np.ones(nx + D); ub[nx:] = np.inf
+    is_snack = cat == CATEGORY_CODES["snack"]
+    real_snack = is_snack & (np.arange(n) != null)
+    for d in range(D):
+        o = d * n
+        ub[o:o+n][cat < 0] = 0.0
+        if cfg.snack_allowed[d]:
+            ub[o + null] = 0.0
+        else:
+            ub[o:o+n][real_snack] = 0.0
+            lb[o + null] = 1.0
+    snack_days = np.flatnonzero(cfg.snack_allowed)
+    if len(snack_days):
+        V = np.zeros((len(snack_days), nx + D))
+        for r, d in enumerate(snack_days): V[r, d*n:(d+1)*n] = real_snack
+        add(V, 1.0, 1.0)
+
+    # 목적: 칼로리 편차 - 선호
+    c = np.concatenate([np.tile(-cfg.w_pref * F[:, _F_PREF], D), np.ones(D)])
+    A = sp.vstack(rows, format="csr")
+    constraints = [LinearConstraint(A, np.concatenate(lo), np.concatenate(hi))]
+    integrality = np.concatenate([np.ones(nx), np.zeros(D)])
+    return MilpModel(c=c, constraints=constraints, lb=lb, ub=ub, integrality=integrality, n_items=n, days=D)
+
+# ===== 풀이 =====
+def decode(x: np.ndarray, model: MilpModel, catalog: MenuCatalog) -> np.ndarray:
+    """x → (D*K) 염색체. 슬롯 순서: 밥, 국, 반찬×3, 간식"""
+    n, D = model.n_items, model.days
+    X = x[:D*n].reshape(D, n) > 0.5
+    order = [CATEGORY_CODES[s] for s in DAILY_SLOTS]
+    ch = np.empty((D, K_PER_DAY), dtype=int)
+    for d in range(D):
+        chosen = np.flatnonzero(X[d])
+        by_cat = {code: sorted(chosen[catalog.category[chosen] == code].tolist()) for code in set(order)}
+        ch[d] = [by_cat[code].pop(0) for code in order]
+    return ch.reshape(-1)
+
+def solve_milp(catalog: MenuCatalog, cfg: GAConfig, time_limit: Optional[float] = None,
+               mip_gap: Optional[float] = None):
+    """반환: (염색체, 정보 dict). 시간 안에 가능해를 못 찾으면 염색체 None, 가능해가 없다고 증명되면 RuntimeError"""
+    model = build_milp_model(catalog, cfg)
+    opts = {"time_limit": float(time_limit or MILP_TIME_LIMIT), "mip_rel_gap": float(mip_gap or MILP_GAP)}
+    res = milp(c=model.c, constraints=model.constraints, integrality=model.integrality,
+               bounds=Bounds(model.lb, model.ub), options=opts)
+
+    info = {
+        "status": int(res.status),
+        "message": str(res.message),
+        "optimal": res.status == 0,
+        "objective": None if res.x is None else float(res.fun),
+        "mip_gap": None if getattr(res, "mip_gap", None) is None else float(res.mip_gap),
+        "time_limit": opts["time_limit"],
+        "omitted_terms": list(OMITTED_TERMS),
+    }
+    if res.status == 2:
+        raise RuntimeError("MILP: 제약을 모두 만족하는 식단이 없습니다(예산/칼로리/매크로/반복 제약 모순).")
+    if res.x is None:
+        logger.warning(f"MILP: 제한 시간 {opts['time_limit']}초 안에 가능해를 찾지 못함 ({res.message})")
+        return None, info
+    if not info["optimal"]:
+        logger.warning(f"MILP: 최적성 미증명, 제한 시간 {opts['time_limit']}초 안의 최선해 반환 (gap={info['mip_gap']})")
+    return decode(res.x, model, catalog), info
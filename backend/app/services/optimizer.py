@@ -4,26 +4,33 @@
 워크플로우에서 전달받은 전략 타입에 따라 최적화 가중치를 조정
 """
 import logging
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Optional, Sequence
 import pandas as pd
 
 # ga_engine에서 실제 최적화 로직을 가져옴
 from app.services.ga_engine import optimize_menu as ga_optimize_menu
+from app.services.ga_strategies import optimize_strategies as ga_optimize_strategies
+from app.services.presolve import InfeasibleParamsError
 
 logger = logging.getLogger(__name__)
 
-def optimize_menu(paths: Dict[str, str], params: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+def optimize_menu(paths: Dict[str, str], params: Dict[str, Any],
+                  catalog=None, cooc=None, limits=None, on_progress=None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
     """
     식단 최적화 메인 함수 (전략별 가중치 지원)
     
     Args:
         paths: CSV 파일 경로들 (price, nutr, cat, pref, cooc)
+        catalog, cooc: 미리 로드된 후보 카탈로그/메뉴쌍 행렬 (워커 프로세스 상주본, 없으면 paths에서 로드)
+        limits: ga_engine.RunLimits (마감/취소 토큰). 걸리면 그때까지의 최선 식단 + summary.stopped_reason
+        on_progress: 세대별 스냅샷 콜백(스트리밍)
         params: 최적화 파라미터들 
             - days: 일수
             - budget_won: 예산
             - target_kcal: 목표 칼로리
             - strategy_type: 전략 타입 ('nutrition', 'economic', 'preference')
             - nutrition_weight, cost_weight, preference_weight: 전략별 가중치
+              (GA 적합도에는 weighted_fitness=True일 때만 반영, 아니면 summary 기록용)
     
     Returns:
         Tuple[DataFrame, Dict]: (최적화된 식단표, 요약 정보)
@@ -44,7 +51,8 @@ def optimize_menu(paths: Dict[str, str], params: Dict[str, Any]) -> Tuple[pd.Dat
                    f"선호도: {enhanced_params.get('preference_weight', 0.2):.1f}")
         
         # GA 엔진 호출 (가중치가 적용된 파라미터 전달)
-        plan_df, summary = ga_optimize_menu(paths=paths, params=enhanced_params)
+        plan_df, summary = ga_optimize_menu(paths=paths, params=enhanced_params, catalog=catalog, cooc=cooc,
+                                            limits=limits, on_progress=on_progress)
         
         # 전략 정보를 summary에 추가
         summary['strategy_applied'] = strategy_type
@@ -57,24 +65,50 @@ def optimize_menu(paths: Dict[str, str], params: Dict[str, Any]) -> Tuple[pd.Dat
         logger.info(f"식단 최적화 완료 - 총 {len(plan_df)}일 계획 생성 ({strategy_type} 전략 적용)")
         return plan_df, summary
         
+    except InfeasibleParamsError:
+        raise  # 사전 점검 거절은 report를 유지한 채 그대로 전달(API 422)
+    except ValueError:
+        raise  # 잘못된 요청 값(engine, locked/free_days/base_plan 등)은 그대로 전달(API 400)
     except Exception as e:
         logger.error(f"식단 최적화 실패: {e}")
         import traceback
         logger.error(traceback.format_exc())
         raise RuntimeError(f"최적화 처리 중 오류가 발생했습니다: {e}")
 
-def optimize_menu(paths, params):
-    strategy_type = params.get('strategy_type', 'nutrition')
+WEIGHT_KEYS = ('nutrition_weight', 'cost_weight', 'preference_weight')
+DEFAULT_STRATEGIES = ('nutrition', 'economic', 'preference')
+
+def optimize_strategies(paths: Dict[str, str], params: Dict[str, Any], strategy_types: Optional[Sequence[str]] = None,
+                        catalog=None, cooc=None, limits=None, on_progress=None) -> Dict[str, Tuple[pd.DataFrame, Dict[str, Any]]]:
+    """
+    여러 전략의 식단을 GA 한 번으로 생성 (전략별 엘리트 보관소, ga_strategies 참고)
     
-    if strategy_type == 'nutrition':
-        # 영양소 가중치 높임
-        fitness_weights = {'nutrition': 0.8, 'cost': 0.1, 'preference': 0.1}
-    elif strategy_type == 'economic':
-        # 비용 효율성 가중치 높임  
-        fitness_weights = {'nutrition': 0.2, 'cost': 0.7, 'preference': 0.1}
-    elif strategy_type == 'preference':
-        # 선호도 가중치 높임
-        fitness_weights = {'nutrition': 0.3, 'cost': 0.2, 'preference': 0.5}
+    Returns:
+        {전략 타입: (식단표, 요약 정보)}
+    """
+    types = list(dict.fromkeys(strategy_types or DEFAULT_STRATEGIES))
+    base = {k: v for k, v in params.items() if k not in WEIGHT_KEYS and k != 'strategy_type'}
+    weights = {}
+    for t in types:
+        applied = _apply_strategy_weights(dict(base), t)
+        weights[t] = {k: applied[k] for k in WEIGHT_KEYS}
+    logger.info(f"다중 전략 최적화 시작 - 전략: {types}, 일수: {params.get('days')}")
+
+    try:
+        plans = ga_optimize_strategies(paths=paths, params=base, strategies=weights, catalog=catalog, cooc=cooc,
+                                       limits=limits, on_progress=on_progress)
+    except (InfeasibleParamsError, ValueError):
+        raise
+    except Exception as e:
+        logger.error(f"다중 전략 최적화 실패: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+        raise RuntimeError(f"최적화 처리 중 오류가 발생했습니다: {e}")
+
+    for t, (_, summary) in plans.items():
+        summary['strategy_applied'] = t
+        summary['strategy_weights'] = {k.replace('_weight', ''): weights[t][k] for k in WEIGHT_KEYS}
+    return plans
 
 def _apply_strategy_weights(params: Dict[str, Any], strategy_type: str) -> Dict[str, Any]:
     """
@@ -0,0 +1,192 @@
+# backend/app/services/optimizer_pool.py
+"""
+식단 최적화 전용 프로세스 풀
+- GA는 순수 파이썬 CPU 작업이라 스레드로는 GIL 때문에 코어 1개를 넘지 못함
+- 워커는 시작할 때 프리셋 CSV를 한 번 읽어 카탈로그 배열을 상주시키고, 작업마다 params/seed만 받음
+"""
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, Future
+from typing import Dict, Any, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_preset: Optional[Dict[str, str]] = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+# 섬 모델 작업은 섬마다 자식 프로세스를 띄워야 하는데 풀 워커(데몬)는 자식을 만들 수 없으므로
+# 메인 프로세스의 스레드에서 조율만 함(계산은 섬 프로세스가 수행)
+_island_threads: Optional[ThreadPoolExecutor] = None
+# 풀 워커에 넘길 취소 토큰/진행 큐용(Manager 프록시는 피클 가능, threading.Event는 불가)
+_manager = None
+STREAM_INTERVAL = 0.2   # 진행 스냅샷 전송 최소 간격(초)
+START_POLL      = 0.5   # 작업 시작 감시 간격(초)
+
+# ---------- 워커 프로세스 쪽 상태 ----------
+_worker_preset = None  # (paths, catalog, cooc)
+
+def _init_worker(preset_paths: Optional[Dict[str, str]]):
+    """워커 시작 시 1회: 프리셋 CSV 파싱 → 카탈로그 캐시에 상주"""
+    global _worker_preset
+    if not preset_paths:
+        return
+    try:
+        from app.services.ga_engine import get_catalog
+        catalog, cooc = get_catalog(preset_paths)
+        _worker_preset = (dict(preset_paths), catalog, cooc)
+        logger.info(f"[pid {os.getpid()}] 프리셋 카탈로그 적재 완료: {len(catalog)}개 메뉴")
+    except Exception as e:
+        # 프리셋이 깨져 있어도 워커는 살려두고 작업마다 경로로 로드
+        logger.error(f"[pid {os.getpid()}] 프리셋 카탈로그 적재 실패: {e}")
+
+def _progress_sender(queue, interval: float = STREAM_INTERVAL):
+    """세대별 스냅샷을 interval초에 한 번만 큐로(첫 스냅샷은 바로)"""
+    last = [0.0]
+    def send(snap):
+        now = time.monotonic()
+        if now - last[0] >= interval:
+            last[0] = now
+            queue.put(snap)
+    return send
+
+def _run_job(params: Dict[str, Any], seed: Optional[int], paths: Optional[Dict[str, str]] = None,
+             deadline: Optional[float] = None, cancel=None, accept=None, progress=None, started=None) -> Dict[str, Any]:
+    """워커에서 실행되는 작업 1건. paths가 None이면 상주 프리셋 카탈로그 사용.
+    deadline(time.time() 기준)/cancel/accept(is_set())에 걸리면 그때까지의 최선 식단을 반환.
+    progress(큐)가 있으면 세대별 스냅샷을 넣어 줌. started(이벤트)는 시작하자마자 set."""
+    if started is not None:
+        started.set()
+    from app.services.optimizer import optimize_menu, optimize_strategies
+    from app.services.ga_engine import RunLimits
+
+    params = dict(params)
+    if seed is not None:
+        params["seed"] = int(seed)
+
+    if paths is None:
+        if _worker_preset is None:
+            raise RuntimeError("프리셋 카탈로그가 없는 워커입니다. paths를 지정하세요.")
+        paths = _worker_preset[0]   # 카탈로그는 get_catalog 캐시에서(CSV가 바뀌었으면 다시 파싱)
+
+    limits = RunLimits(deadline=deadline, cancel=cancel, accept=accept)
+    on_progress = _progress_sender(progress) if progress is not None else None
+    strategies = params.pop("strategies", None)
+    if strategies:   # 전략 여러 개를 GA 한 번으로
+        plans = optimize_strategies(paths=paths, params=params, strategy_types=strategies,
+                                    limits=limits, on_progress=on_progress)
+        return {
+            "status": "success",
+            "strategies": {t: {"plan": df.to_dict(orient="records"), "summary": s} for t, (df, s) in plans.items()},
+        }
+    plan_df, summary = optimize_menu(paths=paths, params=params, limits=limits, on_progress=on_progress)
+    return {
+        "status": "success",
+        "plan": plan_df.to_dict(orient="records"),
+        "summary": summary,
+    }
+
+# ---------- 메인 프로세스 쪽 API ----------
+def get_pool(preset_paths: Optional[Dict[str, str]] = None) -> ProcessPoolExecutor:
+    """장수명 풀(최초 호출 시 생성). preset_paths는 생성 시점에만 반영됨."""
+    global _pool, _pool_preset, _pool_size
+    with _pool_lock:
+        if _pool is None:
+            n = int(getattr(settings, "optimizer_workers", 0) or 0) or (os.cpu_count() or 1)
+            # uvicorn 이벤트 루프/스레드를 fork로 복제하지 않도록 spawn 사용
+            _pool = ProcessPoolExecutor(
+                max_workers=n,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(preset_paths,),
+            )
+            _pool_preset = dict(preset_paths) if preset_paths else None
+            _pool_size = n
+            logger.info(f"최적화 프로세스 풀 생성: workers={n}, preset={'yes' if preset_paths else 'no'}")
+        return _pool
+
+def _get_manager():
+    global _manager
+    with _pool_lock:
+        if _manager is None:
+            _manager = multiprocessing.get_context("spawn").Manager()
+        return _manager
+
+def new_cancel_event():
+    """프로세스 경계를 넘는 취소 토큰(set()하면 워커 GA가 다음 세대에서 멈춤)"""
+    return _get_manager().Event()
+
+def new_progress_queue():
+    """워커 → 메인 진행 스냅샷 큐"""
+    return _get_manager().Queue()
+
+def _watch_start(started, future: Future, on_start):
+    """워커가 started를 set하면 메인 프로세스에서 on_start() 호출(작업이 시작 전에 끝나거나 취소되면 안 부름)"""
+    while not future.done():
+        if started.wait(START_POLL):
+            try:
+                on_start()
+            except Exception as e:
+                logger.error(f"작업 시작 콜백 실패: {e}")
+            return
+
+def submit_optimization(params: Dict[str, Any], seed: Optional[int] = None,
+                        paths: Optional[Dict[str, str]] = None,
+                        deadline: Optional[float] = None, cancel=None, accept=None, progress=None,
+                        on_start=None) -> Future:
+    """작업 제출. paths가 풀 프리셋과 같으면 워커 상주 카탈로그를 그대로 씀.
+    deadline/cancel/accept/progress는 _run_job 참고(토큰/큐는 new_cancel_event()/new_progress_queue()로 만든 것).
+    on_start()는 워커가 실제로 작업을 시작할 때 메인 프로세스의 감시 스레드에서 한 번 호출."""
+    started = new_cancel_event() if on_start is not None else None
+    future = _submit(params, seed, paths, deadline, cancel, accept, progress, started)
+    if on_start is not None:
+        threading.Thread(target=_watch_start, args=(started, future, on_start), daemon=True,
+                         name="job-start-watch").start()
+    return future
+
+def _submit(params, seed, paths, deadline, cancel, accept, progress, started) -> Future:
+    global _island_threads
+    pool = get_pool()
+    if int(params.get("islands") or 1) > 1:
+        paths = paths if paths is not None else _pool_preset
+        if paths is None:
+            raise RuntimeError("섬 모델 실행에는 CSV 경로가 필요합니다.")
+        with _pool_lock:
+            if _island_threads is None:
+                _island_threads = ThreadPoolExecutor(max_workers=max(1, _pool_size), thread_name_prefix="ga-islands")
+        return _island_threads.submit(_run_job, dict(params), seed, dict(paths), deadline, cancel, accept, progress,
+                                      started)
+    if paths is not None and _pool_preset is not None and dict(paths) == _pool_preset:
+        paths = None
+    return pool.submit(_run_job, dict(params), seed, paths, deadline, cancel, accept, progress, started)
+
+def preset_paths() -> Optional[Dict[str, str]]:
+    """풀 프리셋 CSV 경로(paths=None 작업이 쓰는 것)"""
+    return dict(_pool_preset) if _pool_preset else None
+
+def _ping() -> int:
+    return os.getpid()
+
+def warm_up(preset_paths: Optional[Dict[str, str]] = None):
+    """풀을 만들고 워커 수만큼 빈 작업을 넣어 전 워커를 미리 띄움(프리셋 적재까지 끝나게)."""
+    pool = get_pool(preset_paths)
+    for _ in range(_pool_size):
+        pool.submit(_ping)
+
+def shutdown_pool(wait: bool = False):
+    global _pool, _pool_preset, _island_threads, _manager
+    with _pool_lock:
+        if _island_threads is not None:
+            _island_threads.shutdown(wait=wait, cancel_futures=True)
+            _island_threads = None
+        if _pool is not None:
+            _pool.shutdown(wait=wait, cancel_futures=True)
+            _pool, _pool_preset = None, None
+        if _manager is not None:
+            _manager.shutdown()
+            _manager = None
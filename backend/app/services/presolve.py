@@ -0,0 +1,224 @@
+# backend/app/services/presolve.py
+"""
+GA/MILP 실행 전 불가능 요청 사전 점검 (수 ms)
+- 카테고리별 최소/최대 칼로리·비용 경계: 하루 칼로리 밴드를 애초에 못 맞추는 경우
+- 하루 LP 완화(scipy HiGHS): 칼로리 밴드 + 단백질 칼로리 상한 + g 매크로 범위(+ 미크로 하한)를 동시에 만족하는 하루가 있는지,
+  있으면 그런 하루의 최소 비용 → 월 예산과 비교
+- 반복 제약이 하드인 경우(milp)에는 카테고리별 용량 점검 + 월 전체 LP 완화
+LP 완화가 불가능하면 정수해도 불가능하므로 거짓 거절은 없음(통과했다고 가능해가 보장되지는 않음).
+"""
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    from scipy.optimize import linprog, milp, Bounds
+except ImportError:
+    linprog = None
+
+from app.services.ga_engine import (
+    GAConfig, MenuCatalog, CATEGORY_CODES, DAILY_SLOTS, MICRO_COLS,
+    _F_PRICE, _F_KCAL, _F_CARB, _F_PROT, _F_FAT, _F_MICRO,
+)
+
+PROT_CAL_EPS = 1e-6
+
+class InfeasibleParamsError(RuntimeError):
+    """요청 파라미터로는 가능해가 없음. report에 걸린 제약/수치가 담김(API에서 422)."""
+
+    def __init__(self, report: dict):
+        self.report = report
+        msgs = [b["message"] for b in report.get("binding", [])]
+        super().__init__(msgs[0] if msgs else "요청 제약을 만족하는 식단이 없습니다.")
+
+    def __reduce__(self):  # 프로세스 풀 경계를 넘을 때 report 유지
+        return (type(self), (self.report,))
+
+# ===== 하루 단위 =====
+def _slot_need(snack_day: bool) -> Dict[str, int]:
+    need = {"rice": 0, "soup": 0, "side": 0}
+    for s in DAILY_SLOTS:
+        if s in need: need[s] += 1
+    if snack_day: need["snack"] = 1
+    return need
+
+def _day_pools(catalog: MenuCatalog, snack_day: bool) -> Dict[str, np.ndarray]:
+    pools = {k: np.flatnonzero(catalog.category == CATEGORY_CODES[k]) for k in ("rice", "soup", "side")}
+    if snack_day:
+        snack = np.flatnonzero(catalog.category == CATEGORY_CODES["snack"])
+        pools["snack"] = snack[snack != catalog.null_snack_idx]
+    return pools
+
+def _extreme_sum(vals: np.ndarray, pools: dict, need: dict, fixed: float, largest: bool) -> float:
+    total = fixed
+    for k, m in need.items():
+        v = np.sort(vals[pools[k]])
+        total += float(v[-m:].sum() if largest else v[:m].sum())
+    return total
+
+def _day_lp(catalog: MenuCatalog, cfg: GAConfig, pools: dict, need: dict, groups: List[str], fixed_idx: Optional[int]):
+    """하루 LP 완화: 주어진 제약 그룹으로 최소 비용 하루. 불가능하면 None"""
+    F = catalog.feats
+    idx = np.concatenate([pools[k] for k in need])
+    if fixed_idx is not None:
+        idx = np.append(idx, fixed_idx)
+    X = F[idx]
+    n = len(idx)
+    A_eq = [np.isin(idx, pools[k]).astype(float) for k in need]
+    b_eq = [float(m) for m in need.values()]
+    lb = np.zeros(n); ub = np.ones(n)
+    if fixed_idx is not None:
+        lb[-1] = 1.0   # NULL_SNACK 고정(영양값 0이지만 형태 맞춤)
+
+    A_ub, b_ub = [], []
+    def le(row, rhs): A_ub.append(row); b_ub.append(rhs)
+
+    if "kcal" in groups:
+        lo, hi = cfg.kcal_band
+        le(X[:, _F_KCAL], hi); le(-X[:, _F_KCAL], -lo)
+    if "protein" in groups:
+        le(4.0*X[:, _F_PROT] - 0.20*X[:, _F_KCAL], -PROT_CAL_EPS)
+    if "macro" in groups:
+        tot = X[:, _F_CARB] + X[:, _F_PROT] + X[:, _F_FAT]
+        for k, col in (("carbo", _F_CARB), ("protein", _F_PROT), ("fat", _F_FAT)):
+            lo_b, hi_b = cfg.macro_bounds[k]
+            le(-(X[:, col] - lo_b*tot), 0.0); le(X[:, col] - hi_b*tot, 0.0)
+    if "micro" in groups:
+        for j, k in enumerate(MICRO_COLS):
+            if cfg.micro_min.get(k):
+                le(-X[:, _F_MICRO][:, j], -float(cfg.micro_min[k]))
+
+    res = linprog(X[:, _F_PRICE], A_ub=np.array(A_ub) if A_ub else None, b_ub=b_ub or None,
+                  A_eq=np.array(A_eq), b_eq=b_eq, bounds=list(zip(lb, ub)), method="highs")
+    return float(res.fun) if res.status == 0 else None
+
+_DAY_LABEL = {"plain": "간식 없는 날", "snack": "간식 있는 날"}
+
+_GROUP_MSG = {
+    "protein": "단백질 칼로리 비중 < 20%를 지키면서 하루 {lo:.0f}~{hi:.0f} kcal을 맞추는 조합이 없습니다.",
+    "macro":   "g 기준 매크로 범위(탄 {c0:.0%}~{c1:.0%}, 단 {p0:.0%}~{p1:.0%}, 지 {f0:.0%}~{f1:.0%})를 칼로리 밴드/단백질 상한과 함께 만족하는 하루 조합이 없습니다.",
+    "micro":   "미크로 영양소 하한을 다른 하루 제약과 함께 만족하는 조합이 없습니다.",
+}
+
+# ===== 진입점 =====
+def check_feasibility(catalog: MenuCatalog, cfg: GAConfig, hard_micro: bool = False,
+                      hard_repeats: bool = False) -> dict:
+    """반환: report {feasible, binding[], warnings[], bounds{}, elapsed_ms}
+    GA에서는 미크로 하한/반복 제한이 소프트 벌점이므로 기본은 경고만, milp는 하드로 점검."""
+    t0 = time.perf_counter()
+    binding: List[dict] = []
+    warnings: List[dict] = []
+    bounds: Dict[str, dict] = {}
+    lo, hi = cfg.kcal_band
+    mb = cfg.macro_bounds
+    fmt = dict(lo=lo, hi=hi, c0=mb["carbo"][0], c1=mb["carbo"][1], p0=mb["protein"][0], p1=mb["protein"][1],
+               f0=mb["fat"][0], f1=mb["fat"][1])
+
+    day_types = [("plain", False), ("snack", True)] if any(cfg.snack_allowed) else [("plain", False)]
+    n_days = {"plain": int((~cfg.snack_allowed).sum()), "snack": int(cfg.snack_allowed.sum())}
+    min_cost: Dict[str, float] = {}   # 하드 제약만 만족하는 최소 하루 비용(월 예산 점검용)
+    F = catalog.feats
+
+    for name, snack_day in day_types:
+        if n_days[name] == 0: continue
+        tag = "간식 있는 날: " if snack_day else ""
+        need, pools = _slot_need(snack_day), _day_pools(catalog, snack_day)
+        fixed = None if snack_day else catalog.null_snack_idx
+
+        # 1) 카테고리 구성
+        short = {k: (len(pools[k]), m) for k, m in need.items() if len(pools[k]) < m}
+        if short:
+            for k, (have, m) in short.items():
+                binding.append({"constraint": "category", "day_type": name,
+                                "message": f"{tag}'{k}' 메뉴가 {have}개뿐이라 하루 {m}개를 채울 수 없습니다."})
+            continue
+
+        # 2) 칼로리 경계(정확)
+        kmin = _extreme_sum(F[:, _F_KCAL], pools, need, 0.0, largest=False)
+        kmax = _extreme_sum(F[:, _F_KCAL], pools, need, 0.0, largest=True)
+        cmin = _extreme_sum(F[:, _F_PRICE], pools, need, 0.0, largest=False)
+        bounds[name] = {"day_kcal_min": kmin, "day_kcal_max": kmax, "day_cost_min": cmin}
+        if kmin > hi:
+            binding.append({"constraint": "kcal_band", "day_type": name,
+                            "message": f"{tag}가장 가벼운 하루도 {kmin:.0f} kcal > 상한 {hi:.0f} kcal"})
+            continue
+        if kmax < lo:
+            binding.append({"constraint": "kcal_band", "day_type": name,
+                            "message": f"{tag}가장 무거운 하루도 {kmax:.0f} kcal < 하한 {lo:.0f} kcal"})
+            continue
+        min_cost[name] = cmin
+
+        # 3) 하루 LP 완화: 제약 그룹을 하나씩 더하며 처음 불가능해지는 그룹을 원인으로 보고
+        if linprog is None:
+            continue
+        groups = ["kcal"]
+        for g, hard in (("protein", True), ("macro", True), ("micro", hard_micro)):
+            c = _day_lp(catalog, cfg, pools, need, groups + [g], fixed)
+            if c is None:
+                item = {"constraint": g, "day_type": name, "message": tag + _GROUP_MSG[g].format(**fmt)}
+                (binding if hard else warnings).append(item)
+                if hard: break
+                continue
+            groups.append(g)
+            if hard:
+                min_cost[name] = c
+            else:   # 소프트 그룹(GA의 미크로)까지 넣은 비용은 참고로만: 예산 점검에 쓰면 가능한 요청을 거절함
+                bounds[name][f"day_cost_min_with_{g}"] = c
+        else:
+            bounds[name]["day_cost_min_lp"] = min_cost[name]
+            bounds[name]["constraints"] = groups
+
+    # 4) 월 예산: 날 종류별 최소 비용 합
+    if not binding and len(min_cost) == sum(1 for k in n_days if n_days[k] > 0):
+        month_min = sum(n_days[k] * c for k, c in min_cost.items())
+        bounds["month_cost_min"] = month_min
+        if month_min > cfg.total_budget:
+            parts = " + ".join(f"{_DAY_LABEL[k]} {c:.0f}원 × {n_days[k]}일" for k, c in min_cost.items())
+            item = {"constraint": "budget",
+                    "message": (f"하루 {lo:.0f} kcal 이상 등 하루 제약을 만족하는 최소 비용으로 짜도 월 {month_min:.0f}원"
+                                f"({parts}) > 월 예산 {cfg.total_budget:.0f}원"
+                                f"(1인 {cfg.budget_per_person:.0f}원 × {cfg.days}일, {month_min - cfg.total_budget:.0f}원 부족)"),
+                    "detail": {"min_day_cost": min_cost, "days": {k: n_days[k] for k in min_cost},
+                               "month_cost_min": month_min, "total_budget": cfg.total_budget,
+                               "shortfall": month_min - cfg.total_budget}}
+            (binding if cfg.strict_budget else warnings).append(item)
+
+    # 5) 반복 제한 용량: 카테고리별 필요 횟수 vs 메뉴 수×허용 횟수, W일 창 안 서로 다른 메뉴 수
+    rep_msgs = []
+    for k, m in _slot_need(False).items():
+        have = int((catalog.category == CATEGORY_CODES[k]).sum())
+        need_total = m * cfg.days
+        if have * cfg.max_repeat_per_month < need_total:
+            rep_msgs.append(f"'{k}' {have}개 × 월 {cfg.max_repeat_per_month}회 < 필요 {need_total}회")
+        W = min(cfg.repeat_window_days, cfg.days)
+        if W > 1 and have < m * W:
+            rep_msgs.append(f"'{k}' {have}개 < {W}일 연속 서로 다른 메뉴 필요 {m*W}개")
+    for msg in rep_msgs:
+        (binding if hard_repeats else warnings).append({"constraint": "repeat", "message": f"반복 제한 불가: {msg}"})
+
+    # 6) 반복이 하드면 월 전체 LP 완화(하루 점검으로 안 잡히는 날 간 결합)
+    if hard_repeats and not binding and milp is not None:
+        from app.services.milp_engine import build_milp_model
+        model = build_milp_model(catalog, cfg, micro=hard_micro, repeats=True, budget=cfg.strict_budget)
+        res = milp(c=model.c, constraints=model.constraints, integrality=np.zeros_like(model.integrality),
+                   bounds=Bounds(model.lb, model.ub))
+        if res.status == 2:
+            binding.append({"constraint": "month_lp",
+                            "message": "하루 제약 + 예산 + 반복 제한을 함께 만족하는 월 식단이 LP 완화에서도 없습니다."})
+
+    return {
+        "feasible": not binding,
+        "binding": binding,
+        "warnings": warnings,
+        "bounds": bounds,
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000.0, 2),
+    }
+
+def ensure_feasible(catalog: MenuCatalog, cfg: GAConfig, engine: str = "slots") -> dict:
+    """불가능하면 InfeasibleParamsError, 아니면 report 반환"""
+    hard = engine == "milp"
+    report = check_feasibility(catalog, cfg, hard_micro=hard, hard_repeats=hard)
+    if not report["feasible"]:
+        raise InfeasibleParamsError(report)
+    return report
@@ -0,0 +1,186 @@
+# backend/app/services/pruning.py
+"""
+후보 메뉴 가지치기(요청 제약별, 카탈로그 지문별 캐시)
+1) 어떤 가능한 하루에도 들어갈 수 없는 메뉴 제거 — 제약마다 따로 본 필요조건(분리 경계)이라 과잉 제거 없음
+   - 칼로리 밴드: 나머지 슬롯을 가장 가볍게/무겁게 채워도 밴드를 못 맞춤
+   - 단백질 칼로리 < 20%: 4p - 0.2kcal 합이 나머지를 최소로 채워도 0 이상
+   - g 매크로 범위, (하드일 때) 미크로 하한
+   - (STRICT_BUDGET) 이 메뉴가 든 가장 싼 하루 + 나머지 날 최소 비용 > 월 예산
+2) 같은 카테고리 안 거의 같은 메뉴(가격/영양 모두 DUP_TOL 이내)는 선호가 가장 높은 하나만 남김
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.services.ga_engine import (
+    GAConfig, MenuCatalog, CATEGORY_CODES, MICRO_COLS, subset_cooc,
+    _F_PRICE, _F_KCAL, _F_CARB, _F_PROT, _F_FAT, _F_MICRO, _F_PREF,
+)
+from app.services.presolve import _slot_need
+
+DUP_TOL         = 0.01   # 근사 중복 판정: 열별 중앙값 대비 1% 격자
+PRUNE_CACHE_MAX = 16
+
+@dataclass
+class PruneResult:
+    catalog: MenuCatalog
+    keep: np.ndarray   # 원래 카탈로그 인덱스
+    report: dict
+
+# ===== 분리 경계 =====
+def _rest_extreme(v: np.ndarray, cat: np.ndarray, need: Dict[str, int], largest: bool) -> np.ndarray:
+    """메뉴 i가 자기 슬롯 하나를 차지할 때, 나머지 슬롯 합의 최솟값(largest면 최댓값). 카테고리 밖 메뉴는 nan"""
+    sgn = -1.0 if largest else 1.0
+    out = np.full(len(v), np.nan)
+    best = {}
+    for k, m in need.items():
+        pool = np.flatnonzero(cat == CATEGORY_CODES[k])
+        best[k] = (pool, np.sort(sgn * v[pool]))
+    total = sum(sv[:m].sum() for k, m in need.items() for _, sv in [best[k]])
+    for k, m in need.items():
+        pool, sv = best[k]
+        if len(pool) < m: continue
+        # 자기 카테고리에서 i를 뺀 (m-1)개 최소합: i가 상위 m-1 안이면 m번째까지 합 - v_i
+        own_all = sv[:m].sum()
+        own_wo_i = np.where(sgn * v[pool] <= (sv[m-2] if m >= 2 else -np.inf),
+                            own_all - sgn * v[pool], sv[:m-1].sum())
+        out[pool] = sgn * (total - own_all + own_wo_i)
+    return out
+
+def _day_possible(catalog: MenuCatalog, cfg: GAConfig, need: Dict[str, int], hard_micro: bool):
+    """하루 종류 하나에 대해 메뉴별 가능 여부(bool)와 제약별 탈락 수"""
+    F, cat = catalog.feats, catalog.category
+    lo, hi = cfg.kcal_band
+    tot = F[:, _F_CARB] + F[:, _F_PROT] + F[:, _F_FAT]
+
+    def with_rest(v, largest):
+        return v + _rest_extreme(v, cat, need, largest)
+
+    checks = {}
+    kcal = F[:, _F_KCAL]
+    checks["kcal"] = (with_rest(kcal, False) <= hi) & (with_rest(kcal, True) >= lo)
+    q = 4.0*F[:, _F_PROT] - 0.20*kcal
+    checks["protein"] = with_rest(q, False) < 0
+    ok_m = np.ones(len(F), dtype=bool)
+    for k, col in (("carbo", _F_CARB), ("protein", _F_PROT), ("fat", _F_FAT)):
+        lo_b, hi_b = cfg.macro_bounds[k]
+        ok_m &= (with_rest(F[:, col] - lo_b*tot, True) >= 0) & (with_rest(F[:, col] - hi_b*tot, False) <= 0)
+    checks["macro"] = ok_m
+    if hard_micro:
+        ok_u = np.ones(len(F), dtype=bool)
+        for j, k in enumerate(MICRO_COLS):
+            if cfg.micro_min.get(k):
+                ok_u &= with_rest(F[:, _F_MICRO][:, j], True) >= float(cfg.micro_min[k])
+        checks["micro"] = ok_u
+    in_day = ~np.isnan(_rest_extreme(kcal, cat, need, False))
+    possible = in_day.copy()
+    for c in checks.values(): possible &= c
+    return possible, in_day, checks, with_rest(F[:, _F_PRICE], False)
+
+# ===== 근사 중복 =====
+def _dedupe(catalog: MenuCatalog, idx: np.ndarray) -> np.ndarray:
+    """idx 중 근사 중복을 접어 남길 인덱스(선호 최대, 동률이면 싼 것)"""
+    if len(idx) == 0: return idx
+    cols = [_F_PRICE, _F_KCAL, _F_CARB, _F_PROT, _F_FAT] + list(range(_F_MICRO.start, _F_MICRO.stop))
+    X = catalog.feats[np.ix_(idx, cols)]
+    scale = np.maximum(np.median(np.abs(X), axis=0), 1e-9) * DUP_TOL
+    bins = np.floor(X / scale).astype(np.int64)
+    key = np.column_stack([catalog.category[idx].astype(np.int64), bins])
+    # 선호 내림차순, 가격 오름차순으로 정렬 후 격자별 첫 번째
+    order = np.lexsort((catalog.feats[idx, _F_PRICE], -catalog.feats[idx, _F_PREF]))
+    _, first = np.unique(key[order], axis=0, return_index=True)
+    return np.sort(idx[order[first]])
+
+# ===== 진입점 =====
+def prune_catalog(catalog: MenuCatalog, cfg: GAConfig, hard_micro: bool = False, dedupe: bool = True) -> PruneResult:
+    t0 = time.perf_counter()
+    n = len(catalog)
+    cat = catalog.category
+    null = catalog.null_snack_idx
+    n_days = {False: int((~cfg.snack_allowed).sum()), True: int(cfg.snack_allowed.sum())}
+
+    possible = np.zeros(n, dtype=bool)
+    fail: Dict[str, int] = {}
+    day_cost_min: Dict[bool, float] = {}
+    item_day_cost: Dict[bool, np.ndarray] = {}
+    for snack_day in (False, True):
+        if n_days[snack_day] == 0: continue
+        need = _slot_need(snack_day)
+        ok, in_day, checks, cost_with = _day_possible(catalog, cfg, need, hard_micro)
+        possible |= ok
+        for name, c in checks.items():
+            fail[name] = fail.get(name, 0) + int((in_day & ~c).sum())
+        item_day_cost[snack_day] = np.where(ok, cost_with, np.inf)
+        day_cost_min[snack_day] = float(np.min(item_day_cost[snack_day])) if ok.any() else np.inf
+
+    # 월 예산: 메뉴 i가 든 가장 싼 하루 + 나머지 날은 각자 최소 비용
+    if cfg.strict_budget and all(np.isfinite(v) for v in day_cost_min.values()):
+        base = sum(n_days[t] * c for t, c in day_cost_min.items())
+        month_min = np.min([base - day_cost_min[t] + item_day_cost[t] for t in day_cost_min], axis=0)
+        over = possible & (month_min > cfg.total_budget)
+        fail["budget"] = int(over.sum())
+        possible &= ~over
+
+    # 필수 카테고리를 비우게 되면 그 카테고리는 가지치기하지 않음(불가능 판정은 presolve 몫)
+    kept_whole = []
+    for k, m in _slot_need(any(cfg.snack_allowed)).items():
+        pool = cat == CATEGORY_CODES[k]
+        if k == "snack": pool &= np.arange(n) != null
+        if (possible & pool).sum() < m:
+            possible |= pool; kept_whole.append(k)
+
+    possible[null] = True
+    feasible_idx = np.flatnonzero(possible & (cat >= 0))
+    keep = _dedupe(catalog, feasible_idx[feasible_idx != null]) if dedupe else feasible_idx[feasible_idx != null]
+    keep = np.sort(np.append(keep, null))
+
+    per_cat = {}
+    for k, code in CATEGORY_CODES.items():
+        before = int((cat == code).sum()); after = int((cat[keep] == code).sum())
+        per_cat[k] = {"before": before, "after": after}
+    report = {
+        "before": n, "after": int(len(keep)),
+        "categories": per_cat,
+        "removed": {"infeasible": int(n - possible.sum()), "duplicate": int(len(feasible_idx) - len(keep)),
+                    "uncategorized": int((cat < 0).sum())},
+        "fail_by_constraint": fail,
+        "kept_whole": kept_whole,
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000.0, 2),
+    }
+    sub = catalog if len(keep) == n else catalog.subset(keep)
+    return PruneResult(catalog=sub, keep=keep, report=report)
+
+# ===== 캐시 =====
+_cache: "OrderedDict[tuple, PruneResult]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _key(catalog: MenuCatalog, cfg: GAConfig, hard_micro: bool, dedupe: bool) -> tuple:
+    from app.services.day_bank import constraint_key
+    return (catalog.fingerprint, constraint_key(cfg), cfg.days, float(cfg.budget_per_person),
+            bool(cfg.strict_budget), hard_micro, dedupe)
+
+def get_pruned(catalog: MenuCatalog, cooc, cfg: GAConfig, hard_micro: bool = False, dedupe: bool = True,
+               keep: Optional[np.ndarray] = None):
+    """반환: (가지친 카탈로그, 그에 맞춘 cooc, report). (카탈로그 지문, 요청 제약)별 캐시.
+    keep(원래 인덱스, 고정 슬롯 메뉴)은 가지치기 결과와 상관없이 남김"""
+    key = _key(catalog, cfg, hard_micro, dedupe)
+    with _cache_lock:
+        res = _cache.get(key)
+        if res is not None: _cache.move_to_end(key)
+    cache_hit = res is not None
+    if res is None:
+        res = prune_catalog(catalog, cfg, hard_micro, dedupe)
+        with _cache_lock:
+            _cache[key] = res
+            while len(_cache) > PRUNE_CACHE_MAX:
+                _cache.popitem(last=False)
+    if keep is not None and len(np.setdiff1d(keep, res.keep)):
+        idx = np.union1d(res.keep, keep)
+        return (catalog.subset(idx), subset_cooc(cooc, idx),
+                dict(res.report, cache_hit=cache_hit, after=int(len(idx)), kept_locked=int(len(idx) - len(res.keep))))
+    cooc_sub = cooc if res.catalog is catalog else subset_cooc(cooc, res.keep)
+    return res.catalog, cooc_sub, dict(res.report, cache_hit=cache_hit)
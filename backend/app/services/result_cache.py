@@ -0,0 +1,168 @@
+# backend/app/services/result_cache.py
+"""
+식단 최적화 결과 캐시
+- 키 = 입력 CSV 5종(price/nutr/cat/pref/cooc) 내용 해시 + 정규화한 params + 난수 시드
+- 같은 요청(워크플로우 재방문, 프론트 재시도)은 GA를 다시 돌리지 않고 저장된 (plan_df, summary)를 바로 반환
+- 메모리 LRU(개수 제한) + 선택적 디스크 계층(result_cache_dir, 용량 제한) → 프로세스 풀 워커끼리도 공유
+- 마감/취소/확정으로 중간에 멈춘 결과나 최적이 아닌 MILP 결과는 시점에 따라 달라지므로 저장하지 않음
+"""
+import copy
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from app.core.config import settings
+from app.services.ga_engine import SEED, CATALOG_PATH_KEYS, file_digest
+
+logger = logging.getLogger(__name__)
+
+KEY_IGNORE      = ("time_budget", "cache")          # 다 돈 결과를 바꾸지 않는 파라미터
+CACHEABLE_STOPS = (None, "completed", "converged")  # 시간과 무관하게 재현되는 종료
+
+# ===== 키 =====
+def _norm(v):
+    """JSON 직렬화가 값 표현에 따라 달라지지 않게(5 == 5.0, 튜플 == 리스트, 키 순서)"""
+    if isinstance(v, bool) or v is None or isinstance(v, str):
+        return v
+    if isinstance(v, (int, float)):
+        return float(v)
+    if isinstance(v, dict):
+        return {str(k): _norm(x) for k, x in sorted(v.items(), key=lambda kv: str(kv[0])) if x is not None}
+    if isinstance(v, (list, tuple)):
+        return [_norm(x) for x in v]
+    if hasattr(v, "tolist"):
+        return _norm(v.tolist())
+    return str(v)
+
+def result_key(paths: Dict[str, str], params: Dict[str, Any]) -> Optional[str]:
+    """캐시 키(시드가 없으면 결과가 재현되지 않으므로 None)"""
+    seed = params.get("seed", SEED)
+    if seed is None:
+        return None
+    body = {
+        "csv": [file_digest(paths.get(k)) for k in CATALOG_PATH_KEYS],
+        "params": _norm({k: v for k, v in params.items() if k not in KEY_IGNORE and k != "seed"}),
+        "seed": int(seed),
+    }
+    return hashlib.sha256(json.dumps(body, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def cacheable(summary: Dict[str, Any]) -> bool:
+    if summary.get("stopped_reason") not in CACHEABLE_STOPS:
+        return False
+    solver = summary.get("solver")
+    return solver is None or bool(solver.get("optimal"))
+
+# ===== 캐시 =====
+class ResultCache:
+    def __init__(self, max_entries: int = 64, disk_dir: Optional[str] = None, disk_max_bytes: int = 256 << 20):
+        self.max_entries = max(0, int(max_entries))
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = int(disk_max_bytes)
+        self._mem: "OrderedDict[str, Tuple[pd.DataFrame, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 or bool(self.disk_dir)
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """저장본의 복사본(호출 쪽에서 summary를 고쳐도 캐시는 그대로)"""
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None:
+                self._mem.move_to_end(key)
+        if hit is None and self.disk_dir:
+            hit = self._read_disk(key)
+            if hit is not None:
+                self._put_mem(key, hit)
+        if hit is None:
+            return None
+        return hit[0].copy(), copy.deepcopy(hit[1])
+
+    def put(self, key: str, plan_df: pd.DataFrame, summary: Dict[str, Any]):
+        entry = (plan_df.copy(), copy.deepcopy(summary))
+        self._put_mem(key, entry)
+        if self.disk_dir:
+            self._write_disk(key, entry)
+
+    def _put_mem(self, key: str, entry):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._mem[key] = entry
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_entries:
+                self._mem.popitem(last=False)
+
+    # ---------- 디스크 계층 ----------
+    def _read_disk(self, key: str):
+        path = self._file(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+            os.utime(path)   # 최근 사용 → 용량 정리 때 나중에 지움
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"결과 캐시 파일 읽기 실패({path}): {e}")
+            return None
+
+    def _write_disk(self, key: str, entry):
+        path = self._file(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)   # 다른 워커가 반쯤 쓴 파일을 읽지 않게
+        except OSError as e:
+            logger.warning(f"결과 캐시 파일 쓰기 실패({path}): {e}")
+            return
+        self._trim_disk()
+
+    def _trim_disk(self):
+        """총 용량이 넘으면 오래 안 쓴 파일부터 삭제"""
+        files = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith(".pkl"): continue
+            try:
+                st = os.stat(os.path.join(self.disk_dir, name))
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, name))
+        total = sum(f[1] for f in files)
+        for _, size, name in sorted(files):
+            if total <= self.disk_max_bytes: break
+            try:
+                os.remove(os.path.join(self.disk_dir, name))
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+def get_result_cache() -> ResultCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            disk = settings.resolve_path(getattr(settings, "result_cache_dir", None))
+            _cache = ResultCache(int(getattr(settings, "result_cache_size", 64)), disk,
+                                 int(getattr(settings, "result_cache_disk_mb", 256)) << 20)
+        return _cache
@@ -0,0 +1,151 @@
+# backend/app/services/warm_start.py
+"""
+웜 스타트: 이전 식단/이전 실행의 엘리트로 초기 개체군 일부를 채움 (params.warm_start)
+- warm_start = 식단 표(plan 레코드 목록 또는 {"plan": [...]}) | 결과 캐시 키(summary.cache_key) | true(엘리트만)
+  작업 ID는 API에서 그 작업 결과의 plan으로 바꿔 넘김(resolve_job_ref, 고정 슬롯의 base_plan도 같음)
+- 씨앗 = 넘긴 식단 + 같은 CSV 내용·같은 일수로 돈 이전 실행 중 파라미터(1인 예산/목표 칼로리)가 가장 가까운 실행의 엘리트
+- 개체군의 cfg.warm_frac만큼을 씨앗 + 가볍게 변이한 사본으로, 나머지는 평소 초기화(다양성 유지)
+- 엘리트는 메뉴 키로 보관 → 가지치기로 카탈로그가 달라져도 매핑, 없어진 메뉴는 그 자리 후보 풀에서 무작위
+- 엘리트 보관소는 프로세스별 LRU(워커마다 따로)
+"""
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services.ga_engine import (
+    GAConfig, MenuCatalog, CATALOG_PATH_KEYS, K_PER_DAY, file_digest, norm_key,
+    cat_index_lists, slot_pools, init_population, mutate_population,
+)
+
+logger = logging.getLogger(__name__)
+
+PLAN_SLOTS       = ("rice", "soup", "side1", "side2", "side3", "snack")   # build_result 열 = 염색체 슬롯 순서
+ELITE_STORE_MAX  = 32    # (CSV 내용, 일수, 스낵 요일)별 보관 개수
+ELITE_RUNS       = 8     # 같은 키에서 보관하는 파라미터 세트 수
+WARM_MUT_RATE    = 0.03  # 씨앗 사본의 유전자별 변이 확률(평소 mut_rate보다 가볍게)
+
+# ===== 엘리트 보관소 =====
+_elites: "OrderedDict[tuple, List[dict]]" = OrderedDict()
+_elites_lock = threading.Lock()
+
+def _store_key(paths: Dict[str, str], cfg: GAConfig) -> tuple:
+    return (tuple(file_digest(paths.get(k)) for k in CATALOG_PATH_KEYS), cfg.days,
+            tuple(bool(x) for x in cfg.snack_allowed))
+
+def _param_vec(cfg: GAConfig) -> np.ndarray:
+    return np.array([cfg.budget_per_person, cfg.target_kcal], dtype=np.float64)
+
+def remember_elites(paths: Dict[str, str], cfg: GAConfig, catalog: MenuCatalog, genes: Optional[np.ndarray]):
+    """실행이 끝난 개체군의 상위 개체를 메뉴 키로 보관(같은 파라미터 세트면 덮어씀)"""
+    if genes is None or len(genes) == 0:
+        return
+    key = _store_key(paths, cfg)
+    entry = {"vec": _param_vec(cfg), "keys": catalog.keys[np.asarray(genes, dtype=np.int64)]}
+    with _elites_lock:
+        runs = [r for r in _elites.get(key, []) if not np.array_equal(r["vec"], entry["vec"])]
+        _elites[key] = ([entry] + runs)[:ELITE_RUNS]
+        _elites.move_to_end(key)
+        while len(_elites) > ELITE_STORE_MAX:
+            _elites.popitem(last=False)
+
+def nearest_elites(paths: Dict[str, str], cfg: GAConfig) -> Optional[np.ndarray]:
+    """파라미터(상대 거리)가 가장 가까운 이전 실행의 엘리트 메뉴 키 (n, D*K), 없으면 None"""
+    with _elites_lock:
+        runs = list(_elites.get(_store_key(paths, cfg), []))
+    if not runs:
+        return None
+    v = _param_vec(cfg)
+    dist = [float((np.abs(r["vec"] - v) / np.maximum(np.abs(v), 1.0)).sum()) for r in runs]
+    return runs[int(np.argmin(dist))]["keys"]
+
+def clear_elites():
+    with _elites_lock:
+        _elites.clear()
+
+# ===== 씨앗 =====
+def plan_keys(plan: List[Dict[str, Any]], days: int) -> Optional[np.ndarray]:
+    """식단 표 레코드(합계 행 제외) → (D*K,) 메뉴 이름. 일수가 다르면 앞에서부터 반복/절단"""
+    rows = [r for r in plan if isinstance(r, dict) and str(r.get("day", "")).strip().isdigit()]
+    if not rows:
+        return None
+    names = [[str(r.get(s) or "") for s in PLAN_SLOTS] for r in rows]
+    return np.array([names[d % len(names)] for d in range(days)], dtype=object).reshape(-1)
+
+def _resolve_plan(warm) -> Optional[List[Dict[str, Any]]]:
+    """warm_start 값 → 식단 표 레코드(없으면 None)"""
+    if isinstance(warm, dict):
+        warm = warm.get("plan")
+    if isinstance(warm, list):
+        return warm
+    if isinstance(warm, str):
+        from app.services.result_cache import get_result_cache
+        hit = get_result_cache().get(warm)
+        if hit is None:
+            logger.warning(f"웜 스타트: 결과 캐시에 {warm[:12]}… 없음(식단 없이 엘리트만 사용)")
+            return None
+        return hit[0].to_dict(orient="records")
+    return None
+
+def to_genes(keys: np.ndarray, catalog: MenuCatalog, pools, rng: np.random.Generator) -> np.ndarray:
+    """메뉴 키/이름 (n, D*K) → 카탈로그 인덱스. 없는 메뉴는 그 자리 후보 풀에서 무작위"""
+    index = {k: i for i, k in enumerate(catalog.keys)}
+    for i, name in enumerate(catalog.names):
+        index.setdefault(name, i)
+    keys = np.atleast_2d(keys)
+    flat = [index.get(k, index.get(norm_key(k), -1)) for k in keys.ravel()]
+    genes = np.array(flat, dtype=np.int64).reshape(keys.shape)
+    r, c = np.nonzero(genes < 0)
+    if len(r):
+        genes[r, c] = pools.flat[pools.start[c] + (rng.random(len(c)) * pools.size[c]).astype(np.int64)]
+    return genes
+
+def warm_population(paths: Dict[str, str], params: dict, catalog: MenuCatalog, cfg: GAConfig,
+                    rng: np.random.Generator, bank=None):
+    """params.warm_start → (초기 개체군 또는 None, summary용 정보)"""
+    warm = params.get("warm_start")
+    cat_idx = cat_index_lists(catalog)
+    pools = slot_pools(catalog, cat_idx, cfg)
+
+    seeds, info = [], {"from_plan": 0, "from_elites": 0}
+    plan = _resolve_plan(warm)
+    if plan:
+        keys = plan_keys(plan, cfg.days)
+        if keys is not None:
+            seeds.append(to_genes(keys, catalog, pools, rng)); info["from_plan"] = 1
+    elites = nearest_elites(paths, cfg)
+    if elites is not None:
+        seeds.append(to_genes(elites, catalog, pools, rng)); info["from_elites"] = len(elites)
+    if not seeds:
+        return None, dict(info, seeded=0)
+
+    S = np.unique(np.vstack(seeds), axis=0)
+    m = min(cfg.pop_size, max(len(S), int(round(cfg.pop_size * cfg.warm_frac))))
+    warm_pop = S[np.arange(m) % len(S)]
+    if m > len(S):   # 씨앗 그대로 한 벌 + 나머지는 가볍게 변이한 사본
+        mutate_population(warm_pop[len(S):], pools, replace(cfg, mut_rate=WARM_MUT_RATE, day_mut_rate=0.0), rng)
+    if bank is None and cfg.use_day_bank:
+        from app.services.day_bank import get_day_bank
+        bank = get_day_bank(catalog, cfg)
+    rest = init_population(catalog, cat_idx, replace(cfg, pop_size=cfg.pop_size - m), rng, bank) \
+        if m < cfg.pop_size else np.empty((0, cfg.days * K_PER_DAY), dtype=int)
+    return np.vstack([warm_pop, rest]).astype(int), dict(info, seeded=int(m))
+
+# ===== API 쪽: 작업 ID → 식단 =====
+PLAN_REF_KEYS = ("warm_start", "base_plan")   # 식단을 작업 ID로도 받는 params(base_plan은 locked_slots)
+
+def resolve_job_ref(params: Dict[str, Any]) -> Dict[str, Any]:
+    """warm_start/base_plan이 끝난 작업 ID면 그 작업 결과의 plan으로 바꾼 params(워커에는 작업 목록이 없음)"""
+    refs = {k: params[k] for k in PLAN_REF_KEYS if isinstance(params.get(k), str)}
+    if not refs:
+        return params
+    from app.services.job_queue import get_job_manager
+    params = dict(params)
+    for k, ref in refs.items():
+        job = get_job_manager().get(ref)
+        if job is not None and job.result and job.result.get("plan"):
+            params[k] = job.result["plan"]   # 작업이 아니면 결과 캐시 키로 보고 워커에서 조회
+    return params
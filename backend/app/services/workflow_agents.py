@@ -48,13 +48,14 @@ class RealDataAnalyzer:
     def load_data(self):
         """실제 CSV 데이터 로드"""
         try:
+            from app.services.catalog_snapshot import get_table  # 파일 버전당 한 번만 파싱(요청끼리 공유)
             base_path = Path(settings.resolve_path("backend/data"))
             
-            self.nutrition_df = pd.read_csv(base_path / "meal_nutrition.csv")
-            self.price_df = pd.read_csv(base_path / "meal_price.csv")
-            self.category_df = pd.read_csv(base_path / "meal_category.csv")
-            self.student_pref_df = pd.read_csv(base_path / "student_preference.csv")
-            self.pair_pref_df = pd.read_csv(base_path / "pair_preference.csv")
+            self.nutrition_df = get_table(base_path / "meal_nutrition.csv")
+            self.price_df = get_table(base_path / "meal_price.csv")
+            self.category_df = get_table(base_path / "meal_category.csv")
+            self.student_pref_df = get_table(base_path / "student_preference.csv")
+            self.pair_pref_df = get_table(base_path / "pair_preference.csv")
             
             logger.info(f"데이터 로드 완료:")
             logger.info(f"- 영양소: {len(self.nutrition_df)}개 메뉴")
@@ -0,0 +1,111 @@
+# test_fitness.py
+# 배치 적합도 회귀: fitness_population = 기존(개체별 루프) fitness, 증분 평가(GAPopulation.step) = 전체 재평가
+import numpy as np
+import pytest
+
+from app.services.ga_engine import (
+    GAConfig, GAPopulation, K_PER_DAY, MICRO_COLS, HARD_FAIL, DAILY_SLOTS,
+    _F_PRICE, _F_KCAL, _F_CARB, _F_PROT, _F_FAT, _F_MICRO, _F_PREF,
+    cat_index_lists, evaluate_full, fitness_population, state_scores,
+)
+from test_presolve import _catalog
+
+def _cooc(n: int, rng) -> np.ndarray:
+    W = np.triu(rng.random((n, n)), 1)
+    return W + W.T
+
+def _random_plans(catalog, cfg: GAConfig, rng, size: int) -> np.ndarray:
+    """슬롯 카테고리를 지키는 무작위 식단. 간식은 대부분 요일 규칙대로, 10%는 어겨서 스낵 벌점도 나오게"""
+    idx = cat_index_lists(catalog)
+    slots = [idx[s] for s in DAILY_SLOTS]
+    pop = np.column_stack([rng.choice(slots[g % K_PER_DAY], size=size) for g in range(cfg.days * K_PER_DAY)])
+    real = idx["snack"][idx["snack"] != catalog.null_snack_idx]
+    for d in range(cfg.days):
+        want = cfg.snack_allowed[d] != (rng.random(size) < 0.1)
+        pop[:, d * K_PER_DAY + 5] = np.where(want, rng.choice(real, size=size), catalog.null_snack_idx)
+    return pop
+
+def _reference_fitness(ch: np.ndarray, catalog, W, cfg: GAConfig) -> float:
+    """배치화 이전 ga_engine.fitness(날마다 day_metrics → 항을 하나씩 더함)를 MenuCatalog 배열로 옮긴 것"""
+    days = ch.reshape(cfg.days, K_PER_DAY)
+    feats = catalog.feats
+    if cfg.strict_budget and feats[ch, _F_PRICE].sum() > cfg.total_budget:
+        return -HARD_FAIL
+
+    score = 0.0
+    counts = np.bincount(ch, minlength=len(catalog))
+    score -= cfg.p_repeat * float(np.maximum(0, counts - cfg.max_repeat_per_month).sum())
+    if cfg.repeat_window_days > 1:
+        last, rep = {}, 0
+        for d in range(cfg.days):
+            for i in days[d].tolist():
+                if i in last and (d - last[i]) < cfg.repeat_window_days:
+                    rep += 1
+                last[i] = d
+        score -= cfg.p_repeat * float(rep)
+
+    month_cost = snack_pen = 0.0
+    lo, hi = cfg.kcal_band
+    for d in range(cfg.days):
+        idxs = days[d].tolist()
+        s = feats[idxs].sum(axis=0)
+        month_cost += s[_F_PRICE]
+        kcal, carbo, protein, fat = s[_F_KCAL], s[_F_CARB], s[_F_PROT], s[_F_FAT]
+        den = max(kcal if kcal > 0 else protein * 4.0 + carbo * 4.0 + fat * 9.0, 1e-9)
+        carb_pct, prot_pct, fat_pct = carbo * 4.0 / den, protein * 4.0 / den, fat * 9.0 / den
+        if prot_pct >= 0.20 or kcal < lo or kcal > hi:
+            return -HARD_FAIL
+
+        tgt = cfg.macro_target_pct
+        score -= cfg.p_kcal * (kcal - cfg.target_kcal) ** 2
+        score -= cfg.p_macro * (abs(carb_pct - tgt["carbo"]) + abs(prot_pct - tgt["protein"]) + abs(fat_pct - tgt["fat"]))
+        micro = s[_F_MICRO]
+        score += cfg.w_micro_sum * np.mean([min(micro[j] / max(cfg.micro_scale.get(k, 1.0), 1e-9), 1.0)
+                                            for j, k in enumerate(MICRO_COLS)])
+        short = [max(0.0, (cfg.micro_min[k] - micro[j]) / cfg.micro_min[k])
+                 for j, k in enumerate(MICRO_COLS) if cfg.micro_min.get(k)]
+        if short:
+            score -= cfg.p_micro_shortfall * np.mean(short)
+        score += cfg.w_cooc * sum(W[idxs[a], idxs[b]] for a in range(K_PER_DAY) for b in range(a + 1, K_PER_DAY))
+        score += cfg.w_pref * s[_F_PREF]
+        snack_pen += (days[d, 5] != catalog.null_snack_idx) != cfg.is_snack_allowed_day(d)
+
+    score -= cfg.snack_lambda * snack_pen
+    over = max(0.0, month_cost - cfg.total_budget)
+    score -= cfg.p_budget_total * over ** 2 / cfg.total_budget ** 2
+    return float(score)
+
+@pytest.mark.parametrize("budget", [3000, 3300])   # 3000: 일부 식단이 월 예산 하드컷
+def test_fitness_population_matches_per_plan_scoring(budget):
+    rng = np.random.default_rng(0)
+    catalog = _catalog()
+    catalog.pref_w[:] = rng.random(len(catalog)).astype(np.float32)
+    catalog.feats[:, _F_PREF] = catalog.pref_w
+    W = _cooc(len(catalog), rng)
+    cfg = GAConfig(days=5, budget_per_person=budget).with_micro_scale(catalog)
+    pop = _random_plans(catalog, cfg, rng, 64)
+
+    got = fitness_population(pop, catalog, W, cfg)
+    want = np.array([_reference_fitness(ch, catalog, W, cfg) for ch in pop])
+    assert (want > -HARD_FAIL).sum() > len(pop) // 4
+    np.testing.assert_allclose(got, want, rtol=1e-12, atol=1e-9)
+
+def test_incremental_step_matches_full_evaluation():
+    rng = np.random.default_rng(1)
+    catalog = _catalog()
+    W = _cooc(len(catalog), rng)
+    cfg = GAConfig(days=5, budget_per_person=3000, pop_size=32, mut_rate=0.3, use_day_bank=False,
+                   restart_frac=0.3, diversity_min=1.0).with_micro_scale(catalog)
+    ga = GAPopulation(catalog, W, cfg, np.random.default_rng(2))
+    for _ in range(20):   # diversity_min=1.0 → 세대마다 부분 재시작(이주 경로)도 같이 돎
+        ga.step()
+        full = evaluate_full(ga.pop, catalog, W, cfg)
+        for k in ("genes", "S", "day_hard", "rep_day", "counts", "day_viol"):
+            np.testing.assert_array_equal(getattr(ga.state, k), getattr(full, k), err_msg=k)
+        for k in ("day_score", "day_obj"):
+            np.testing.assert_allclose(getattr(ga.state, k), getattr(full, k), rtol=1e-12, atol=1e-9, err_msg=k)
+        want = state_scores(full, catalog, cfg)
+        np.testing.assert_allclose(state_scores(ga.state, catalog, cfg), want, rtol=1e-12)
+        # fits는 엘리트 보존으로 바꾼 한 자리만 이전 점수로 남을 수 있음(배치화 이전부터의 동작)
+        assert np.count_nonzero(~np.isclose(ga.fits, want, rtol=1e-12)) <= 1
+    assert ga.restarts > 0
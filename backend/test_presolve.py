@@ -0,0 +1,49 @@
+# test_presolve.py
+# 사전 점검 회귀: GA 엔진에서 미크로 하한은 소프트라 월 예산 점검에 미크로 포함 비용을 쓰면 안 됨
+import numpy as np
+import pytest
+
+pytest.importorskip("scipy")
+
+from app.services.ga_engine import GAConfig, MenuCatalog, MICRO_COLS, MICRO_MIN, CATEGORY_CODES
+from app.services.presolve import check_feasibility, ensure_feasible
+
+def _catalog() -> MenuCatalog:
+    # 싼 메뉴(미크로 0)만으로 칼로리/단백질/매크로를 맞추는 하루 = 2500원,
+    # 미크로 하한까지 채우려면 비싼 반찬(800원)이 들어가 2800원
+    rows = [("rice", 500, 0), ("rice", 600, 0), ("soup", 500, 0), ("soup", 600, 0),
+            ("side", 500, 0), ("side", 500, 0), ("side", 500, 0), ("side", 800, 1), ("snack", 100, 0)]
+    n = len(rows) + 1
+    micro = np.array([MICRO_MIN.get(k, 0.0) * 1.001 for k in MICRO_COLS], dtype=np.float32)
+    cat = [CATEGORY_CODES[c] for c, _, _ in rows] + [CATEGORY_CODES["snack"]]
+    full = lambda v: np.array([v] * len(rows) + [0.0], dtype=np.float32)   # 마지막 = 간식 없음
+    return MenuCatalog(
+        keys=np.array([f"m{i}" for i in range(n)], dtype=object), names=np.array([f"m{i}" for i in range(n)], dtype=object),
+        category=np.array(cat, dtype=np.int8),
+        price=np.array([p for _, p, _ in rows] + [0], dtype=np.float32),
+        kcal=np.array([180.0] * 8 + [0.0, 0.0], dtype=np.float32),
+        carbo=np.array([24.0] * 8 + [0.0, 0.0], dtype=np.float32),
+        protein=np.array([6.0] * 8 + [0.0, 0.0], dtype=np.float32),
+        fat=np.array([10.0] * 8 + [0.0, 0.0], dtype=np.float32),
+        micros=np.vstack([micro * r for _, _, r in rows] + [micro * 0]).astype(np.float32),
+        pref_w=full(0.0), null_snack_idx=n - 1,
+    )
+
+def test_soft_micro_does_not_inflate_month_budget():
+    catalog = _catalog()
+    cfg = GAConfig(days=5, budget_per_person=2530)   # 하드 최소 월 12,600원 ≤ 12,650원 < 미크로 포함 14,100원
+    report = ensure_feasible(catalog, cfg, "slots")
+    assert report["bounds"]["month_cost_min"] == pytest.approx(12600)
+    assert not any(w["constraint"] in ("micro", "budget") for w in report["warnings"] + report["binding"])
+    assert report["bounds"]["plain"]["day_cost_min_with_micro"] == pytest.approx(2800, rel=1e-3)
+
+def test_budget_message_lists_day_types():
+    report = check_feasibility(_catalog(), GAConfig(days=5, budget_per_person=2400))
+    budget = [b for b in report["binding"] if b["constraint"] == "budget"]
+    assert budget and "간식 없는 날 2500원 × 4일" in budget[0]["message"]
+    assert "간식 있는 날 2600원 × 1일" in budget[0]["message"]
+
+def test_hard_micro_counts_toward_budget():
+    report = check_feasibility(_catalog(), GAConfig(days=5, budget_per_person=2530), hard_micro=True)
+    assert report["bounds"]["month_cost_min"] == pytest.approx(14100, rel=1e-3)
+    assert any(b["constraint"] == "budget" for b in report["binding"])